@@ -25,5 +25,7 @@ class DailyPriceInDB(DailyPriceBase):
 
 
 class DailyPriceResponse(DailyPriceInDB):
+    # 요청 시 리샘플링된 캔들은 저장된 행이 아니므로 id가 없음
+    id: Optional[int] = None
     stock_code: Optional[str] = None
     stock_name: Optional[str] = None
@@ -152,6 +152,199 @@ async def test_get_stock_prices_not_found(authenticated_client: AsyncClient):
     assert response.status_code == 404
 
 
+async def _create_daily_series(stock, start: date, days: int):
+    """연속 거래일 일봉 생성 (종가는 하루 100원씩 상승)"""
+    from asgiref.sync import sync_to_async
+
+    prices = [
+        DailyPrice(
+            stock=stock,
+            trade_date=start + timedelta(days=offset),
+            open_price=Decimal(10000 + offset * 100),
+            high_price=Decimal(10100 + offset * 100),
+            low_price=Decimal(9900 + offset * 100),
+            close_price=Decimal(10050 + offset * 100),
+            volume=1000,
+            amount=10000000,
+        )
+        for offset in range(days)
+    ]
+    await sync_to_async(DailyPrice.objects.bulk_create)(prices)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_resampled_interval(authenticated_client: AsyncClient, api_stock):
+    """임의 간격(3D) 리샘플링 조회 테스트"""
+    from apps.stocks.services import resampled_price_cache
+
+    resampled_price_cache.clear()
+    await _create_daily_series(api_stock, date(2024, 1, 1), 7)
+
+    response = await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"interval": "3D"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    # 7 거래일 -> 3 + 3 + 1, 최신 캔들이 먼저
+    assert [row["trade_date"] for row in data] == ["2024-01-07", "2024-01-06", "2024-01-03"]
+    assert data[1]["id"] is None
+    assert Decimal(data[1]["open_price"]) == Decimal("10300")
+    assert Decimal(data[1]["high_price"]) == Decimal("10600")
+    assert Decimal(data[1]["close_price"]) == Decimal("10550")
+    assert data[1]["volume"] == 3000
+    assert Decimal(data[1]["change"]) == Decimal("300")
+    assert data[0]["stock_code"] == api_stock.code
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_resampled_cache(authenticated_client: AsyncClient, api_stock):
+    """리샘플링 결과 캐시 및 신규 일봉 적재 시 무효화 테스트"""
+    from apps.stocks.services import resampled_price_cache
+
+    resampled_price_cache.clear()
+    await _create_daily_series(api_stock, date(2024, 1, 1), 4)
+    url = f"/api/v1/stocks/{api_stock.code}/prices"
+
+    first = await authenticated_client.get(url, params={"interval": "2D"})
+    second = await authenticated_client.get(url, params={"interval": "2D"})
+
+    assert first.json() == second.json()
+    assert len(resampled_price_cache) == 1
+
+    # 새 일봉이 들어오면 워터마크가 바뀌어 다시 계산
+    await _create_daily_series(api_stock, date(2024, 1, 5), 1)
+    third = await authenticated_client.get(url, params={"interval": "2D"})
+
+    assert len(third.json()) == 3
+    assert len(resampled_price_cache) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("interval", ["D", "daily"])
+async def test_get_stock_prices_stored_interval(
+    authenticated_client: AsyncClient, api_stock, api_daily_price, interval
+):
+    """저장된 테이블로 제공되는 간격(D, daily)은 테이블 조회 사용"""
+    response = await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"interval": interval}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] == api_daily_price.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_invalid_interval(authenticated_client: AsyncClient, api_stock):
+    """잘못된 간격 표기 테스트"""
+    response = await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"interval": "5H"}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_materializes_missing_candles(
+    authenticated_client: AsyncClient, api_stock
+):
+    """집계되지 않은 주봉은 일봉에서 계산해 응답하고 테이블에 기록"""
+    from asgiref.sync import sync_to_async
+    from apps.stocks.models import WeeklyPrice
+    from apps.stocks.services import materialization_requests, resampled_price_cache
+
+    resampled_price_cache.clear()
+    materialization_requests.clear()
+    # 2024-01-01(월)부터 10일 -> 두 번째 주는 1/8~1/10
+    await _create_daily_series(api_stock, date(2024, 1, 1), 10)
+
+    response = await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"candle_type": "weekly"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [row["trade_date"] for row in data] == ["2024-01-10", "2024-01-07"]
+    assert data[0]["id"] is None
+    assert Decimal(data[0]["open_price"]) == Decimal("10700")
+    assert data[0]["stock_code"] == api_stock.code
+
+    # 테스트 환경에서는 태스크가 즉시 실행되어 주봉이 저장됨
+    stored = await sync_to_async(
+        lambda: list(WeeklyPrice.objects.filter(stock=api_stock).values_list("trade_date", flat=True))
+    )()
+    assert sorted(stored) == [date(2024, 1, 7), date(2024, 1, 10)]
+
+    # 두 번째 조회는 저장된 테이블에서 응답
+    response = await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"candle_type": "weekly"}
+    )
+    assert all(row["id"] is not None for row in response.json())
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_survives_enqueue_failure(
+    authenticated_client: AsyncClient, api_stock
+):
+    """브로커 장애로 집계 태스크 등록이 실패해도 계산한 캔들로 응답"""
+    from unittest.mock import patch
+    from apps.stocks.services import materialization_requests, resampled_price_cache
+
+    resampled_price_cache.clear()
+    materialization_requests.clear()
+    await _create_daily_series(api_stock, date(2024, 1, 1), 10)
+
+    with patch(
+        "api.v1.stocks.materialize_candles_task.delay", side_effect=ConnectionError("broker down")
+    ):
+        response = await authenticated_client.get(
+            f"/api/v1/stocks/{api_stock.code}/prices", params={"candle_type": "weekly"}
+        )
+
+    assert response.status_code == 200
+    assert [row["trade_date"] for row in response.json()] == ["2024-01-10", "2024-01-07"]
+
+    # 등록 실패한 구간은 해제되므로 다음 요청이 다시 등록
+    with patch("api.v1.stocks.materialize_candles_task.delay") as mock_delay:
+        await authenticated_client.get(
+            f"/api/v1/stocks/{api_stock.code}/prices", params={"candle_type": "weekly"}
+        )
+
+    mock_delay.assert_called_once_with(api_stock.id, "weekly", "2024-01-01", "2024-01-10")
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_get_stock_prices_skips_gap_check_when_full(
+    authenticated_client: AsyncClient, api_stock
+):
+    """저장된 캔들이 limit개 이상이면 일봉 비교를 하지 않음"""
+    from unittest.mock import patch
+
+    await _create_daily_series(api_stock, date(2024, 1, 1), 10)
+    await authenticated_client.get(
+        f"/api/v1/stocks/{api_stock.code}/prices", params={"candle_type": "weekly"}
+    )
+
+    with patch("api.v1.stocks.find_missing_candles") as mock_find:
+        response = await authenticated_client.get(
+            f"/api/v1/stocks/{api_stock.code}/prices",
+            params={"candle_type": "weekly", "limit": 2},
+        )
+
+    assert response.status_code == 200
+    assert all(row["id"] is not None for row in response.json())
+    mock_find.assert_not_called()
+
+
 @pytest.mark.asyncio
 @pytest.mark.django_db(transaction=True)
 async def test_list_stocks_unauthenticated(async_client: AsyncClient, api_stock):
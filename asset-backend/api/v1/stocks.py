@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
 from datetime import date
 from asgiref.sync import sync_to_async
+import logging
 
 from api.schemas import (
     StockResponse,
@@ -13,6 +14,16 @@ from api.schemas import (
 from api.dependencies import get_current_user, get_current_active_superuser
 from apps.accounts.models import User
 from apps.stocks.models import Stock, DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice
+from apps.stocks.services import (
+    claim_materialization,
+    find_missing_candles,
+    get_resampled_prices,
+    release_materialization,
+    stored_candle_type,
+)
+from apps.stocks.tasks import materialize_candles_task
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stocks", tags=["stocks"])
 
@@ -124,6 +135,10 @@ async def update_stock(
 async def get_stock_prices(
     stock_code: str,
     candle_type: str = Query(default="daily", description="캔들 타입: daily, weekly, monthly, yearly"),
+    interval: Optional[str] = Query(
+        default=None,
+        description="임의 캔들 간격 (예: 3D, 2W, Q, 6M). 지정 시 candle_type 대신 사용",
+    ),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     limit: int = Query(default=30, le=365),
@@ -137,10 +152,26 @@ async def get_stock_prices(
     - weekly: 주봉
     - monthly: 월봉
     - yearly: 연봉
+
+    interval:
+    - D, W, M, Y: 저장된 일봉/주봉/월봉/연봉 테이블 조회
+    - 그 외 (3D, 2W, Q, 6M 등): 일봉을 요청 시 리샘플링 (결과는 캐시됨)
     """
+    resample_interval = None
+    if interval:
+        try:
+            candle_type = stored_candle_type(interval)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid interval. Use <N><unit> with unit one of D, W, M, Q, Y (e.g. 3D, 2W, Q)",
+            )
+        if candle_type is None:
+            resample_interval = interval
+
     # candle_type 검증
     valid_candle_types = ["daily", "weekly", "monthly", "yearly"]
-    if candle_type not in valid_candle_types:
+    if resample_interval is None and candle_type not in valid_candle_types:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid candle_type. Must be one of: {', '.join(valid_candle_types)}",
@@ -172,7 +203,47 @@ async def get_stock_prices(
         if end_date:
             queryset = queryset.filter(trade_date__lte=end_date)
 
-        return list(queryset[:limit])
+        prices = list(queryset[:limit])
+        if candle_type == "daily" or len(prices) >= limit:
+            return prices
+
+        # 저장된 캔들이 limit보다 적으면 빈 구간을 일봉에서 바로 계산하고, 저장은 태스크로 넘김
+        missing = find_missing_candles(
+            stock, candle_type, [p.trade_date for p in prices], start_date, end_date, limit
+        )
+        if missing is None:
+            return prices
+
+        candles, span_start, span_end = missing
+        if claim_materialization(stock.id, candle_type, span_start, span_end):
+            try:
+                materialize_candles_task.delay(
+                    stock.id, candle_type, span_start.isoformat(), span_end.isoformat()
+                )
+            except Exception as e:
+                # 브로커 장애여도 계산한 캔들은 응답하고, 구간을 해제해 다음 요청이 다시 등록
+                logger.error(
+                    f"Failed to enqueue {candle_type} materialization for {stock.code}: {e}"
+                )
+                release_materialization(stock.id, candle_type, span_start, span_end)
+        return [
+            DailyPriceResponse(stock_id=stock.id, **candle)
+            for candle in reversed(candles)
+        ]
+
+    if resample_interval:
+        candles = await sync_to_async(get_resampled_prices)(
+            stock, resample_interval, start_date, end_date
+        )
+        return [
+            DailyPriceResponse(
+                stock_id=stock.id,
+                stock_code=stock.code,
+                stock_name=stock.name,
+                **candle,
+            )
+            for candle in reversed(candles[-limit:])
+        ]
 
     prices = await get_prices()
 
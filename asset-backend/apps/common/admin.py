@@ -1,3 +1,38 @@
 from django.contrib import admin
+from django.utils import timezone
 
-# 공통 앱에는 admin 모델이 없을 수 있음
+from .models import FetchFailure, IngestionRun
+
+
+@admin.register(FetchFailure)
+class FetchFailureAdmin(admin.ModelAdmin):
+    list_display = ("source", "dataset", "item", "target_date", "status", "attempts", "next_retry_at", "updated_at")
+    list_filter = ("source", "dataset", "status")
+    search_fields = ("item", "error")
+    date_hierarchy = "target_date"
+    readonly_fields = ("created_at", "updated_at")
+    ordering = ("-updated_at",)
+    actions = ["retry_now"]
+
+    @admin.action(description="선택한 항목 즉시 재시도 대기열에 추가")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status="resolved").update(
+            status="pending", next_retry_at=timezone.now()
+        )
+        self.message_user(request, f"{updated}건을 재시도 대기열에 추가했습니다.")
+
+
+@admin.register(IngestionRun)
+class IngestionRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "pipeline", "source", "target_date", "status", "rows_fetched", "rows_written",
+        "rows_skipped", "duration", "rows_per_sec_display", "started_at",
+    )
+    list_filter = ("pipeline", "source", "status")
+    date_hierarchy = "target_date"
+    readonly_fields = [field.name for field in IngestionRun._meta.fields]
+    ordering = ("-started_at",)
+
+    @admin.display(description="초당 저장 행 수")
+    def rows_per_sec_display(self, obj):
+        return f"{obj.rows_per_sec:.0f}"
@@ -0,0 +1,158 @@
+"""
+외부 데이터 원본 응답 보관소
+
+pykrx/pyupbit가 반환한 DataFrame을 소스/엔드포인트/날짜/파라미터 키로
+압축 Parquet 파일에 저장하고, 재처리 시 네트워크 대신 보관본을 읽습니다.
+
+경로: {RAW_ARCHIVE_DIR}/{source}/{endpoint}/{YYYY-MM-DD}/{params}.parquet
+
+모드 (settings.RAW_ARCHIVE_MODE, archive_mode()로 일시 변경 가능):
+- off: 보관하지 않음
+- record: 조회 후 저장, RAW_ARCHIVE_MAX_AGE초 이내 보관본은 재사용 (재시도 시 재조회 방지)
+- replay: 보관본이 있으면 사용, 없으면 조회 후 저장
+- offline: 보관본만 사용 (없으면 ArchiveMissError)
+
+pykrx는 조회 오류도 빈 DataFrame으로 반환하므로 빈 응답은 보관하지 않고,
+이전에 보관된 빈 응답도 offline 모드가 아니면 사용하지 않고 다시 조회합니다.
+"""
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from django.conf import settings
+
+from apps.common.exceptions import ArchiveMissError
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MODES = ("off", "record", "replay", "offline")
+ARCHIVE_COMPRESSION = "zstd"
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9=._-]+")
+
+_mode_override: Optional[str] = None
+
+
+def get_archive_mode() -> str:
+    mode = _mode_override or getattr(settings, "RAW_ARCHIVE_MODE", "off")
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"Invalid archive mode: {mode}")
+    return mode
+
+
+@contextmanager
+def archive_mode(mode: str):
+    """
+    보관소 모드를 일시적으로 변경 (프로세스 전체, 작업 스레드 포함)
+
+    예: 관리 명령에서 with archive_mode("offline"): 로 보관본만으로 재적재
+    """
+    global _mode_override
+
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"Invalid archive mode: {mode}")
+
+    previous = _mode_override
+    _mode_override = mode
+    try:
+        yield
+    finally:
+        _mode_override = previous
+
+
+def archive_path(source: str, endpoint: str, day: date, params: dict | None = None) -> Path:
+    """보관 파일 경로 (파라미터는 키 순서로 정렬하여 파일명에 사용)"""
+    parts = [f"{key}={value}" for key, value in sorted((params or {}).items())]
+    name = _UNSAFE_CHARS.sub("-", "__".join(parts)) or "default"
+    return Path(settings.RAW_ARCHIVE_DIR) / source / endpoint / day.isoformat() / f"{name}.parquet"
+
+
+def save_frame(path: Path, df: pd.DataFrame):
+    """DataFrame을 압축 Parquet으로 저장 (임시 파일 후 교체)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, compression=ARCHIVE_COMPRESSION)
+    os.replace(tmp_path, path)
+
+
+def load_frame(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def load_archived(
+    source: str,
+    endpoint: str,
+    day: date,
+    params: dict | None,
+) -> tuple[Optional[Path], Optional[pd.DataFrame]]:
+    """
+    조회 전 보관본 확인
+
+    Returns:
+        (저장할 경로, 사용할 보관본): off 모드면 경로가 None, 쓸 수 있는 보관본이 없으면 보관본이 None
+
+    Raises:
+        ArchiveMissError: offline 모드에서 보관본이 없을 때
+    """
+    mode = get_archive_mode()
+    if mode == "off":
+        return None, None
+
+    path = archive_path(source, endpoint, day, params)
+    if path.exists():
+        fresh = time.time() - path.stat().st_mtime <= settings.RAW_ARCHIVE_MAX_AGE
+        if mode in ("replay", "offline") or fresh:
+            df = load_frame(path)
+            if not df.empty or mode == "offline":
+                logger.debug(f"Loaded archived payload: {path}")
+                return path, df
+            logger.debug(f"Ignoring empty archived payload: {path}")
+
+    if mode == "offline":
+        raise ArchiveMissError(f"No archived payload: {path}")
+    return path, None
+
+
+def store_archived(path: Optional[Path], df: Optional[pd.DataFrame]):
+    """조회 결과 보관 (경로가 없거나 결과가 비어 있으면 무시, 실패해도 수집을 막지 않음)"""
+    if path is None or df is None or df.empty:
+        return
+    try:
+        save_frame(path, df)
+    except Exception as e:
+        # 보관 실패가 수집을 막지 않도록 경고만 남김
+        logger.warning(f"Failed to archive payload to {path}: {e}")
+
+
+def archived_fetch(
+    source: str,
+    endpoint: str,
+    day: date,
+    params: dict | None,
+    fetch: Callable[[], Optional[pd.DataFrame]],
+) -> Optional[pd.DataFrame]:
+    """
+    보관소를 거쳐 원본 DataFrame 조회
+
+    Args:
+        source: 데이터 소스 (krx, upbit)
+        endpoint: 조회 함수 구분 (ohlcv_by_ticker, ohlcv, ...)
+        day: 조회 기준일
+        params: 조회 파라미터 (파일명 키)
+        fetch: 네트워크 조회 함수 (None이나 빈 DataFrame 반환 시 보관하지 않음)
+
+    Raises:
+        ArchiveMissError: offline 모드에서 보관본이 없을 때
+    """
+    path, archived = load_archived(source, endpoint, day, params)
+    if archived is not None:
+        return archived
+
+    df = fetch()
+    store_archived(path, df)
+    return df
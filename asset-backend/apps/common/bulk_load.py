@@ -0,0 +1,289 @@
+"""
+COPY 기반 대용량 과거 시세 적재
+
+CSV/Parquet 파일을 청크 단위로 읽어 PostgreSQL 임시 스테이징 테이블에 COPY로 흘려 넣은 뒤,
+INSERT ... SELECT ... ON CONFLICT 한 번으로 대상 테이블에 병합합니다.
+종목/코인 외래키는 SQL에서 코드로 조인하여 해결하므로 ORM 객체를 만들지 않습니다.
+
+대상 (테이블명은 모델의 db_table을 사용):
+- krx_daily: DailyPrice (code, trade_date, open_price, ..., market_cap)
+- upbit_candles: CoinCandle (market_code, candle_type, trade_date, open_price, ...)
+
+입력 파일의 컬럼명은 대상 필드명과 같아야 하며, 없는 선택 컬럼은 NULL로 적재됩니다.
+"""
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+from django.db import connection, transaction
+
+from apps.crypto.models import Coin, CoinCandle
+from apps.stocks.models import DailyPrice, Stock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200_000
+STAGING_TABLE = "bulk_load_staging"
+
+
+@dataclass(frozen=True)
+class LoadTarget:
+    """적재 대상 정의"""
+    table: str
+    key_column: str
+    # 스테이징 컬럼 -> PostgreSQL 타입 (입력 파일 컬럼 순서)
+    columns: dict[str, str]
+    required: tuple[str, ...]
+    conflict_columns: tuple[str, ...]
+    # 코드로 외래키를 찾는 참조 테이블/코드 컬럼/대상 외래키 컬럼
+    ref_table: str
+    ref_code_column: str
+    fk_column: str
+    # 참조 테이블에 없는 코드를 만들 때 채울 컬럼 -> SQL 값 (코드는 st.{key_column})
+    ref_defaults: dict[str, str] = field(default_factory=dict)
+    # 병합 시 스테이징에 없는 대상 컬럼 -> SQL 값
+    extra_values: dict[str, str] = field(default_factory=dict)
+
+
+LOAD_TARGETS = {
+    "krx_daily": LoadTarget(
+        table=DailyPrice._meta.db_table,
+        key_column="code",
+        columns={
+            "code": "text",
+            "trade_date": "date",
+            "open_price": "numeric",
+            "high_price": "numeric",
+            "low_price": "numeric",
+            "close_price": "numeric",
+            "volume": "bigint",
+            "amount": "bigint",
+            "change": "numeric",
+            "change_rate": "numeric",
+            "market_cap": "bigint",
+        },
+        required=("code", "trade_date", "open_price", "high_price", "low_price", "close_price", "volume"),
+        conflict_columns=(DailyPrice._meta.get_field("stock").column, "trade_date"),
+        ref_table=Stock._meta.db_table,
+        ref_code_column="code",
+        fk_column=DailyPrice._meta.get_field("stock").column,
+        ref_defaults={"name": "st.code", "is_active": "true"},
+    ),
+    "upbit_candles": LoadTarget(
+        table=CoinCandle._meta.db_table,
+        key_column="market_code",
+        columns={
+            "market_code": "text",
+            "candle_type": "text",
+            "trade_date": "date",
+            "open_price": "numeric",
+            "high_price": "numeric",
+            "low_price": "numeric",
+            "close_price": "numeric",
+            "volume": "numeric",
+            "candle_acc_trade_volume": "numeric",
+        },
+        required=(
+            "market_code", "candle_type", "trade_date",
+            "open_price", "high_price", "low_price", "close_price", "volume",
+        ),
+        conflict_columns=(CoinCandle._meta.get_field("coin").column, "candle_type", "trade_date"),
+        ref_table=Coin._meta.db_table,
+        ref_code_column="market_code",
+        fk_column=CoinCandle._meta.get_field("coin").column,
+        ref_defaults={
+            "korean_name": "split_part(st.market_code, '-', 2)",
+            "english_name": "split_part(st.market_code, '-', 2)",
+            "is_active": "true",
+            "created_at": "now()",
+            "updated_at": "now()",
+        },
+        extra_values={"created_at": "now()", "updated_at": "now()"},
+    ),
+}
+
+
+def iter_frames(path: Path, columns: list[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    CSV/Parquet 파일을 청크 단위 DataFrame으로 읽기
+
+    파일 전체를 메모리에 올리지 않으며, 없는 컬럼은 빈 값으로 채워 columns 순서로 반환합니다.
+    CSV 값은 문자열 그대로 전달하여 소수 정밀도를 잃지 않습니다.
+    """
+    path = Path(path)
+    name = path.name.lower()
+
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        present = [c for c in columns if c in parquet.schema_arrow.names]
+        batches = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunk_size, columns=present))
+    elif name.endswith((".csv", ".csv.gz")):
+        batches = pd.read_csv(path, dtype=str, chunksize=chunk_size, keep_default_na=False, na_values=[""])
+    else:
+        raise ValueError(f"Unsupported file type: {path.name} (expected .csv or .parquet)")
+
+    for frame in batches:
+        yield frame.reindex(columns=columns)
+
+
+def frame_to_copy_buffer(frame: pd.DataFrame) -> io.StringIO:
+    """DataFrame을 COPY ... (FORMAT csv)용 텍스트로 변환 (NULL은 빈 값, 날짜는 YYYY-MM-DD)"""
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].dt.strftime("%Y-%m-%d")
+
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False, na_rep="")
+    buffer.seek(0)
+    return buffer
+
+
+def _qn(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def staging_table_sql(target: LoadTarget) -> str:
+    columns = ", ".join(f"{_qn(name)} {sql_type}" for name, sql_type in target.columns.items())
+    return (
+        f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+        f"(seq bigserial, {columns}) ON COMMIT DROP"
+    )
+
+
+def create_missing_refs_sql(target: LoadTarget) -> str:
+    """스테이징에 있지만 참조 테이블에 없는 코드 일괄 생성"""
+    columns = [target.ref_code_column, *target.ref_defaults]
+    values = [f"st.{_qn(target.key_column)}", *target.ref_defaults.values()]
+    return (
+        f"INSERT INTO {_qn(target.ref_table)} ({', '.join(_qn(c) for c in columns)}) "
+        f"SELECT DISTINCT ON (st.{_qn(target.key_column)}) {', '.join(values)} "
+        f"FROM {STAGING_TABLE} st "
+        f"WHERE st.{_qn(target.key_column)} IS NOT NULL "
+        f"ON CONFLICT ({_qn(target.ref_code_column)}) DO NOTHING"
+    )
+
+
+def merge_sql(target: LoadTarget) -> str:
+    """
+    스테이징 -> 대상 테이블 병합 SQL
+
+    코드로 외래키를 조인하고, 필수 값이 빠진 행은 제외하며,
+    같은 키가 여러 번 나오면 파일에서 나중에 나온 행을 사용합니다.
+    """
+    value_columns = [c for c in target.columns if c != target.key_column]
+    key_columns = [c for c in target.conflict_columns if c != target.fk_column]
+    insert_columns = [target.fk_column, *value_columns, *target.extra_values]
+    select_values = [
+        "ref.id",
+        *(f"st.{_qn(c)}" for c in value_columns),
+        *target.extra_values.values(),
+    ]
+    distinct_on = [f"st.{_qn(target.key_column)}", *(f"st.{_qn(c)}" for c in key_columns)]
+    not_null = " AND ".join(f"st.{_qn(c)} IS NOT NULL" for c in target.required)
+    updates = [
+        c for c in [*value_columns, *target.extra_values]
+        if c not in target.conflict_columns and c != "created_at"
+    ]
+
+    return (
+        f"INSERT INTO {_qn(target.table)} ({', '.join(_qn(c) for c in insert_columns)}) "
+        f"SELECT DISTINCT ON ({', '.join(distinct_on)}) {', '.join(select_values)} "
+        f"FROM {STAGING_TABLE} st "
+        f"JOIN {_qn(target.ref_table)} ref ON ref.{_qn(target.ref_code_column)} = st.{_qn(target.key_column)} "
+        f"WHERE {not_null} "
+        f"ORDER BY {', '.join(distinct_on)}, st.seq DESC "
+        f"ON CONFLICT ({', '.join(_qn(c) for c in target.conflict_columns)}) DO UPDATE SET "
+        + ", ".join(f"{_qn(c)} = EXCLUDED.{_qn(c)}" for c in updates)
+    )
+
+
+def bulk_load(
+    path: Path,
+    target_name: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    create_missing: bool = False,
+    defaults: dict[str, str] | None = None,
+    progress=None,
+) -> dict:
+    """
+    파일을 COPY로 스테이징한 뒤 대상 테이블에 한 번에 병합
+
+    Args:
+        path: CSV 또는 Parquet 파일 경로
+        target_name: LOAD_TARGETS 키 (krx_daily, upbit_candles)
+        chunk_size: COPY 한 번에 보낼 행 수
+        create_missing: 참조 테이블(Stock/Coin)에 없는 코드를 생성
+        defaults: 파일에 없는 컬럼의 고정 값 (예: {"candle_type": "days"})
+        progress: 청크마다 (누적 행 수, 초당 행 수)를 받는 콜백
+
+    Returns:
+        dict: 읽은 행 수, 병합된 행 수, 제외된 행 수, 단계별/전체 소요 시간, 초당 행 수
+
+    Raises:
+        ValueError: 알 수 없는 대상, 지원하지 않는 파일 형식
+        RuntimeError: PostgreSQL이 아닌 DB
+    """
+    if target_name not in LOAD_TARGETS:
+        raise ValueError(f"Unknown load target: {target_name}")
+    if connection.vendor != "postgresql":
+        raise RuntimeError("COPY bulk loading requires PostgreSQL")
+
+    target = LOAD_TARGETS[target_name]
+    columns = list(target.columns)
+    copy_sql = (
+        f"COPY {STAGING_TABLE} ({', '.join(_qn(c) for c in columns)}) "
+        f"FROM STDIN WITH (FORMAT csv)"
+    )
+
+    started = time.monotonic()
+    rows_read = 0
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # 적재 전용 트랜잭션: 커밋 대기 없이 진행 (실패 시 전체 롤백)
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        cursor.execute(staging_table_sql(target))
+
+        for frame in iter_frames(path, columns, chunk_size):
+            for column, value in (defaults or {}).items():
+                if column in frame.columns:
+                    frame[column] = frame[column].fillna(value)
+            with cursor.copy(copy_sql) as copy:
+                copy.write(frame_to_copy_buffer(frame).getvalue())
+            rows_read += len(frame)
+
+            elapsed = time.monotonic() - started
+            if progress:
+                progress(rows_read, rows_read / elapsed if elapsed > 0 else 0.0)
+        copy_seconds = time.monotonic() - started
+
+        cursor.execute(f"ANALYZE {STAGING_TABLE}")
+        if create_missing:
+            cursor.execute(create_missing_refs_sql(target))
+            if cursor.rowcount:
+                logger.info(f"Created {cursor.rowcount} missing rows in {target.ref_table}")
+
+        cursor.execute(merge_sql(target))
+        rows_merged = cursor.rowcount
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "rows_read": rows_read,
+        "rows_merged": rows_merged,
+        "rows_rejected": rows_read - rows_merged,
+        "copy_seconds": copy_seconds,
+        "merge_seconds": elapsed - copy_seconds,
+        "elapsed": elapsed,
+        "rows_per_sec": rows_read / elapsed if elapsed > 0 else 0.0,
+    }
+    logger.info(
+        f"Bulk loaded {path} into {target.table}: {rows_merged}/{rows_read} rows merged "
+        f"in {elapsed:.1f}s ({summary['rows_per_sec']:.0f} rows/sec)"
+    )
+    return summary
@@ -4,6 +4,9 @@ Redis 캐싱 유틸리티
 import logging
 import json
 import pickle
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from typing import Any, Callable, Optional
 from datetime import timedelta
@@ -184,3 +187,54 @@ class CacheManager:
         """주식 관련 캐시 무효화"""
         invalidate_pattern(f"stock:price:{stock_code}")
         invalidate_pattern("stock:list")
+
+
+class LRUCache:
+    """
+    프로세스 내 크기 제한 LRU 캐시
+
+    최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    ttl(초)을 지정하면 저장 후 ttl이 지난 항목은 없는 것으로 봅니다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            expires_at, value = self._data[key]
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            expires_at = self.clock() + self.ttl if self.ttl is not None else None
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -16,6 +16,11 @@ class CryptoDataFetchError(AssetBaseException):
     pass
 
 
+class ArchiveMissError(AssetBaseException):
+    """오프라인 재처리 시 원본 응답 보관본이 없을 때 발생하는 예외"""
+    pass
+
+
 class KakaoAPIError(AssetBaseException):
     """카카오 API 호출 중 발생하는 예외"""
     pass
@@ -0,0 +1,102 @@
+"""
+수집 실패 기록 (FetchFailure)
+
+수집 중 일부 항목(종목/코인)만 실패하면 전체 태스크를 재시도하는 대신 실패 항목을 기록하고,
+각 앱의 재수집 태스크가 재시도 시점이 된 항목만 다시 조회합니다.
+재시도 간격은 FAILURE_RETRY_BASE_SECONDS * 2^재시도 횟수 이며,
+FAILURE_MAX_ATTEMPTS 회 실패하면 abandoned 로 바꿔 더 이상 재시도하지 않습니다.
+"""
+import logging
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from .models import FetchFailure
+
+logger = logging.getLogger(__name__)
+
+FAILURE_RETRY_BASE_SECONDS = 60
+FAILURE_MAX_ATTEMPTS = 5
+ERROR_MESSAGE_MAX_LENGTH = 2000
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """재시도 횟수에 따른 대기 시간 (지수 백오프)"""
+    return timedelta(seconds=FAILURE_RETRY_BASE_SECONDS * 2 ** attempts)
+
+
+def record_failure(
+    source: str,
+    dataset: str,
+    item: str,
+    target_date: date,
+    error,
+    params: dict | None = None,
+) -> FetchFailure:
+    """
+    항목 수집 실패 기록
+
+    같은 항목이 이미 기록되어 있으면 오류 메시지와 파라미터만 갱신하고
+    대기 상태로 되돌립니다. 재시도 횟수는 재수집 태스크에서만 증가합니다.
+    """
+    failure, created = FetchFailure.objects.get_or_create(
+        source=source,
+        dataset=dataset,
+        item=item,
+        target_date=target_date,
+        defaults={
+            "params": params or {},
+            "error": str(error)[:ERROR_MESSAGE_MAX_LENGTH],
+            "next_retry_at": timezone.now() + retry_delay(0),
+        },
+    )
+    if not created:
+        failure.params = params or failure.params
+        failure.error = str(error)[:ERROR_MESSAGE_MAX_LENGTH]
+        if failure.status == "resolved":
+            failure.status = "pending"
+            failure.attempts = 0
+            failure.next_retry_at = timezone.now() + retry_delay(0)
+        failure.save(update_fields=["params", "error", "status", "attempts", "next_retry_at", "updated_at"])
+
+    logger.debug(f"Recorded fetch failure: {failure}")
+    return failure
+
+
+def resolve_failures(source: str, dataset: str, target_date: date, items) -> int:
+    """수집에 성공한 항목의 미해결 실패 기록을 해결 처리"""
+    items = list(items)
+    if not items:
+        return 0
+    return FetchFailure.objects.filter(
+        source=source,
+        dataset=dataset,
+        target_date=target_date,
+        item__in=items,
+        status="pending",
+    ).update(status="resolved", next_retry_at=None, updated_at=timezone.now())
+
+
+def due_failures(source: str, dataset: str | None = None, limit: int | None = None):
+    """재시도 시점이 된 대기 중인 실패 기록 (대상일, 항목 순)"""
+    failures = FetchFailure.objects.filter(
+        source=source,
+        **({"dataset": dataset} if dataset else {}),
+        status="pending",
+        next_retry_at__lte=timezone.now(),
+    ).order_by("target_date", "item")
+    return failures[:limit] if limit else failures
+
+
+def mark_retry_failed(failure: FetchFailure, error) -> FetchFailure:
+    """재시도 실패 반영 (백오프 연장, 최대 횟수 초과 시 재시도 중단)"""
+    failure.attempts += 1
+    failure.error = str(error)[:ERROR_MESSAGE_MAX_LENGTH]
+    if failure.attempts >= FAILURE_MAX_ATTEMPTS:
+        failure.status = "abandoned"
+        failure.next_retry_at = None
+        logger.warning(f"Giving up on {failure} after {failure.attempts} attempts")
+    else:
+        failure.next_retry_at = timezone.now() + retry_delay(failure.attempts)
+    failure.save(update_fields=["attempts", "error", "status", "next_retry_at", "updated_at"])
+    return failure
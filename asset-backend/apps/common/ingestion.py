@@ -0,0 +1,124 @@
+"""
+수집 실행 기록 (IngestionRun)
+
+Celery beat 중복 실행이나 재시도로 이미 끝난 수집/집계를 다시 하지 않도록
+(파이프라인, 소스, 대상일, 파라미터) 단위 실행 결과를 기록하고 조회합니다.
+
+사용 예:
+    if not force and (previous := previous_run("daily_prices", "krx", target_date)):
+        return skipped_run_result(previous)
+
+    run = start_ingestion("daily_prices", "krx", target_date)
+    with track_ingestion(run):
+        ...
+        run.rows_written = written
+"""
+import logging
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from .models import IngestionRun
+
+logger = logging.getLogger(__name__)
+
+# 이 시간보다 오래 진행 중인 실행은 중단된 것으로 보고 다시 실행 허용
+INGESTION_STALE_SECONDS = 3600
+# 파라미터 비교를 위해 확인하는 최근 실행 수
+RECENT_RUNS_LIMIT = 20
+ERROR_MESSAGE_MAX_LENGTH = 2000
+
+
+def previous_run(
+    pipeline: str,
+    source: str,
+    target_date: date,
+    params: dict | None = None,
+    checksum: str | None = None,
+) -> IngestionRun | None:
+    """
+    다시 실행할 필요가 없게 만드는 가장 최근 실행
+
+    같은 파라미터로 성공했거나(checksum을 주면 체크섬도 같아야 함),
+    아직 진행 중인(INGESTION_STALE_SECONDS 이내 시작) 실행을 반환합니다.
+    """
+    params = params or {}
+    stale_before = timezone.now() - timedelta(seconds=INGESTION_STALE_SECONDS)
+    runs = IngestionRun.objects.filter(
+        pipeline=pipeline,
+        source=source,
+        target_date=target_date,
+        status__in=("success", "running"),
+    ).order_by("-started_at")[:RECENT_RUNS_LIMIT]
+
+    for run in runs:
+        if run.params != params:
+            continue
+        if run.status == "running":
+            if run.started_at >= stale_before:
+                return run
+            continue
+        if checksum is None or run.checksum == checksum:
+            return run
+    return None
+
+
+def skipped_run_result(run: IngestionRun) -> dict:
+    """이전 실행 때문에 건너뛴 태스크의 반환 값"""
+    reason = "in_progress" if run.status == "running" else "already_ingested"
+    logger.info(f"Skipping {run.pipeline} for {run.target_date}: {reason} (run {run.id})")
+    return {
+        "success": True,
+        "ingested": False,
+        "reason": reason,
+        "run_id": run.id,
+        "date": run.target_date.isoformat(),
+    }
+
+
+def start_ingestion(pipeline: str, source: str, target_date: date, params: dict | None = None) -> IngestionRun:
+    """진행 중 실행 기록 생성"""
+    return IngestionRun.objects.create(
+        pipeline=pipeline,
+        source=source,
+        target_date=target_date,
+        params=params or {},
+    )
+
+
+def finish_ingestion(run: IngestionRun, error=None, duration: float | None = None):
+    """
+    실행 결과 저장
+
+    오류가 없으면 저장/건너뛴 행이 하나라도 있을 때 success, 없으면 empty로 기록합니다.
+    """
+    if error is not None:
+        run.status = "failed"
+        run.error = str(error)[:ERROR_MESSAGE_MAX_LENGTH]
+    else:
+        run.status = "success" if run.rows_written or run.rows_skipped else "empty"
+    run.finished_at = timezone.now()
+    run.duration = (
+        duration if duration is not None
+        else (run.finished_at - run.started_at).total_seconds()
+    )
+    run.save()
+
+    logger.info(
+        f"Ingestion run {run.id} {run.pipeline}:{run.source} {run.target_date} {run.status}: "
+        f"{run.rows_written} written, {run.rows_skipped} skipped in {run.duration:.1f}s"
+    )
+
+
+@contextmanager
+def track_ingestion(run: IngestionRun):
+    """블록 실행 결과를 실행 기록에 반영 (예외는 failed로 기록 후 다시 발생)"""
+    started = time.monotonic()
+    try:
+        yield run
+    except Exception as e:
+        finish_ingestion(run, error=e, duration=time.monotonic() - started)
+        raise
+    finish_ingestion(run, duration=time.monotonic() - started)
@@ -0,0 +1,80 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.bulk_load import DEFAULT_CHUNK_SIZE, LOAD_TARGETS, bulk_load
+
+
+class Command(BaseCommand):
+    help = "Bulk load historical KRX daily prices or Upbit candles from CSV/Parquet via COPY (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "target",
+            choices=sorted(LOAD_TARGETS),
+            help="Load target: krx_daily (stocks_dailyprice) or upbit_candles (crypto_coin_candle)",
+        )
+        parser.add_argument(
+            "files",
+            nargs="+",
+            help="CSV (.csv, .csv.gz) or Parquet files whose columns match the target fields",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows sent per COPY chunk (default: {DEFAULT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--create-missing",
+            action="store_true",
+            help="Create Stock/Coin rows for codes that do not exist yet",
+        )
+        parser.add_argument(
+            "--candle-type",
+            type=str,
+            default="days",
+            help="candle_type for upbit_candles files without that column (default: days)",
+        )
+
+    def handle(self, *args, **options):
+        paths = [Path(f) for f in options["files"]]
+        missing = [str(p) for p in paths if not p.exists()]
+        if missing:
+            raise CommandError(f"Files not found: {', '.join(missing)}")
+
+        defaults = {"candle_type": options["candle_type"]} if options["target"] == "upbit_candles" else None
+
+        def report(rows, rows_per_sec):
+            self.stdout.write(f"  staged {rows} rows ({rows_per_sec:.0f} rows/sec)")
+
+        total_read = total_merged = 0
+        total_elapsed = 0.0
+        for path in paths:
+            self.stdout.write(self.style.NOTICE(f"Loading {path} into {options['target']}"))
+            try:
+                summary = bulk_load(
+                    path,
+                    options["target"],
+                    chunk_size=options["chunk_size"],
+                    create_missing=options["create_missing"],
+                    defaults=defaults,
+                    progress=report,
+                )
+            except (ValueError, RuntimeError) as e:
+                raise CommandError(str(e))
+
+            total_read += summary["rows_read"]
+            total_merged += summary["rows_merged"]
+            total_elapsed += summary["elapsed"]
+            self.stdout.write(self.style.SUCCESS(
+                f"{path.name}: {summary['rows_merged']} merged, {summary['rows_rejected']} rejected "
+                f"of {summary['rows_read']} rows in {summary['elapsed']:.1f}s "
+                f"(copy {summary['copy_seconds']:.1f}s, merge {summary['merge_seconds']:.1f}s, "
+                f"{summary['rows_per_sec']:.0f} rows/sec)"
+            ))
+
+        rows_per_sec = total_read / total_elapsed if total_elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Bulk load finished: {total_merged}/{total_read} rows merged from {len(paths)} files "
+            f"in {total_elapsed:.1f}s ({rows_per_sec:.0f} rows/sec)"
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FetchFailure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('source', models.CharField(max_length=20, verbose_name='소스')),
+                ('dataset', models.CharField(max_length=30, verbose_name='데이터 구분')),
+                ('item', models.CharField(max_length=30, verbose_name='항목')),
+                ('target_date', models.DateField(verbose_name='대상일')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='조회 파라미터')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류 메시지')),
+                ('status', models.CharField(choices=[('pending', '재시도 대기'), ('resolved', '해결'), ('abandoned', '재시도 중단')], default='pending', max_length=20, verbose_name='상태')),
+                ('attempts', models.IntegerField(default=0, verbose_name='재시도 횟수')),
+                ('next_retry_at', models.DateTimeField(blank=True, null=True, verbose_name='다음 재시도 일시')),
+            ],
+            options={
+                'verbose_name': '수집 실패 기록',
+                'verbose_name_plural': '수집 실패 기록 목록',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['source', 'status', 'next_retry_at'], name='common_fetc_source_6a57d1_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source', 'dataset', 'item', 'target_date'), name='unique_fetch_failure')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_fetchfailure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pipeline', models.CharField(max_length=50, verbose_name='파이프라인')),
+                ('source', models.CharField(max_length=20, verbose_name='소스')),
+                ('target_date', models.DateField(verbose_name='대상일')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='실행 파라미터')),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('success', '성공'), ('empty', '데이터 없음'), ('failed', '실패')], default='running', max_length=20, verbose_name='상태')),
+                ('rows_fetched', models.IntegerField(default=0, verbose_name='수신 행 수')),
+                ('rows_written', models.IntegerField(default=0, verbose_name='저장 행 수')),
+                ('rows_skipped', models.IntegerField(default=0, verbose_name='건너뛴 행 수')),
+                ('duration', models.FloatField(default=0, verbose_name='소요 시간(초)')),
+                ('checksum', models.CharField(blank=True, default='', max_length=64, verbose_name='데이터 체크섬')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류 메시지')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='시작일시')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료일시')),
+            ],
+            options={
+                'verbose_name': '수집 실행 기록',
+                'verbose_name_plural': '수집 실행 기록 목록',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['pipeline', 'source', 'target_date', '-started_at'], name='common_inge_pipelin_e33fcc_idx')],
+            },
+        ),
+    ]
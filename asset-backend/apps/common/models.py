@@ -32,3 +32,88 @@ class SoftDeleteModel(models.Model):
         self.is_deleted = False
         self.deleted_at = None
         self.save()
+
+
+class FetchFailure(TimeStampedModel):
+    """
+    외부 데이터 수집 항목별 실패 기록
+
+    (소스, 데이터 구분, 항목, 날짜) 단위로 실패를 남기고,
+    재수집 태스크가 next_retry_at 이 지난 항목만 다시 조회합니다.
+    """
+    STATUS_CHOICES = [
+        ("pending", "재시도 대기"),
+        ("resolved", "해결"),
+        ("abandoned", "재시도 중단"),
+    ]
+
+    source = models.CharField("소스", max_length=20)
+    dataset = models.CharField("데이터 구분", max_length=30)
+    item = models.CharField("항목", max_length=30)
+    target_date = models.DateField("대상일")
+    params = models.JSONField("조회 파라미터", default=dict, blank=True)
+    error = models.TextField("오류 메시지", blank=True, default="")
+    status = models.CharField("상태", max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.IntegerField("재시도 횟수", default=0)
+    next_retry_at = models.DateTimeField("다음 재시도 일시", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "수집 실패 기록"
+        verbose_name_plural = "수집 실패 기록 목록"
+        ordering = ["-updated_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "dataset", "item", "target_date"],
+                name="unique_fetch_failure",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["source", "status", "next_retry_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.dataset} {self.item} {self.target_date} ({self.get_status_display()})"
+
+
+class IngestionRun(models.Model):
+    """
+    수집/집계 파이프라인 실행 기록
+
+    (파이프라인, 소스, 대상일) 단위로 실행마다 한 행을 남깁니다. 태스크는 같은 조건의
+    성공한 실행이 있으면 다시 수행하지 않으며, 처리량 대시보드의 기준 데이터로도 사용합니다.
+    """
+    STATUS_CHOICES = [
+        ("running", "진행 중"),
+        ("success", "성공"),
+        ("empty", "데이터 없음"),
+        ("failed", "실패"),
+    ]
+
+    pipeline = models.CharField("파이프라인", max_length=50)
+    source = models.CharField("소스", max_length=20)
+    target_date = models.DateField("대상일")
+    params = models.JSONField("실행 파라미터", default=dict, blank=True)
+    status = models.CharField("상태", max_length=20, choices=STATUS_CHOICES, default="running")
+    rows_fetched = models.IntegerField("수신 행 수", default=0)
+    rows_written = models.IntegerField("저장 행 수", default=0)
+    rows_skipped = models.IntegerField("건너뛴 행 수", default=0)
+    duration = models.FloatField("소요 시간(초)", default=0)
+    checksum = models.CharField("데이터 체크섬", max_length=64, blank=True, default="")
+    error = models.TextField("오류 메시지", blank=True, default="")
+    started_at = models.DateTimeField("시작일시", auto_now_add=True)
+    finished_at = models.DateTimeField("종료일시", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "수집 실행 기록"
+        verbose_name_plural = "수집 실행 기록 목록"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["pipeline", "source", "target_date", "-started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.pipeline}:{self.source} {self.target_date} ({self.get_status_display()})"
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_written / self.duration if self.duration > 0 else 0.0
@@ -0,0 +1,229 @@
+"""
+외부 API 호출 속도 제한 (토큰 버킷)
+
+버킷 상태를 Redis에 두어 여러 Celery 워커/프로세스가 같은 한도를 나눠 쓰고,
+프로세스 안에서는 같은 한도의 로컬 버킷을 먼저 확인하여 한도가 소진된 동안에는
+Redis 왕복 없이 필요한 시간만큼만 대기합니다. 토큰이 남아 있으면 대기하지 않습니다.
+
+설정 (settings.RATE_LIMITS):
+    {"upbit:candles": {"rate": 10, "burst": 1}, ...}
+    rate: 초당 허용 호출 수, burst: 한 번에 몰아 쓸 수 있는 최대 토큰 수
+
+Redis 주소는 settings.RATE_LIMIT_REDIS_URL을 사용하며, 비어 있거나 Redis에 연결할 수 없으면
+로컬 버킷만으로 제한합니다 (프로세스 간 조정 없음).
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "rate-limit:"
+# Redis 오류 후 다시 연결을 시도하기까지 로컬 버킷만 사용할 시간 (초)
+REDIS_RETRY_INTERVAL = 30.0
+# 대기 후 충전량 계산의 부동소수점 오차 허용치 (토큰)
+TOKEN_EPSILON = 1e-9
+
+# 버킷 갱신과 토큰 차감을 원자적으로 처리 (시각은 Redis 서버 기준으로 통일)
+# 반환값: 토큰을 얻으면 "0", 부족하면 필요한 대기 시간(초) 문자열
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested - 1e-9 then
+    tokens = math.max(0, tokens - requested)
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    프로세스 내 토큰 버킷 (스레드 안전)
+
+    Args:
+        rate: 초당 충전되는 토큰 수
+        capacity: 최대 토큰 수
+        clock: 단조 증가 시각 함수 (테스트용)
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, tokens: float = 1) -> float:
+        """토큰 차감, 부족하면 차감하지 않고 필요한 대기 시간(초) 반환"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens - TOKEN_EPSILON:
+                self.tokens = max(0.0, self.tokens - tokens)
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def refund(self, tokens: float = 1):
+        """사용하지 못한 토큰 반환"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class RateLimiter:
+    """
+    Redis 공유 토큰 버킷 + 로컬 버킷 속도 제한기
+
+    로컬 버킷은 같은 한도로 이 프로세스의 호출만 세므로, 로컬 버킷이 비었다면
+    공유 버킷도 비어 있어 Redis에 묻지 않고 바로 대기합니다.
+
+    Args:
+        name: 한도 이름 (Redis 키)
+        rate: 초당 허용 호출 수
+        burst: 한 번에 몰아 쓸 수 있는 최대 호출 수
+        redis_client: 공유 버킷용 Redis 클라이언트 (None이면 로컬 버킷만 사용)
+    """
+
+    def __init__(self, name: str, rate: float, burst: float = 1, redis_client=None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.local = TokenBucket(rate, burst, clock)
+        self.redis = redis_client
+        self.clock = clock
+        self.sleep = sleep
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT) if redis_client is not None else None
+        self._redis_down_until = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{RATE_LIMIT_KEY_PREFIX}{self.name}"
+
+    def _take_shared(self, tokens: float) -> float:
+        """공유 버킷에서 토큰 차감 (Redis 오류 시 로컬 버킷 결과를 따름)"""
+        if self._script is None or self.clock() < self._redis_down_until:
+            return 0.0
+        try:
+            return float(self._script(keys=[self.key], args=[self.rate, self.burst, tokens]))
+        except Exception as e:
+            logger.warning(f"Rate limiter {self.name} falling back to local bucket: {e}")
+            self._redis_down_until = self.clock() + REDIS_RETRY_INTERVAL
+            return 0.0
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """토큰 차감 시도, 얻으면 0, 아니면 다시 시도하기까지 대기할 시간(초) 반환"""
+        wait = self.local.take(tokens)
+        if wait:
+            return wait
+        wait = self._take_shared(tokens)
+        if wait:
+            # 다른 프로세스가 한도를 사용 중: 로컬 토큰은 돌려주고 공유 버킷 기준으로 대기
+            self.local.refund(tokens)
+        return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        토큰을 얻을 때까지 대기
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = 0.0
+        while wait := self.try_acquire(tokens):
+            self.sleep(wait)
+            waited += wait
+        return waited
+
+    async def try_acquire_async(self, tokens: float = 1) -> float:
+        """try_acquire의 asyncio 버전 (Redis 왕복은 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        wait = self.local.take(tokens)
+        if wait or self._script is None:
+            return wait
+        wait = await asyncio.to_thread(self._take_shared, tokens)
+        if wait:
+            self.local.refund(tokens)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+        waited = 0.0
+        while wait := await self.try_acquire_async(tokens):
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+
+_redis_client = None
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_redis_client():
+    """공유 버킷용 Redis 클라이언트 (RATE_LIMIT_REDIS_URL이 비어 있으면 None)"""
+    global _redis_client
+
+    url = getattr(settings, "RATE_LIMIT_REDIS_URL", "")
+    if not url:
+        return None
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+    return _redis_client
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """settings.RATE_LIMITS 설정으로 만든 이름별 속도 제한기 (프로세스 내 공유)"""
+    limiter = _limiters.get(name)
+    if limiter is not None:
+        return limiter
+
+    with _limiters_lock:
+        if name not in _limiters:
+            config = settings.RATE_LIMITS.get(name)
+            if config is None:
+                raise ValueError(f"Unknown rate limit: {name}")
+            _limiters[name] = RateLimiter(
+                name, config["rate"], config.get("burst", 1), redis_client=get_redis_client()
+            )
+        return _limiters[name]
+
+
+def acquire(name: str, tokens: float = 1) -> float:
+    """이름별 한도에서 토큰을 얻을 때까지 대기하고 대기한 시간(초) 반환"""
+    return get_rate_limiter(name).acquire(tokens)
+
+
+async def acquire_async(name: str, tokens: float = 1) -> float:
+    """acquire의 asyncio 버전"""
+    return await get_rate_limiter(name).acquire_async(tokens)
+
+
+def reset_rate_limiters():
+    """생성된 속도 제한기 초기화 (설정 변경 후/테스트용)"""
+    global _redis_client
+
+    with _limiters_lock:
+        _limiters.clear()
+        _redis_client = None
@@ -1,6 +1,10 @@
+import hashlib
 import logging
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Iterator, Sequence
+
+import pandas as pd
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +59,119 @@ def log_execution_time(func: Callable) -> Callable:
     return wrapper
 
 
+def frame_checksum(df: pd.DataFrame) -> str:
+    """DataFrame 내용(인덱스 포함) 체크섬 (같은 데이터면 같은 값)"""
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+def combine_checksums(checksums) -> str:
+    """여러 체크섬을 순서와 무관한 하나의 체크섬으로 결합"""
+    return hashlib.sha256("\n".join(sorted(checksums)).encode()).hexdigest()
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    """
+    시퀀스를 size 단위 청크로 분할
+
+    Args:
+        items: 분할할 시퀀스
+        size: 청크 크기
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_upsert(
+    model,
+    objs: list,
+    unique_fields: list[str],
+    update_fields: list[str],
+    batch_size: int = 500,
+    describe: Callable[[Any], str] = str,
+    on_error: Callable[[Any, Exception], None] | None = None,
+) -> int:
+    """
+    청크 단위 INSERT ... ON CONFLICT DO UPDATE
+
+    청크마다 짧은 트랜잭션으로 저장하여 잠금 시간을 줄이고, 청크 저장이 실패하면
+    해당 청크만 행 단위로 다시 저장하여 문제가 있는 행만 건너뜁니다.
+
+    Args:
+        model: 저장 대상 모델 클래스
+        objs: 저장할 모델 인스턴스 목록
+        unique_fields: 충돌 판단 기준 필드
+        update_fields: 충돌 시 갱신할 필드
+        batch_size: 청크 크기
+        describe: 실패 로그에 사용할 행 설명 함수
+        on_error: 행 단위 저장까지 실패한 행과 예외를 받는 콜백 (실패 기록용)
+
+    Returns:
+        int: 저장된 행 수
+    """
+    def _insert(chunk):
+        with transaction.atomic():
+            model.objects.bulk_create(
+                chunk,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+
+    saved = 0
+    for chunk in chunked(objs, batch_size):
+        try:
+            _insert(chunk)
+            saved += len(chunk)
+        except Exception as e:
+            logger.warning(
+                f"Bulk upsert of {len(chunk)} {model.__name__} rows failed, "
+                f"retrying row by row: {e}"
+            )
+            for obj in chunk:
+                try:
+                    _insert([obj])
+                    saved += 1
+                except Exception as row_error:
+                    logger.error(f"Failed to upsert {model.__name__} {describe(obj)}: {row_error}")
+                    if on_error:
+                        on_error(obj, row_error)
+
+    return saved
+
+
+def unchanged_row_mask(
+    incoming: pd.DataFrame,
+    stored: pd.DataFrame,
+    fields: Sequence[str],
+    decimals: int | dict = 2,
+) -> pd.Series:
+    """
+    수신 행 중 저장된 값과 동일한 행 표시
+
+    두 DataFrame을 인덱스(행 키)로 맞춘 뒤 필드 값을 소수점 자리에서 반올림하여
+    열 단위로 비교합니다. 둘 다 NULL인 값은 같은 값으로 봅니다.
+
+    Args:
+        incoming: 새로 받은 값 (인덱스: 행 키)
+        stored: DB에 저장된 값 (인덱스: 행 키)
+        fields: 비교할 필드
+        decimals: 비교 정밀도 (필드별 dict 가능)
+
+    Returns:
+        Series: incoming 인덱스 기준 bool (True면 변경 없음)
+    """
+    if stored.empty or incoming.empty:
+        return pd.Series(False, index=incoming.index)
+
+    fields = list(fields)
+    exists = incoming.index.isin(stored.index)
+    new = incoming[fields].astype(float).round(decimals)
+    old = stored.reindex(incoming.index)[fields].astype(float).round(decimals)
+    same = (new.eq(old) | (new.isna() & old.isna())).all(axis=1)
+    return same & exists
+
+
 def mask_sensitive_data(data: str, visible_chars: int = 4) -> str:
     """
     민감한 데이터를 마스킹 처리
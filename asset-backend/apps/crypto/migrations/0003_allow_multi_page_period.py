@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:14
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto', '0002_remove_coincandle_crypto_coin_coin_id_09ff5c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coincollectionconfig',
+            name='period_days',
+            field=models.IntegerField(default=30, help_text='한번에 수집할 일 수 (1~3650, 200일 초과는 페이지를 나눠 조회)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3650)], verbose_name='수집 기간(일)'),
+        ),
+    ]
@@ -100,8 +100,8 @@ class CoinCollectionConfig(models.Model):
     period_days = models.IntegerField(
         "수집 기간(일)",
         default=30,
-        help_text="한번에 수집할 일 수 (1~200)",
-        validators=[MinValueValidator(1), MaxValueValidator(200)]
+        help_text="한번에 수집할 일 수 (1~3650, 200일 초과는 페이지를 나눠 조회)",
+        validators=[MinValueValidator(1), MaxValueValidator(3650)]
     )
 
     is_active = models.BooleanField("활성화", default=True)
@@ -1,17 +1,77 @@
 import logging
-import time
-from datetime import date, timedelta
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+import numpy as np
 import pyupbit
 import pandas as pd
 
+from apps.common.archive import archived_fetch
 from apps.common.exceptions import CryptoDataFetchError
-from apps.common.utils import log_execution_time, retry_on_failure
+from apps.common.failures import record_failure
+from apps.common.rate_limit import acquire
+from apps.common.utils import (
+    bulk_upsert,
+    combine_checksums,
+    frame_checksum,
+    log_execution_time,
+    retry_on_failure,
+    unchanged_row_mask
+)
 from .models import Coin, CoinCandle
+from .upbit_client import (
+    KST_OFFSET,
+    UPBIT_CANDLES_RATE_LIMIT,
+    UPBIT_MARKET_RATE_LIMIT,
+    UPBIT_MAX_CANDLES_PER_REQUEST,
+    CandleRangePager,
+    check_candle_type,
+    iter_candle_frames,
+    iter_candle_range_frames,
+    page_archive_key,
+)
 
 logger = logging.getLogger(__name__)
 
+# 수집 실패 기록(FetchFailure) 소스 (데이터 구분은 캔들 타입)
+CANDLE_FAILURE_SOURCE = 'upbit'
+
+# 변경 감지 비교 필드와 정밀도 (DB 소수 자릿수)
+CANDLE_COMPARE_DECIMALS = {
+    'open_price': 8,
+    'high_price': 8,
+    'low_price': 8,
+    'close_price': 8,
+    'volume': 8,
+    'candle_acc_trade_volume': 2,
+}
+CANDLE_UPDATE_FIELDS = [*CANDLE_COMPARE_DECIMALS, 'updated_at']
+CANDLE_BATCH_SIZE = 1000
+# 저장 전 검증: 비어 있으면 안 되는 필드와 DecimalField 전체 자릿수 (max_digits)
+CANDLE_REQUIRED_FIELDS = ['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+CANDLE_MAX_DIGITS = 20
+INVALID_CANDLE_ERRORS = {
+    'missing': "missing or non-finite candle values",
+    'negative': "negative candle values",
+    'high_below_low': "high price below low price",
+    'overflow': f"candle values exceed {CANDLE_MAX_DIGITS} digits",
+}
+
+# 캔들 타입별 거래일 주기 (일봉: 매일, 주봉: 월요일, 월봉: 1일)
+CANDLE_PERIOD_FREQ = {'days': 'D', 'weeks': 'W-MON', 'months': 'MS'}
+# 증분 수집 시 갱신 반영을 위해 다시 받을 마지막 저장 캔들 수 (진행 중이던 캔들 포함)
+CANDLE_REVISION_OVERLAP = 1
+
+# 일봉에서 만드는 캔들 타입 (Upbit에는 일봉만 요청)
+DERIVED_CANDLE_TYPES = ('weeks', 'months')
+# 생성 캔들 대조: 표본 코인 수, 코인별 최근 완료 주기 수, 거래량/거래대금 허용 상대 오차
+CANDLE_RECONCILE_SAMPLE_SIZE = 3
+CANDLE_RECONCILE_PERIODS = 4
+CANDLE_RECONCILE_RTOL = 1e-6
+
 
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
@@ -26,8 +86,8 @@ def fetch_all_coins() -> int:
         logger.info("Starting to fetch all KRW market coins from Upbit")
 
         # KRW 마켓의 모든 티커 조회
+        acquire(UPBIT_MARKET_RATE_LIMIT)
         tickers = pyupbit.get_tickers(fiat="KRW")
-        time.sleep(0.15)  # Rate limiting: ~6.7 req/sec
 
         if not tickers:
             logger.warning("No tickers received from Upbit")
@@ -57,10 +117,6 @@ def fetch_all_coins() -> int:
 
                 updated_count += 1
 
-                # Rate limiting between tickers
-                if updated_count % 10 == 0:
-                    time.sleep(0.15)
-
         logger.info(f"Successfully updated {updated_count} coins")
         return updated_count
 
@@ -69,25 +125,236 @@ def fetch_all_coins() -> int:
         raise CryptoDataFetchError(f"Failed to fetch coins: {e}")
 
 
+def fetch_candle_page(coin: Coin, candle_type: str, to: datetime, count: int) -> pd.DataFrame | None:
+    """
+    to(UTC, 미포함) 이전 캔들을 최대 count개 조회 (원본 응답 보관소 경유)
+
+    반환 DataFrame의 인덱스는 캔들 시작 시각(KST)입니다.
+    """
+    day, params = page_archive_key(coin.market_code, candle_type, to, count)
+
+    def fetch_ohlcv():
+        acquire(UPBIT_CANDLES_RATE_LIMIT)
+        return pyupbit.get_ohlcv(
+            ticker=coin.market_code,
+            interval=candle_type,
+            count=count,
+            to=params["to"]
+        )
+
+    return archived_fetch("upbit", "ohlcv", day, params, fetch_ohlcv)
+
+
+def fetch_candle_range(
+    coin: Coin,
+    start_date: date,
+    end_date: date,
+    candle_type: str = "days"
+) -> pd.DataFrame | None:
+    """
+    to 커서로 과거 방향 페이지를 이어 조회하여 기간 전체 캔들 조회
+
+    페이지 계획과 종료 조건은 비동기 클라이언트와 같은 CandleRangePager를 사용하며,
+    페이지를 받는 즉시 다음 페이지 요청을 백그라운드 스레드에 보냅니다.
+    페이지는 메모리에서 병합/중복 제거 후 [start_date, end_date] 구간만 반환합니다.
+
+    Returns:
+        DataFrame: 거래일 오름차순 캔들 (인덱스: 캔들 시작 시각), 데이터가 없으면 None
+
+    Raises:
+        CryptoDataFetchError: 페이지 조회 결과가 None(pyupbit 조회 오류)인 경우
+    """
+    pager = CandleRangePager(coin.market_code, candle_type, start_date, end_date)
+    request = pager.request
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_candle_page, coin, candle_type, *request)
+        while future is not None:
+            request = pager.add(future.result())
+            future = (
+                executor.submit(fetch_candle_page, coin, candle_type, *request)
+                if request is not None else None
+            )
+
+    df = pager.frame()
+    if df is not None:
+        logger.debug(f"Fetched {len(df)} candles for {coin.market_code} in {pager.fetched} pages")
+    return df
+
+
+def build_candle_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """pyupbit.get_ohlcv 형식 DataFrame을 CoinCandle 필드 기준 float DataFrame으로 변환 (인덱스: 거래일)"""
+    return pd.DataFrame({
+        'open_price': pd.to_numeric(df['open'], errors='coerce').to_numpy(dtype=float),
+        'high_price': pd.to_numeric(df['high'], errors='coerce').to_numpy(dtype=float),
+        'low_price': pd.to_numeric(df['low'], errors='coerce').to_numpy(dtype=float),
+        'close_price': pd.to_numeric(df['close'], errors='coerce').to_numpy(dtype=float),
+        'volume': pd.to_numeric(df['volume'], errors='coerce').to_numpy(dtype=float),
+        'candle_acc_trade_volume': (
+            pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=float)
+            if 'value' in df.columns else np.nan
+        ),
+    }, index=pd.Index(pd.to_datetime(df.index).date, name='trade_date'))
+
+
+def invalid_candle_errors(frame: pd.DataFrame) -> pd.Series:
+    """
+    저장할 수 없는 캔들 행의 오류 메시지 (정상 행은 빈 문자열)
+
+    필수 값 누락/무한대, 음수, 고가 < 저가, DecimalField 자릿수 초과를 열 단위로 한 번에 검사합니다.
+    거래대금은 비어 있어도 됩니다 (NULL 저장).
+    """
+    fields = list(CANDLE_COMPARE_DECIMALS)
+    values = frame[fields]
+    limits = pd.Series({
+        field: 10.0 ** (CANDLE_MAX_DIGITS - places) for field, places in CANDLE_COMPARE_DECIMALS.items()
+    })
+
+    missing = frame[CANDLE_REQUIRED_FIELDS].isna().any(axis=1) | np.isinf(values).any(axis=1)
+    negative = (values < 0).any(axis=1)
+    high_below_low = frame['high_price'] < frame['low_price']
+    overflow = (values.round(CANDLE_COMPARE_DECIMALS).abs() >= limits).any(axis=1)
+
+    conditions = [missing, negative, high_below_low, overflow]
+    messages = [INVALID_CANDLE_ERRORS[key] for key in ('missing', 'negative', 'high_below_low', 'overflow')]
+    return pd.Series(np.select(conditions, messages, default=''), index=frame.index)
+
+
+def quantize_candle_frame(frame: pd.DataFrame) -> dict[str, list]:
+    """
+    검증된 캔들 DataFrame을 필드별 DB 소수 자릿수의 Decimal 목록으로 변환
+
+    열 단위로 반올림한 뒤 고정 소수점 문자열로 한 번에 바꾸므로 Decimal 값이
+    DB에 저장되는 값과 같습니다. 비어 있는 값은 None입니다.
+    """
+    values = {}
+    for field, places in CANDLE_COMPARE_DECIMALS.items():
+        column = frame[field].to_numpy(dtype=float).round(places)
+        texts = np.char.mod(f'%.{places}f', column)
+        values[field] = [
+            None if isnull else Decimal(text) for text, isnull in zip(texts, np.isnan(column))
+        ]
+    return values
+
+
+def save_coin_candles(
+    coin: Coin,
+    df: pd.DataFrame | None,
+    candle_type: str = "days",
+    stats: dict | None = None
+) -> int:
+    """
+    조회한 캔들 DataFrame 저장 (pyupbit.get_ohlcv 형식)
+
+    값 검증과 Decimal 변환은 열 단위로 한 번에 처리하고, 저장된 값과 비교하여
+    새로 생기거나 바뀐 캔들만 한 번의 bulk upsert로 저장합니다.
+    검증이나 저장에 실패한 캔들은 FetchFailure로 기록되어 재수집 태스크가 해당 날짜만 다시 조회합니다.
+
+    Args:
+        coin: Coin 모델 인스턴스
+        df: 캔들 DataFrame (인덱스: 캔들 시작 시각)
+        candle_type: 캔들 타입 (days, weeks, months)
+        stats: 전달하면 'written'(저장), 'skipped'(변경 없음), 'failed'(검증/저장 실패) 캔들 수를 누적하고
+            'checksums' 목록에 수신한 원본 체크섬을 추가
+
+    Returns:
+        int: 저장 대상 캔들 수 (변경 없어 건너뛴 캔들 포함)
+    """
+    if df is None or df.empty:
+        logger.warning(f"No candle data received for {coin.market_code}")
+        return 0
+
+    if stats is not None:
+        stats.setdefault('checksums', []).append(frame_checksum(df))
+
+    # 컬럼 단위 검증: 저장할 수 없는 캔들은 실패로 기록하고 제외
+    incoming = build_candle_frame(df)
+    errors = invalid_candle_errors(incoming)
+    invalid = (errors != '').to_numpy()
+    for trade_date, error in errors[invalid].items():
+        logger.error(f"Invalid candle for {coin.market_code} on {trade_date}: {error}")
+        record_failure(
+            CANDLE_FAILURE_SOURCE, candle_type, coin.market_code,
+            trade_date, error, {'start_date': trade_date.isoformat()}
+        )
+    incoming = incoming[~invalid]
+
+    # 저장된 캔들과 비교하여 바뀐 행만 남김
+    stored = pd.DataFrame.from_records(
+        CoinCandle.objects.filter(
+            coin=coin,
+            candle_type=candle_type,
+            trade_date__in=list(incoming.index)
+        ).values_list('trade_date', *CANDLE_COMPARE_DECIMALS),
+        columns=['trade_date', *CANDLE_COMPARE_DECIMALS],
+        index='trade_date'
+    )
+    unchanged = unchanged_row_mask(
+        incoming, stored, list(CANDLE_COMPARE_DECIMALS), CANDLE_COMPARE_DECIMALS
+    ).to_numpy()
+    skipped_count = int(unchanged.sum())
+    incoming = incoming[~unchanged]
+
+    values = quantize_candle_frame(incoming)
+    candles = [
+        CoinCandle(coin=coin, candle_type=candle_type, trade_date=trade_date, **dict(zip(values, row)))
+        for trade_date, row in zip(incoming.index, zip(*values.values()))
+    ]
+
+    failed_dates = []
+
+    def on_error(candle, error):
+        failed_dates.append(candle.trade_date)
+        record_failure(
+            CANDLE_FAILURE_SOURCE, candle_type, coin.market_code,
+            candle.trade_date, error, {'start_date': candle.trade_date.isoformat()}
+        )
+
+    saved_count = bulk_upsert(
+        CoinCandle,
+        candles,
+        unique_fields=['coin', 'candle_type', 'trade_date'],
+        update_fields=CANDLE_UPDATE_FIELDS,
+        batch_size=CANDLE_BATCH_SIZE,
+        describe=lambda candle: f"candle for {coin.market_code} on {candle.trade_date}",
+        on_error=on_error
+    )
+
+    logger.info(
+        f"Successfully saved {saved_count} candles "
+        f"for {coin.market_code} ({skipped_count} unchanged)"
+    )
+    if stats is not None:
+        stats['written'] = stats.get('written', 0) + saved_count
+        stats['skipped'] = stats.get('skipped', 0) + skipped_count
+        stats['failed'] = stats.get('failed', 0) + len(failed_dates) + int(invalid.sum())
+    return saved_count + skipped_count
+
+
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
 def fetch_coin_candles(
     coin: Coin,
     start_date: date,
     end_date: date,
-    candle_type: str = "days"
+    candle_type: str = "days",
+    stats: dict | None = None
 ) -> int:
     """
     특정 코인의 캔들 데이터 수집
 
+    Upbit의 1회 200개 제한을 넘는 기간은 to 커서로 페이지를 이어 조회하여 모두 수집하고,
+    save_coin_candles로 새로 생기거나 바뀐 캔들만 저장합니다.
+
     Args:
         coin: Coin 모델 인스턴스
         start_date: 수집 시작일
         end_date: 수집 종료일
-        candle_type: 캔들 타입 (days, minutes, weeks, months)
+        candle_type: 캔들 타입 (days, weeks, months)
+        stats: save_coin_candles 참고
 
     Returns:
-        int: 저장된 캔들 수
+        int: 수집된 캔들 수 (변경 없어 건너뛴 캔들 포함)
     """
     try:
         logger.info(
@@ -95,148 +362,595 @@ def fetch_coin_candles(
             f"from {start_date} to {end_date} ({candle_type})"
         )
 
-        # pyupbit는 최대 200개까지만 조회 가능
-        # count 계산
-        days_diff = (end_date - start_date).days + 1
-        if days_diff > 200:
-            logger.warning(
-                f"Requested {days_diff} days but pyupbit supports max 200. "
-                f"Will fetch only 200 days."
-            )
+        df = fetch_candle_range(coin, start_date, end_date, candle_type)
 
-        count = min(days_diff, 200)
+        return save_coin_candles(coin, df, candle_type, stats)
 
-        # OHLCV 데이터 조회
-        df = pyupbit.get_ohlcv(
-            ticker=coin.market_code,
-            interval=candle_type,
-            count=count,
-            to=end_date.strftime('%Y%m%d')  # pyupbit expects YYYYMMDD format
+    except Exception as e:
+        logger.error(
+            f"Error fetching candles for {coin.market_code}: {e}",
+            exc_info=True
+        )
+        raise CryptoDataFetchError(
+            f"Failed to fetch candles for {coin.market_code}: {e}"
         )
-        time.sleep(0.15)  # Rate limiting
 
-        if df is None or df.empty:
-            logger.warning(f"No candle data received for {coin.market_code}")
-            return 0
 
-        saved_count = 0
+def candle_periods(candle_type: str, start_date: date, end_date: date) -> list[date]:
+    """start_date~end_date 사이 캔들 거래일 목록 (캔들 타입 주기 기준)"""
+    if start_date > end_date:
+        return []
+    return list(pd.date_range(start_date, end_date, freq=CANDLE_PERIOD_FREQ[candle_type]).date)
+
+
+def coalesce_ranges(ranges: list[tuple[date, date]], candle_type: str) -> list[tuple[date, date]]:
+    """합쳐도 한 페이지(200개) 안에 드는 가까운 조회 기간을 합쳐 요청 수를 줄임"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and len(candle_periods(candle_type, merged[-1][0], end)) <= UPBIT_MAX_CANDLES_PER_REQUEST:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_candle_ranges(coin_id: int, candle_type: str, expected: list[date]) -> list[tuple[date, date]]:
+    """기대 거래일 중 저장되지 않은 연속 구간 목록"""
+    stored = set(
+        CoinCandle.objects.filter(
+            coin_id=coin_id,
+            candle_type=candle_type,
+            trade_date__range=(expected[0], expected[-1])
+        ).values_list('trade_date', flat=True)
+    )
+
+    ranges = []
+    run_start = previous = None
+    for period in expected:
+        if period in stored:
+            if run_start is not None:
+                ranges.append((run_start, previous))
+                run_start = None
+            continue
+        if run_start is None:
+            run_start = period
+        previous = period
+    if run_start is not None:
+        ranges.append((run_start, previous))
+    return ranges
+
+
+def plan_candle_ranges(
+    coins,
+    candle_type: str,
+    start_date: date,
+    end_date: date
+) -> dict[str, list[tuple[date, date]]]:
+    """
+    코인별 증분 조회 기간 계획
+
+    코인별 저장 현황(마지막/첫 거래일, 기간 내 캔들 수)을 한 번의 그룹 쿼리로 조회하여
+    - 저장된 캔들이 없으면 [start_date, end_date] 전체
+    - 있으면 마지막 저장 캔들(CANDLE_REVISION_OVERLAP개)부터 end_date까지
+    - 첫 저장 캔들이 start_date보다 늦으면 그 앞 구간 (기간을 늘렸거나 앞부분 이력이 없는 경우)
+    - 기간 내 캔들 수가 기대보다 적은 코인은 거래일을 읽어 빠진 구간 추가
+    를 요청하고, 가까운 구간은 한 페이지 안에서 합칩니다.
 
-        with transaction.atomic():
-            for index, row in df.iterrows():
-                try:
-                    # 안전한 날짜 변환
-                    if hasattr(index, 'date'):
-                        trade_date = index.date()
-                    else:
-                        trade_date = pd.to_datetime(index).date()
-
-                    # 캔들 데이터 저장
-                    candle, created = CoinCandle.objects.update_or_create(
-                        coin=coin,
-                        candle_type=candle_type,
-                        trade_date=trade_date,
-                        defaults={
-                            'open_price': Decimal(str(row['open'])),
-                            'high_price': Decimal(str(row['high'])),
-                            'low_price': Decimal(str(row['low'])),
-                            'close_price': Decimal(str(row['close'])),
-                            'volume': Decimal(str(row['volume'])),
-                            'candle_acc_trade_volume': Decimal(str(row.get('value', 0)))
-                                if 'value' in row else None
-                        }
-                    )
+    Returns:
+        dict: 마켓 코드 -> [(시작일, 종료일), ...]
+    """
+    check_candle_type(candle_type)
+    markets = {coin.id: coin.market_code for coin in coins}
+    summaries = {
+        row['coin_id']: row
+        for row in CoinCandle.objects.filter(
+            coin_id__in=list(markets),
+            candle_type=candle_type
+        ).values('coin_id').annotate(
+            first=Min('trade_date'),
+            latest=Max('trade_date'),
+            in_window=Count('id', filter=Q(trade_date__gte=start_date, trade_date__lte=end_date)),
+        )
+    }
 
-                    if created:
-                        logger.debug(f"Created candle: {coin.market_code} - {trade_date}")
-                    else:
-                        logger.debug(f"Updated candle: {coin.market_code} - {trade_date}")
+    freq = pd.tseries.frequencies.to_offset(CANDLE_PERIOD_FREQ[candle_type])
+    plan = {}
+    for coin_id, market in markets.items():
+        summary = summaries.get(coin_id)
+        if summary is None:
+            plan[market] = [(start_date, end_date)]
+            continue
 
-                    saved_count += 1
+        latest = min(summary['latest'], end_date)
+        revision_start = (pd.Timestamp(latest) - freq * (CANDLE_REVISION_OVERLAP - 1)).date()
+        ranges = [(max(start_date, revision_start), end_date)]
 
-                except Exception as e:
-                    logger.error(
-                        f"Error saving candle for {coin.market_code} "
-                        f"on {trade_date}: {e}"
-                    )
-                    continue
+        head = candle_periods(candle_type, start_date, summary['first'] - timedelta(days=1))
+        if head:
+            ranges.append((start_date, head[-1]))
 
-        logger.info(
-            f"Successfully saved {saved_count} candles "
-            f"for {coin.market_code}"
-        )
-        return saved_count
+        expected = candle_periods(candle_type, max(start_date, summary['first']), latest)
+        if summary['in_window'] < len(expected):
+            gaps = missing_candle_ranges(coin_id, candle_type, expected)
+            logger.info(f"Found {len(gaps)} candle gaps for {market} ({candle_type})")
+            ranges.extend(gaps)
 
-    except Exception as e:
-        logger.error(
-            f"Error fetching candles for {coin.market_code}: {e}",
-            exc_info=True
-        )
-        raise CryptoDataFetchError(
-            f"Failed to fetch candles for {coin.market_code}: {e}"
+        plan[market] = coalesce_ranges(ranges, candle_type)
+
+    return plan
+
+
+def merge_candle_stats(total: dict, part: dict):
+    """save_coin_candles 통계 누적"""
+    for key in ('written', 'skipped', 'failed'):
+        if key in part:
+            total[key] = total.get(key, 0) + part[key]
+    if part.get('checksums'):
+        total.setdefault('checksums', []).extend(part['checksums'])
+
+
+def collect_coin_candles(
+    coins,
+    start_date: date,
+    end_date: date,
+    candle_type: str = "days",
+    stats: dict | None = None,
+    ranges: dict[str, list[tuple[date, date]]] | None = None,
+    market_stats: dict[str, dict] | None = None
+) -> dict:
+    """
+    여러 코인의 기간 캔들을 동시에 조회하여 저장
+
+    조회는 비동기 클라이언트(iter_candle_range_frames)가 연결을 재사용하며 여러 코인을 동시에 진행하고,
+    받은 프레임은 이 스레드의 저장 단계(save_coin_candles)에서 도착 순서대로 저장합니다.
+
+    Args:
+        coins: Coin 목록 (QuerySet 가능)
+        stats: save_coin_candles 참고
+        ranges: 마켓 코드별 조회 기간 (plan_candle_ranges 결과, 없으면 모든 코인 [start_date, end_date])
+        market_stats: 전달하면 마켓 코드별 save_coin_candles 통계를 따로 채움
+
+    Returns:
+        dict: 마켓 코드 -> 저장 대상 캔들 수, 조회/저장에 실패한 코인은 예외
+    """
+    coins_by_market = {coin.market_code: coin for coin in coins}
+    results = {}
+    if not coins_by_market:
+        return results
+
+    if ranges is None:
+        frames = iter_candle_frames(list(coins_by_market), start_date, end_date, candle_type)
+    else:
+        frames = iter_candle_range_frames(
+            {market: r for market, r in ranges.items() if market in coins_by_market}, candle_type
         )
+    for market, frame in frames:
+        if isinstance(frame, Exception):
+            results[market] = CryptoDataFetchError(f"Failed to fetch candles for {market}: {frame}")
+            continue
+        try:
+            coin_stats = {} if market_stats is None else market_stats.setdefault(market, {})
+            results[market] = save_coin_candles(coins_by_market[market], frame, candle_type, coin_stats)
+            if stats is not None:
+                merge_candle_stats(stats, coin_stats)
+        except Exception as e:
+            logger.error(f"Failed to save candles for {market}: {e}", exc_info=True)
+            results[market] = CryptoDataFetchError(f"Failed to save candles for {market}: {e}")
+
+    return results
+
+
+def candle_period_starts(candle_type: str, dates) -> pd.DatetimeIndex:
+    """
+    거래일이 속한 캔들 주기의 시작일 (Upbit 기준: 주봉 월요일, 월봉 1일)
 
+    일봉 거래일은 KST 09:00(UTC 00:00)에 시작하는 캔들의 날짜이므로
+    주/월 경계도 같은 KST 09:00 기준으로 거래일 날짜만 보고 나눕니다.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(dates)).normalize()
+    if candle_type == 'weeks':
+        return dates - pd.to_timedelta(dates.weekday, unit='D')
+    if candle_type == 'months':
+        return dates.to_period('M').to_timestamp()
+    return dates
 
-@log_execution_time
-def bulk_collect_candles(config) -> dict:
+
+def candle_period_start(candle_type: str, day: date) -> date:
+    """거래일이 속한 캔들 주기의 시작일"""
+    return candle_period_starts(candle_type, [day])[0].date()
+
+
+def rollup_daily_candles(daily: pd.DataFrame, candle_type: str) -> pd.DataFrame:
     """
-    CoinCollectionConfig 기반 일괄 캔들 수집
+    일봉 DataFrame을 주봉/월봉으로 집계 (pyupbit.get_ohlcv 형식)
+
+    시가는 주기 첫 캔들, 종가는 마지막 캔들, 고가/저가는 최대/최소, 거래량/거래대금은 합계입니다.
+    거래대금이 빠진 일봉이 있는 주기는 거래대금을 비워 둡니다.
 
     Args:
-        config: CoinCollectionConfig 인스턴스
+        daily: 거래일 오름차순 일봉 (open, high, low, close, volume, value)
+        candle_type: weeks 또는 months
 
     Returns:
-        dict: 수집 결과 {'success_count': int, 'fail_count': int, 'total': int}
+        DataFrame: 인덱스는 주기 시작 캔들 시각 (KST 09:00)
     """
-    try:
-        logger.info(f"Starting bulk collection for config: {config.name}")
+    if daily.empty:
+        return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume', 'value'])
+
+    keys = candle_period_starts(candle_type, daily.index)
+    grouped = daily.groupby(keys, sort=True)
+    candles = grouped.agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+        'volume': 'sum', 'value': 'sum',
+    })
+    missing_value = daily['value'].isna().groupby(keys, sort=True).any()
+    candles.loc[missing_value.to_numpy(), 'value'] = np.nan
+    candles.index = candles.index + KST_OFFSET
+    return candles
+
+
+def load_daily_candles(
+    coin_ids: list[int],
+    start_date: date,
+    end_date: date
+) -> dict[int, pd.DataFrame]:
+    """
+    저장된 일봉을 코인별 DataFrame으로 조회 (한 번의 쿼리)
+
+    Returns:
+        dict: 코인 ID -> 거래일 오름차순 일봉 (open, high, low, close, volume, value)
+    """
+    rows = CoinCandle.objects.filter(
+        coin_id__in=coin_ids,
+        candle_type='days',
+        trade_date__range=(start_date, end_date)
+    ).order_by('coin_id', 'trade_date').values_list(
+        'coin_id', 'trade_date', *CANDLE_COMPARE_DECIMALS
+    )
+    columns = ['coin_id', 'trade_date', 'open', 'high', 'low', 'close', 'volume', 'value']
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    if frame.empty:
+        return {}
+
+    frame[columns[2:]] = frame[columns[2:]].astype(float)
+    frame = frame.set_index(pd.DatetimeIndex(pd.to_datetime(frame.pop('trade_date'))).rename(None))
+    return {
+        coin_id: group.drop(columns='coin_id')
+        for coin_id, group in frame.groupby('coin_id', sort=False)
+    }
+
+
+def derive_coin_candles(
+    coins,
+    candle_type: str,
+    start_date: date,
+    end_date: date,
+    stats: dict | None = None,
+    starts: dict[str, date] | None = None,
+    market_stats: dict[str, dict] | None = None
+) -> dict:
+    """
+    저장된 일봉으로 주봉/월봉을 만들어 저장 (Upbit 호출 없음)
 
-        coins = config.coins.filter(is_active=True)
+    start_date가 속한 주기의 첫 거래일부터 일봉을 읽어 집계하므로 첫 주기도 완전한 값이 되고,
+    end_date가 속한 진행 중인 주기는 그때까지의 일봉으로 만듭니다 (다음 실행에서 갱신).
+    저장은 save_coin_candles를 사용하므로 바뀐 캔들만 쓰고 실패한 캔들은 FetchFailure로 기록됩니다.
 
-        if not coins.exists():
-            logger.warning(f"No active coins in config: {config.name}")
-            return {'success_count': 0, 'fail_count': 0, 'total': 0}
+    Args:
+        coins: Coin 목록 (QuerySet 가능)
+        candle_type: weeks 또는 months
+        stats: save_coin_candles 참고
+        starts: 마켓 코드별 생성 시작일 (없으면 모든 코인 start_date)
+        market_stats: 전달하면 마켓 코드별 save_coin_candles 통계를 따로 채움
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=config.period_days - 1)
+    Returns:
+        dict: 마켓 코드 -> 저장 대상 캔들 수, 실패한 코인은 예외
+    """
+    if candle_type not in DERIVED_CANDLE_TYPES:
+        raise ValueError(f"Cannot derive {candle_type} candles from daily candles")
+
+    coins = list(coins)
+    starts = starts or {}
+    starts = {
+        coin.market_code: candle_period_start(candle_type, starts.get(coin.market_code, start_date))
+        for coin in coins
+    }
+    results = {}
+    if not coins:
+        return results
+
+    daily = load_daily_candles([coin.id for coin in coins], min(starts.values()), end_date)
+    for coin in coins:
+        market = coin.market_code
+        try:
+            frame = daily.get(coin.id)
+            if frame is not None:
+                frame = frame[frame.index >= pd.Timestamp(starts[market])]
+                frame = rollup_daily_candles(frame, candle_type)
+            coin_stats = {} if market_stats is None else market_stats.setdefault(market, {})
+            results[market] = save_coin_candles(coin, frame, candle_type, coin_stats)
+            if stats is not None:
+                merge_candle_stats(stats, coin_stats)
+        except Exception as e:
+            logger.error(f"Failed to derive {candle_type} candles for {market}: {e}", exc_info=True)
+            results[market] = CryptoDataFetchError(
+                f"Failed to derive {candle_type} candles for {market}: {e}"
+            )
 
-        success_count = 0
-        fail_count = 0
+    logger.info(f"Derived {candle_type} candles for {len(coins)} coins from daily candles")
+    return results
 
-        for coin in coins:
-            try:
-                count = fetch_coin_candles(
-                    coin=coin,
-                    start_date=start_date,
-                    end_date=end_date,
-                    candle_type=config.candle_type
-                )
 
-                if count > 0:
-                    success_count += 1
-                else:
-                    fail_count += 1
+def collect_derived_candles(
+    coins,
+    candle_type: str,
+    start_date: date,
+    end_date: date,
+    stats: dict | None = None
+) -> dict:
+    """
+    주기 전체 일봉을 수집한 뒤 주봉/월봉 생성 (재수집/실패 재시도용)
+
+    Returns:
+        dict: 마켓 코드 -> 저장 대상 캔들 수, 일봉 수집 또는 생성에 실패한 코인은 예외
+    """
+    coins = list(coins)
+    daily_start = candle_period_start(candle_type, start_date)
+    daily = collect_coin_candles(coins, daily_start, end_date, 'days')
+    failed = {market: result for market, result in daily.items() if isinstance(result, Exception)}
+
+    results = derive_coin_candles(
+        [coin for coin in coins if coin.market_code not in failed],
+        candle_type, start_date, end_date, stats
+    )
+    results.update(failed)
+    return results
+
+
+def reconcile_derived_candles(
+    coins,
+    candle_type: str,
+    end_date: date,
+    sample_size: int = CANDLE_RECONCILE_SAMPLE_SIZE,
+    periods: int = CANDLE_RECONCILE_PERIODS
+) -> dict:
+    """
+    생성한 주봉/월봉을 표본 코인의 Upbit 캔들과 대조
 
-                # Rate limiting between coins
-                time.sleep(0.15)
+    표본 코인마다 end_date 이전의 완료된 최근 periods개 주기를 Upbit에서 한 페이지로 받아
+    저장된 캔들과 비교합니다. 가격은 DB 소수 자릿수 기준으로 같아야 하고, 거래량/거래대금은
+    CANDLE_RECONCILE_RTOL 이내면 같은 값으로 봅니다. 차이는 경고 로그로 남깁니다.
 
-            except Exception as e:
-                logger.error(f"Failed to collect candles for {coin.market_code}: {e}")
-                fail_count += 1
+    Returns:
+        dict: {'sampled': [마켓 코드], 'compared': 비교한 캔들 수,
+               'mismatches': [{'market', 'trade_date', 'fields'}]}
+    """
+    report = {'sampled': [], 'compared': 0, 'mismatches': []}
+    coins = list(coins)
+    if not coins or sample_size <= 0:
+        return report
+
+    sample = random.sample(coins, min(sample_size, len(coins)))
+    report['sampled'] = [coin.market_code for coin in sample]
+    freq = pd.tseries.frequencies.to_offset(CANDLE_PERIOD_FREQ[candle_type])
+    current = pd.Timestamp(candle_period_start(candle_type, end_date))
+    start_date = (current - freq * periods).date()
+    last_date = (current - pd.Timedelta(days=1)).date()
+
+    stored = {}
+    for coin_id, trade_date, *values in CoinCandle.objects.filter(
+        coin__in=sample,
+        candle_type=candle_type,
+        trade_date__range=(start_date, last_date)
+    ).values_list('coin_id', 'trade_date', *CANDLE_COMPARE_DECIMALS):
+        stored.setdefault(coin_id, []).append((trade_date, *values))
+
+    coins_by_market = {coin.market_code: coin for coin in sample}
+    try:
+        frames = iter_candle_frames(list(coins_by_market), start_date, last_date, candle_type)
+        for market, frame in frames:
+            if isinstance(frame, Exception) or frame is None or frame.empty:
+                logger.warning(
+                    f"Skipped reconciling {candle_type} candles for {market}: no upstream data"
+                )
                 continue
 
-        total = success_count + fail_count
+            upstream = build_candle_frame(frame)
+            local = pd.DataFrame.from_records(
+                stored.get(coins_by_market[market].id, []),
+                columns=['trade_date', *CANDLE_COMPARE_DECIMALS],
+                index='trade_date'
+            ).reindex(upstream.index).astype(float)
+            report['compared'] += len(upstream)
+
+            prices = ['open_price', 'high_price', 'low_price', 'close_price']
+            same = upstream[prices].round(8).eq(local[prices].round(8))
+            for field in ('volume', 'candle_acc_trade_volume'):
+                same[field] = np.isclose(
+                    upstream[field], local[field], rtol=CANDLE_RECONCILE_RTOL, equal_nan=True
+                )
+            for trade_date, row in same[~same.all(axis=1)].iterrows():
+                fields = list(row.index[~row.to_numpy(dtype=bool)])
+                report['mismatches'].append(
+                    {'market': market, 'trade_date': trade_date, 'fields': fields}
+                )
+                logger.warning(
+                    f"Derived {candle_type} candle for {market} on {trade_date} "
+                    f"differs from Upbit: {', '.join(fields)}"
+                )
+    except Exception as e:
+        logger.warning(f"Failed to reconcile {candle_type} candles: {e}")
 
-        logger.info(
-            f"Bulk collection completed for {config.name}: "
-            f"{success_count} success, {fail_count} failed, {total} total"
-        )
+    logger.info(
+        f"Reconciled {report['compared']} {candle_type} candles for {len(sample)} sampled coins: "
+        f"{len(report['mismatches'])} mismatches"
+    )
+    return report
+
+
+@log_execution_time
+def collect_candles_for_configs(configs) -> dict:
+    """
+    여러 수집 설정을 (코인, 캔들 타입) 단위의 중복 없는 계획으로 합쳐 한 번만 수집
+
+    같은 캔들 타입 설정들에 함께 들어 있는 코인은 가장 긴 period_days 기간으로 한 번만
+    계획(plan_candle_ranges)/조회/저장하고, 설정별 결과는 공유된 코인 결과로 계산합니다.
+    주봉/월봉 설정은 Upbit에서 받지 않고 필요한 기간의 일봉을 함께 수집한 뒤 일봉으로 만들며
+    (derive_coin_candles), 일부 표본 코인만 Upbit 주봉/월봉과 대조합니다 (reconcile_derived_candles).
+    조회에 실패한 코인은 (코인, 캔들 타입)마다 한 번만 FetchFailure로 기록합니다.
+    Upbit에서 받을 수 없는 캔들 타입(예: 분봉) 설정은 오류 로그를 남기고 모든 코인을 실패로 셉니다.
+
+    Args:
+        configs: CoinCollectionConfig 목록 (QuerySet 가능)
+
+    Returns:
+        dict: 설정 ID -> {'success_count': int, 'fail_count': int, 'total': int,
+                          'written_rows': int, 'skipped_rows': int, 'checksum': str}
+    """
+    end_date = date.today()
+    configs = list(configs)
+    members = {config.id: list(config.coins.filter(is_active=True)) for config in configs}
+
+    # 캔들 타입 -> 마켓 코드 -> 가장 이른 수집 시작일
+    windows: dict[str, dict[str, date]] = {}
+    coins: dict[str, Coin] = {}
+    for config in configs:
+        if config.candle_type not in CANDLE_PERIOD_FREQ:
+            # 수집할 수 없는 캔들 타입(예: 분봉) 설정만 건너뛰고 나머지 설정은 계속 수집
+            logger.error(
+                f"Skipping config {config.name}: unsupported candle type {config.candle_type}"
+            )
+            continue
+        start_date = end_date - timedelta(days=config.period_days - 1)
+        for coin in members[config.id]:
+            window = windows.setdefault(config.candle_type, {})
+            coins[coin.market_code] = coin
+            window[coin.market_code] = min(window.get(coin.market_code, start_date), start_date)
+
+    # 주봉/월봉은 일봉에서 만들므로 첫 주기의 첫 거래일부터 일봉을 수집
+    for candle_type in DERIVED_CANDLE_TYPES:
+        for market, start_date in windows.get(candle_type, {}).items():
+            daily_window = windows.setdefault('days', {})
+            period_start = candle_period_start(candle_type, start_date)
+            daily_window[market] = min(daily_window.get(market, period_start), period_start)
+
+    # (캔들 타입, 마켓 코드) -> (저장 대상 캔들 수 또는 예외, 코인 통계)
+    outcomes: dict[tuple[str, str], tuple] = {}
+    daily_ranges: dict[str, list[tuple[date, date]]] = {}
+    # 일봉을 먼저 수집한 뒤 주봉/월봉 생성
+    for candle_type in sorted(windows, key=lambda t: t in DERIVED_CANDLE_TYPES):
+        window = windows[candle_type]
+        ranges = {}
+        for start_date in sorted(set(window.values())):
+            group = [coins[market] for market, start in window.items() if start == start_date]
+            ranges.update(plan_candle_ranges(group, candle_type, start_date, end_date))
+
+        market_stats = {}
+        if candle_type in DERIVED_CANDLE_TYPES:
+            results = {}
+            derivable = []
+            for market in window:
+                daily_result = outcomes.get(('days', market), (0, {}))[0]
+                if isinstance(daily_result, Exception):
+                    results[market] = CryptoDataFetchError(
+                        f"Daily candles unavailable for {market}: {daily_result}"
+                    )
+                else:
+                    derivable.append(coins[market])
+            # 빠진 주기와 이번에 수집한 일봉이 속한 주기부터 다시 생성 (설정 기간 안에서)
+            starts = {}
+            for coin in derivable:
+                market = coin.market_code
+                planned = ranges[market] + daily_ranges.get(market, [])
+                starts[market] = max(window[market], min(start for start, _ in planned))
+            results.update(derive_coin_candles(
+                derivable, candle_type, min(window.values()), end_date,
+                starts=starts, market_stats=market_stats
+            ))
+            derived = [
+                coin for coin in derivable if not isinstance(results[coin.market_code], Exception)
+            ]
+            reconcile_derived_candles(derived, candle_type, end_date)
+        else:
+            results = collect_coin_candles(
+                [coins[market] for market in window], min(window.values()), end_date,
+                candle_type, ranges=ranges, market_stats=market_stats
+            )
+            if candle_type == 'days':
+                daily_ranges = ranges
+
+        for market, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"Failed to collect candles for {market}: {result}")
+                # 이 코인만 재수집하도록 기록 (전체 재실행 방지)
+                record_failure(
+                    CANDLE_FAILURE_SOURCE, candle_type, market,
+                    end_date, result, {'start_date': window[market].isoformat()}
+                )
+            outcomes[(candle_type, market)] = (result, market_stats.get(market, {}))
+
+    logger.info(
+        f"Collected {len(outcomes)} (coin, candle type) pairs "
+        f"for {len(configs)} configs"
+    )
 
-        return {
+    summaries = {}
+    for config in configs:
+        success_count = 0
+        fail_count = 0
+        stats = {'written': 0, 'skipped': 0, 'checksums': []}
+
+        for coin in members[config.id]:
+            result, coin_stats = outcomes.get((config.candle_type, coin.market_code), (0, {}))
+            if not isinstance(result, Exception) and result > 0:
+                success_count += 1
+                merge_candle_stats(stats, coin_stats)
+            else:
+                fail_count += 1
+
+        summaries[config.id] = {
             'success_count': success_count,
             'fail_count': fail_count,
-            'total': total
+            'total': success_count + fail_count,
+            'written_rows': stats['written'],
+            'skipped_rows': stats['skipped'],
+            'checksum': combine_checksums(stats['checksums']) if stats['checksums'] else ''
         }
 
+    return summaries
+
+
+@log_execution_time
+def bulk_collect_candles(config) -> dict:
+    """
+    CoinCollectionConfig 기반 일괄 캔들 수집
+
+    최근 period_days 기간 중 이미 저장된 캔들은 다시 받지 않고, 코인별 마지막 저장 캔들부터
+    오늘까지와 기간 안의 빠진 구간만 조회합니다 (collect_candles_for_configs).
+
+    Args:
+        config: CoinCollectionConfig 인스턴스
+
+    Returns:
+        dict: 수집 결과 {'success_count': int, 'fail_count': int, 'total': int,
+                         'written_rows': int, 'skipped_rows': int, 'checksum': str}
+    """
+    try:
+        logger.info(f"Starting bulk collection for config: {config.name}")
+
+        result = collect_candles_for_configs([config])[config.id]
+
+        if not result['total']:
+            logger.warning(f"No active coins in config: {config.name}")
+        else:
+            logger.info(
+                f"Bulk collection completed for {config.name}: "
+                f"{result['success_count']} success, {result['fail_count']} failed, "
+                f"{result['total']} total, {result['written_rows']} rows written, "
+                f"{result['skipped_rows']} unchanged"
+            )
+        return result
+
     except Exception as e:
         logger.error(f"Error in bulk collection for {config.name}: {e}", exc_info=True)
         raise CryptoDataFetchError(f"Failed bulk collection: {e}")
@@ -7,12 +7,28 @@ import logging
 from datetime import date
 from celery import shared_task
 
-from .services import fetch_all_coins, bulk_collect_candles, fetch_coin_candles
+from .services import (
+    CANDLE_FAILURE_SOURCE,
+    DERIVED_CANDLE_TYPES,
+    collect_candles_for_configs,
+    collect_coin_candles,
+    collect_derived_candles,
+    fetch_all_coins,
+    fetch_coin_candles,
+)
 from .models import CoinCollectionConfig, Coin
 from apps.common.exceptions import CryptoDataFetchError
+from apps.common.failures import due_failures, mark_retry_failed, resolve_failures
+from apps.common.ingestion import previous_run, skipped_run_result, start_ingestion, track_ingestion
+from apps.common.utils import combine_checksums
 
 logger = logging.getLogger(__name__)
 
+# 재수집 태스크 한 번에 처리할 최대 실패 기록 수
+FAILURE_RETRY_BATCH_SIZE = 200
+# 실행 기록(IngestionRun) 파이프라인 구분
+CANDLES_PIPELINE = "crypto_candles"
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def sync_coin_master_task(self):
@@ -42,56 +58,82 @@ def sync_coin_master_task(self):
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def collect_crypto_candles_task(self):
+def collect_crypto_candles_task(self, force: bool = False):
     """
     활성화된 모든 수집 설정에 따라 암호화폐 캔들 데이터 수집
 
     CoinCollectionConfig에서 is_active=True인 모든 설정을 조회하여
-    각 설정에 정의된 코인들의 캔들 데이터를 수집합니다.
+    각 설정에 정의된 코인들의 캔들 데이터를 수집합니다. 여러 설정에 들어 있는 코인은
+    (코인, 캔들 타입)마다 가장 긴 기간으로 한 번만 수집하고, 설정별 통계는 공유 결과로 계산합니다.
+    실행 결과는 IngestionRun(crypto_candles, upbit, 오늘)으로 기록되며,
+    같은 날 이미 성공한 수집이 있으면 다시 수집하지 않습니다.
+
+    Args:
+        force: 오늘 성공한 실행 기록이 있어도 다시 수집
 
     Returns:
-        dict: 수집 결과 통계
+        dict: 수집 결과 통계 (저장/변경 없어 건너뛴 캔들 수 포함)
 
     Raises:
         Retry: CryptoDataFetchError 발생 시 재시도
     """
     try:
+        target_date = date.today()
+        if not force and (previous := previous_run(CANDLES_PIPELINE, CANDLE_FAILURE_SOURCE, target_date)):
+            return skipped_run_result(previous)
+
         logger.info("[Task] Starting crypto candles collection")
 
-        active_configs = CoinCollectionConfig.objects.filter(is_active=True)
+        active_configs = list(CoinCollectionConfig.objects.filter(is_active=True))
 
-        if not active_configs.exists():
+        if not active_configs:
             logger.warning("[Task] No active collection configs found")
             return {"success": True, "configs_count": 0, "total_coins": 0}
 
         total_success = 0
         total_fail = 0
+        written_rows = 0
+        skipped_rows = 0
         configs_count = 0
+        checksums = []
 
-        for config in active_configs:
-            try:
-                result = bulk_collect_candles(config)
+        run = start_ingestion(CANDLES_PIPELINE, CANDLE_FAILURE_SOURCE, target_date)
+        with track_ingestion(run):
+            # 설정 간 중복 코인은 (코인, 캔들 타입)마다 한 번만 수집
+            results = collect_candles_for_configs(active_configs)
+
+            for config in active_configs:
+                result = results[config.id]
                 total_success += result['success_count']
                 total_fail += result['fail_count']
+                written_rows += result.get('written_rows', 0)
+                skipped_rows += result.get('skipped_rows', 0)
+                if result.get('checksum'):
+                    checksums.append(result['checksum'])
                 configs_count += 1
                 logger.info(
                     f"[Task] Config '{config.name}': "
                     f"{result['success_count']} success, {result['fail_count']} failed"
                 )
-            except Exception as e:
-                logger.error(f"[Task] Failed to process config '{config.name}': {e}")
-                continue
+
+            run.rows_fetched = written_rows + skipped_rows
+            run.rows_written = written_rows
+            run.rows_skipped = skipped_rows
+            run.checksum = combine_checksums(checksums) if checksums else ''
 
         logger.info(
             f"[Task] Completed crypto candles collection: "
-            f"{configs_count} configs, {total_success} success, {total_fail} failed"
+            f"{configs_count} configs, {total_success} success, {total_fail} failed, "
+            f"{written_rows} rows written, {skipped_rows} unchanged"
         )
 
         return {
             "success": True,
             "configs_count": configs_count,
             "total_success": total_success,
-            "total_fail": total_fail
+            "total_fail": total_fail,
+            "written_rows": written_rows,
+            "skipped_rows": skipped_rows
         }
 
     except CryptoDataFetchError as exc:
@@ -108,6 +150,8 @@ def recollect_candles_task(self, config_id: int, start_date_str: str, end_date_s
     특정 설정에 대한 캔들 데이터 재수집 태스크
 
     Django Admin의 재수집 액션에서 호출되며, 특정 기간의 캔들 데이터를 재수집합니다.
+    설정의 코인들은 비동기 클라이언트로 동시에 조회하고 200개 단위 페이지를 이어 받으므로
+    여러 해 기간도 태스크 한 번으로 처리합니다.
 
     Args:
         config_id: CoinCollectionConfig ID
@@ -134,27 +178,27 @@ def recollect_candles_task(self, config_id: int, start_date_str: str, end_date_s
         coins = config.coins.filter(is_active=True)
         success_count = 0
         fail_count = 0
-
-        for coin in coins:
-            try:
-                count = fetch_coin_candles(
-                    coin=coin,
-                    start_date=start_date,
-                    end_date=end_date,
-                    candle_type=config.candle_type
-                )
-
-                if count > 0:
-                    success_count += 1
-                    logger.info(f"[Task] Recollected {count} candles for {coin.market_code}")
-                else:
-                    fail_count += 1
-                    logger.warning(f"[Task] No candles collected for {coin.market_code}")
-
-            except Exception as e:
-                logger.error(f"[Task] Failed to recollect for {coin.market_code}: {e}")
+        stats = {'written': 0, 'skipped': 0}
+
+        if config.candle_type in DERIVED_CANDLE_TYPES:
+            # 주봉/월봉은 일봉을 재수집한 뒤 일봉으로 다시 생성
+            results = collect_derived_candles(
+                coins, config.candle_type, start_date, end_date, stats
+            )
+        else:
+            # 코인들을 동시에 조회하고 받은 순서대로 저장
+            results = collect_coin_candles(coins, start_date, end_date, config.candle_type, stats)
+
+        for market, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"[Task] Failed to recollect for {market}: {result}")
                 fail_count += 1
-                continue
+            elif result > 0:
+                success_count += 1
+                logger.info(f"[Task] Recollected {result} candles for {market}")
+            else:
+                fail_count += 1
+                logger.warning(f"[Task] No candles collected for {market}")
 
         logger.info(
             f"[Task] Completed recollection for '{config.name}': "
@@ -166,6 +210,8 @@ def recollect_candles_task(self, config_id: int, start_date_str: str, end_date_s
             "config_name": config.name,
             "success_count": success_count,
             "fail_count": fail_count,
+            "written_rows": stats['written'],
+            "skipped_rows": stats['skipped'],
             "start_date": start_date_str,
             "end_date": end_date_str
         }
@@ -179,3 +225,88 @@ def recollect_candles_task(self, config_id: int, start_date_str: str, end_date_s
     except Exception as exc:
         logger.error(f"[Task] Unexpected error in recollection: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def retry_failed_candles_task(self, limit: int = FAILURE_RETRY_BATCH_SIZE):
+    """
+    실패 기록된 코인 캔들 재수집 태스크
+
+    재시도 시점이 된 FetchFailure의 코인/기간만 다시 수집합니다.
+    성공한 항목은 해결 처리하고, 실패한 항목은 백오프를 늘려 다음 실행으로 미룹니다.
+
+    Args:
+        limit: 한 번에 처리할 최대 실패 기록 수
+
+    Returns:
+        dict: 성공 여부, 재시도/해결/실패 항목 수, 저장된 캔들 수
+    """
+    try:
+        failures = list(due_failures(CANDLE_FAILURE_SOURCE, limit=limit))
+        if not failures:
+            return {"success": True, "retried": 0, "resolved": 0, "failed": 0, "written_rows": 0}
+
+        logger.info(f"[Task] Retrying {len(failures)} failed coin candles")
+
+        coins = Coin.objects.in_bulk(
+            {failure.item for failure in failures}, field_name='market_code'
+        )
+        resolved = 0
+        written_rows = 0
+
+        for failure in failures:
+            coin = coins.get(failure.item)
+            if coin is None or not coin.is_active:
+                mark_retry_failed(failure, f"Coin {failure.item} not found or inactive")
+                continue
+
+            start_date = date.fromisoformat(failure.params.get('start_date', failure.target_date.isoformat()))
+            stats = {'written': 0, 'skipped': 0, 'failed': 0}
+            try:
+                if failure.dataset in DERIVED_CANDLE_TYPES:
+                    received = collect_derived_candles(
+                        [coin], failure.dataset, start_date, failure.target_date, stats
+                    )[coin.market_code]
+                    if isinstance(received, Exception):
+                        raise received
+                else:
+                    received = fetch_coin_candles(
+                        coin=coin,
+                        start_date=start_date,
+                        end_date=failure.target_date,
+                        candle_type=failure.dataset,
+                        stats=stats
+                    )
+            except Exception as e:
+                logger.error(f"[Task] Retry failed for {failure}: {e}")
+                mark_retry_failed(failure, e)
+                continue
+
+            written_rows += stats['written']
+            # pyupbit는 429 등 조회 오류도 None으로 반환하므로 0건은 해결이 아니라 실패로 처리
+            if not received:
+                logger.warning(f"[Task] Retry received no candles for {failure}")
+                mark_retry_failed(failure, "No candles received")
+                continue
+            if stats['failed']:
+                mark_retry_failed(failure, f"{stats['failed']} candles failed to save")
+                continue
+            resolved += resolve_failures(
+                CANDLE_FAILURE_SOURCE, failure.dataset, failure.target_date, [failure.item]
+            )
+
+        logger.info(
+            f"[Task] Completed coin candle retry: {resolved} resolved, "
+            f"{len(failures) - resolved} still failing"
+        )
+        return {
+            "success": True,
+            "retried": len(failures),
+            "resolved": resolved,
+            "failed": len(failures) - resolved,
+            "written_rows": written_rows
+        }
+
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in coin candle retry: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
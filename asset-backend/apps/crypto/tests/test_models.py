@@ -174,10 +174,10 @@ class TestCoinCollectionConfigModel:
         """period_days 유효성 검사 테스트"""
         from django.core.exceptions import ValidationError
 
-        # 1~200 범위 내
+        # 1~3650 범위 내 (200일 초과는 페이지 조회)
         config = CoinCollectionConfig(
             name="테스트",
-            period_days=100
+            period_days=1000
         )
         config.full_clean()  # 검증 통과
 
@@ -189,10 +189,10 @@ class TestCoinCollectionConfigModel:
         with pytest.raises(ValidationError):
             config.full_clean()
 
-        # 201은 실패
+        # 3651은 실패
         config = CoinCollectionConfig(
             name="테스트3",
-            period_days=201
+            period_days=3651
         )
         with pytest.raises(ValidationError):
             config.full_clean()
@@ -0,0 +1,172 @@
+"""
+토큰 버킷 속도 제한 테스트
+"""
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from apps.common.rate_limit import (
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    reset_rate_limiters,
+)
+from apps.crypto.services import UPBIT_CANDLES_RATE_LIMIT, fetch_coin_candles
+
+
+class FakeClock:
+    """sleep 호출 시 시각만 진행하는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    def test_spends_burst_then_waits_for_refill(self, clock):
+        bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+        assert bucket.take() == 0.0
+        assert bucket.take() == 0.0
+        assert bucket.take() == pytest.approx(0.1)
+
+        clock.now = 0.1
+        assert bucket.take() == 0.0
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+        bucket.take()
+
+        clock.now = 60.0
+        assert bucket.take() == 0.0
+        assert bucket.take() == pytest.approx(0.1)
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    def test_local_limit_paces_calls_to_rate(self, clock):
+        limiter = RateLimiter("test", rate=10, burst=1, clock=clock, sleep=clock.sleep)
+
+        for _ in range(11):
+            limiter.acquire()
+
+        # 첫 호출은 바로, 이후 10회는 0.1초 간격
+        assert clock.now == pytest.approx(1.0)
+        assert len(clock.sleeps) == 10
+
+    def test_no_sleep_while_budget_available(self, clock):
+        limiter = RateLimiter("test", rate=10, burst=5, clock=clock, sleep=clock.sleep)
+
+        waited = sum(limiter.acquire() for _ in range(5))
+
+        assert waited == 0.0
+        assert clock.sleeps == []
+
+    def test_waits_for_shared_bucket(self, clock):
+        """다른 워커가 한도를 쓰고 있으면 Redis가 알려준 시간만큼 대기"""
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.side_effect = ["0.05", "0"]
+        limiter = RateLimiter("test", rate=10, burst=1, redis_client=redis_client,
+                              clock=clock, sleep=clock.sleep)
+
+        waited = limiter.acquire()
+
+        assert waited == pytest.approx(0.05)
+        assert script.call_count == 2
+        assert script.call_args.kwargs == {"keys": ["rate-limit:test"], "args": [10.0, 1.0, 1]}
+
+    def test_local_bucket_skips_redis_when_exhausted(self, clock):
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.return_value = "0"
+        limiter = RateLimiter("test", rate=10, burst=1, redis_client=redis_client,
+                              clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        # 두 번째 호출은 로컬 버킷 대기 후 한 번만 Redis 확인
+        assert script.call_count == 2
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    def test_falls_back_to_local_bucket_when_redis_fails(self, clock):
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.side_effect = ConnectionError("redis down")
+        limiter = RateLimiter("test", rate=10, burst=1, redis_client=redis_client,
+                              clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        # 장애 후 재시도 간격 동안 Redis를 다시 호출하지 않음
+        assert script.call_count == 1
+        assert clock.now == pytest.approx(0.2)
+
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_runs_redis_call_off_event_loop(self, clock):
+        """비동기 경로의 Redis 스크립트 호출은 이벤트 루프 스레드 밖에서 실행"""
+        import threading
+
+        loop_thread = threading.get_ident()
+        called_from = []
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.side_effect = lambda **kwargs: called_from.append(threading.get_ident()) or "0"
+        limiter = RateLimiter("test", rate=10, burst=1, redis_client=redis_client, clock=clock)
+
+        waited = await limiter.acquire_async()
+
+        assert waited == 0.0
+        assert called_from and loop_thread not in called_from
+
+@pytest.mark.unit
+class TestRateLimiterRegistry:
+    def test_unknown_limit(self):
+        with pytest.raises(ValueError):
+            get_rate_limiter("unknown")
+
+    def test_builds_from_settings(self, settings):
+        settings.RATE_LIMITS = {"upbit:candles": {"rate": 5, "burst": 2}}
+        reset_rate_limiters()
+        try:
+            limiter = get_rate_limiter("upbit:candles")
+            assert (limiter.rate, limiter.burst, limiter.redis) == (5.0, 2.0, None)
+            assert get_rate_limiter("upbit:candles") is limiter
+        finally:
+            reset_rate_limiters()
+
+
+@pytest.mark.django_db
+class TestUpbitCallsRateLimited:
+    @patch('apps.crypto.services.acquire')
+    @patch('pyupbit.get_ohlcv')
+    def test_each_candle_request_acquires_token(self, mock_get_ohlcv, mock_acquire, coin):
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            'open': [50000000],
+            'high': [52000000],
+            'low': [49000000],
+            'close': [51000000],
+            'volume': [100.5],
+        }, index=pd.DatetimeIndex(['2024-11-27']))
+
+        fetch_coin_candles(coin, date(2024, 11, 27), date(2024, 11, 27))
+
+        mock_acquire.assert_called_once_with(UPBIT_CANDLES_RATE_LIMIT)
@@ -3,14 +3,22 @@ from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
 import pandas as pd
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.crypto.services import (
     fetch_all_coins,
     fetch_coin_candles,
-    bulk_collect_candles
+    bulk_collect_candles,
+    collect_candles_for_configs,
+    collect_derived_candles,
+    plan_candle_ranges,
+    reconcile_derived_candles,
+    rollup_daily_candles,
 )
 from apps.crypto.models import Coin, CoinCandle, CoinCollectionConfig
 from apps.common.exceptions import CryptoDataFetchError
+from apps.common.models import FetchFailure
 
 
 @pytest.mark.django_db
@@ -87,7 +95,9 @@ class TestFetchCoinCandles:
     @patch('pyupbit.get_ohlcv')
     def test_fetch_coin_candles_empty(self, mock_get_ohlcv, coin):
         """빈 DataFrame 반환 시"""
-        mock_get_ohlcv.return_value = None
+        mock_get_ohlcv.return_value = pd.DataFrame(
+            columns=['open', 'high', 'low', 'close', 'volume', 'value']
+        )
 
         start_date = date(2024, 11, 26)
         end_date = date(2024, 11, 27)
@@ -98,7 +108,7 @@ class TestFetchCoinCandles:
 
     @patch('pyupbit.get_ohlcv')
     def test_fetch_coin_candles_large_period(self, mock_get_ohlcv, coin):
-        """200일 초과 기간 요청 시 (경고 로그만 확인)"""
+        """200일 초과 기간 요청 시 받은 캔들이 요청 개수보다 적으면 페이지 조회 종료"""
         mock_df = pd.DataFrame({
             'open': [50000000],
             'high': [52000000],
@@ -113,8 +123,63 @@ class TestFetchCoinCandles:
         end_date = date(2024, 11, 27)
         count = fetch_coin_candles(coin, start_date, end_date)
 
-        # 200개 제한이 적용되어도 정상 동작
-        assert count >= 0
+        assert count == 1
+        assert mock_get_ohlcv.call_count == 1
+        assert mock_get_ohlcv.call_args.kwargs['count'] == 200
+        assert mock_get_ohlcv.call_args.kwargs['to'] == '2024-11-28 00:00:00'
+
+    @patch('apps.crypto.upbit_client.UPBIT_MAX_CANDLES_PER_REQUEST', 3)
+    @patch('pyupbit.get_ohlcv')
+    def test_fetch_coin_candles_pages_backward(self, mock_get_ohlcv, coin):
+        """to 커서로 과거 페이지를 이어 받아 중복 제거 후 한 번에 저장"""
+        def page(days):
+            return pd.DataFrame({
+                'open': [50000000] * len(days),
+                'high': [52000000] * len(days),
+                'low': [49000000] * len(days),
+                'close': [51000000 + i for i in range(len(days))],
+                'volume': [100.5] * len(days),
+                'value': [5100000000] * len(days),
+            }, index=pd.DatetimeIndex([f'{d} 09:00:00' for d in days]))
+
+        pages = {
+            '2024-11-28 00:00:00': page(['2024-11-25', '2024-11-26', '2024-11-27']),
+            # 경계 캔들이 겹쳐 와도 한 번만 저장
+            '2024-11-25 00:00:00': page(['2024-11-23', '2024-11-24', '2024-11-25']),
+            '2024-11-23 00:00:00': page(['2024-11-20', '2024-11-21', '2024-11-22']),
+        }
+        mock_get_ohlcv.side_effect = lambda **kwargs: pages[kwargs['to']]
+
+        count = fetch_coin_candles(coin, date(2024, 11, 21), date(2024, 11, 27))
+
+        cursors = [c.kwargs['to'] for c in mock_get_ohlcv.call_args_list]
+        assert cursors == ['2024-11-28 00:00:00', '2024-11-25 00:00:00', '2024-11-23 00:00:00']
+        assert count == 7
+        assert sorted(CoinCandle.objects.values_list('trade_date', flat=True)) == [
+            date(2024, 11, 21) + timedelta(days=i) for i in range(7)
+        ]
+        # 겹친 날짜는 최신 페이지 값을 사용
+        assert CoinCandle.objects.get(trade_date=date(2024, 11, 25)).close_price == Decimal('51000000')
+
+    @patch('pyupbit.get_ohlcv')
+    def test_fetch_coin_candles_page_error_is_not_truncated(self, mock_get_ohlcv, coin):
+        """다음 페이지 조회가 None(pyupbit 조회 오류)이면 잘린 기간을 저장하지 않고 실패"""
+        dates = pd.date_range('2024-06-01 09:00', periods=200, freq='D')
+        first_page = pd.DataFrame({
+            'open': [50000000.0] * 200,
+            'high': [52000000.0] * 200,
+            'low': [49000000.0] * 200,
+            'close': [51000000.0] * 200,
+            'volume': [100.5] * 200,
+        }, index=dates)
+        mock_get_ohlcv.side_effect = (
+            lambda **kwargs: first_page if kwargs['to'] == '2024-12-18 00:00:00' else None
+        )
+
+        with pytest.raises(CryptoDataFetchError):
+            fetch_coin_candles(coin, date(2024, 1, 1), date(2024, 12, 17))
+
+        assert CoinCandle.objects.count() == 0
 
     @patch('pyupbit.get_ohlcv')
     def test_fetch_coin_candles_api_error(self, mock_get_ohlcv, coin):
@@ -127,8 +192,7 @@ class TestFetchCoinCandles:
 
 @pytest.mark.django_db
 class TestBulkCollectCandles:
-    @patch('apps.crypto.services.fetch_coin_candles')
-    def test_bulk_collect_candles_success(self, mock_fetch, coin):
+    def test_bulk_collect_candles_success(self, upbit_stub, coin):
         """일괄 수집 성공 테스트"""
         # 설정 생성
         config = CoinCollectionConfig.objects.create(
@@ -138,9 +202,7 @@ class TestBulkCollectCandles:
             is_active=True
         )
         config.coins.add(coin)
-
-        # Mock 설정
-        mock_fetch.return_value = 7
+        upbit_stub.add_days("KRW-BTC", date.today() - timedelta(days=30), date.today())
 
         # 함수 실행
         result = bulk_collect_candles(config)
@@ -149,10 +211,11 @@ class TestBulkCollectCandles:
         assert result['success_count'] == 1
         assert result['fail_count'] == 0
         assert result['total'] == 1
-        mock_fetch.assert_called_once()
+        assert result['written_rows'] == 7
+        assert CoinCandle.objects.filter(coin=coin).count() == 7
+        assert len(upbit_stub.requests) == 1
 
-    @patch('apps.crypto.services.fetch_coin_candles')
-    def test_bulk_collect_candles_partial_failure(self, mock_fetch, coin):
+    def test_bulk_collect_candles_partial_failure(self, upbit_stub, coin):
         """일부 코인 수집 실패 테스트"""
         coin2 = Coin.objects.create(
             market_code="KRW-ETH",
@@ -168,7 +231,8 @@ class TestBulkCollectCandles:
         config.coins.add(coin, coin2)
 
         # 첫 번째는 성공, 두 번째는 실패
-        mock_fetch.side_effect = [7, Exception("API Error")]
+        upbit_stub.add_days("KRW-BTC", date.today() - timedelta(days=6), date.today())
+        upbit_stub.failing.add("KRW-ETH")
 
         result = bulk_collect_candles(config)
 
@@ -176,6 +240,12 @@ class TestBulkCollectCandles:
         assert result['fail_count'] == 1
         assert result['total'] == 2
 
+        # 실패한 코인만 재수집 대상으로 기록
+        failure = FetchFailure.objects.get()
+        assert (failure.source, failure.dataset, failure.item) == ('upbit', 'days', 'KRW-ETH')
+        assert failure.target_date == date.today()
+        assert failure.params == {'start_date': (date.today() - timedelta(days=6)).isoformat()}
+
     def test_bulk_collect_candles_no_coins(self):
         """코인이 없는 설정"""
         config = CoinCollectionConfig.objects.create(
@@ -190,8 +260,7 @@ class TestBulkCollectCandles:
         assert result['fail_count'] == 0
         assert result['total'] == 0
 
-    @patch('apps.crypto.services.fetch_coin_candles')
-    def test_bulk_collect_candles_inactive_coins(self, mock_fetch, coin):
+    def test_bulk_collect_candles_inactive_coins(self, upbit_stub, coin):
         """비활성 코인은 제외"""
         coin.is_active = False
         coin.save()
@@ -206,4 +275,351 @@ class TestBulkCollectCandles:
         result = bulk_collect_candles(config)
 
         assert result['total'] == 0
-        mock_fetch.assert_not_called()
+        assert upbit_stub.requests == []
+
+
+def _store_candles(coin, days, candle_type='days'):
+    CoinCandle.objects.bulk_create([
+        CoinCandle(
+            coin=coin, candle_type=candle_type, trade_date=day,
+            open_price=1, high_price=1, low_price=1, close_price=1, volume=1
+        )
+        for day in days
+    ])
+
+
+@pytest.mark.django_db
+class TestIncrementalCollection:
+    TODAY = date(2024, 11, 27)
+
+    def _days(self, start, end):
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    def test_plan_new_coin_requests_full_period(self, coin):
+        plan = plan_candle_ranges([coin], 'days', date(2024, 10, 29), self.TODAY)
+
+        assert plan == {'KRW-BTC': [(date(2024, 10, 29), self.TODAY)]}
+
+    def test_plan_requests_tail_from_last_stored_candle(self, coin):
+        _store_candles(coin, self._days(date(2024, 10, 1), date(2024, 11, 26)))
+
+        with CaptureQueriesContext(connection) as queries:
+            plan = plan_candle_ranges([coin], 'days', date(2024, 10, 29), self.TODAY)
+
+        assert plan == {'KRW-BTC': [(date(2024, 11, 26), self.TODAY)]}
+        assert len(queries) == 1
+
+    def test_plan_fills_interior_gaps(self, coin):
+        eth = Coin.objects.create(market_code="KRW-ETH", korean_name="이더리움", english_name="Ethereum")
+        days = self._days(date(2023, 1, 1), date(2024, 11, 26))
+        gaps = {date(2023, 3, 1), date(2023, 3, 2), date(2024, 11, 10)}
+        _store_candles(coin, [d for d in days if d not in gaps])
+        _store_candles(eth, days)
+
+        plan = plan_candle_ranges([coin, eth], 'days', date(2023, 1, 1), self.TODAY)
+
+        # 가까운 누락 구간은 꼬리 구간과 합치고, 먼 구간은 따로 요청
+        assert plan['KRW-BTC'] == [
+            (date(2023, 3, 1), date(2023, 3, 2)),
+            (date(2024, 11, 10), self.TODAY),
+        ]
+        assert plan['KRW-ETH'] == [(date(2024, 11, 26), self.TODAY)]
+
+    def test_plan_backfills_before_first_stored_candle(self, coin):
+        """기간을 늘리면 첫 저장 캔들 앞 구간도 요청"""
+        eth = Coin.objects.create(market_code="KRW-ETH", korean_name="이더리움", english_name="Ethereum")
+        _store_candles(coin, self._days(date(2024, 11, 20), date(2024, 11, 26)))
+        _store_candles(eth, self._days(date(2024, 6, 1), date(2024, 11, 26)))
+
+        short = plan_candle_ranges([coin], 'days', date(2024, 10, 29), self.TODAY)
+        long = plan_candle_ranges([eth], 'days', date(2023, 1, 1), self.TODAY)
+
+        # 한 페이지 안에 드는 앞 구간은 꼬리 구간과 합침
+        assert short == {'KRW-BTC': [(date(2024, 10, 29), self.TODAY)]}
+        assert long == {'KRW-ETH': [
+            (date(2023, 1, 1), date(2024, 5, 31)),
+            (date(2024, 11, 26), self.TODAY),
+        ]}
+
+    def test_daily_collection_backfills_longer_period(self, upbit_stub, coin):
+        today = date.today()
+        upbit_stub.add_days("KRW-BTC", today - timedelta(days=60), today)
+        _store_candles(coin, self._days(today - timedelta(days=9), today))
+        config = CoinCollectionConfig.objects.create(name="일봉", candle_type="days", period_days=30)
+        config.coins.add(coin)
+
+        bulk_collect_candles(config)
+
+        assert CoinCandle.objects.filter(coin=coin).count() == 30
+        assert CoinCandle.objects.filter(trade_date=today - timedelta(days=29)).exists()
+
+    def test_plan_weekly_gaps(self, coin):
+        mondays = [date(2024, 9, 2) + timedelta(weeks=i) for i in range(12)]
+        _store_candles(coin, [d for d in mondays if d != date(2024, 9, 23)], candle_type='weeks')
+
+        plan = plan_candle_ranges([coin], 'weeks', date(2024, 9, 1), self.TODAY)
+
+        assert plan == {'KRW-BTC': [(date(2024, 9, 23), self.TODAY)]}
+
+    def test_daily_collection_requests_only_new_candles(self, upbit_stub, coin):
+        today = date.today()
+        upbit_stub.add_days("KRW-BTC", today - timedelta(days=60), today)
+        config = CoinCollectionConfig.objects.create(name="일봉", candle_type="days", period_days=30)
+        config.coins.add(coin)
+        bulk_collect_candles(config)
+        upbit_stub.requests.clear()
+
+        # 하루 뒤 수집: 마지막 저장 캔들과 새 캔들만 요청
+        CoinCandle.objects.filter(trade_date=today).delete()
+        result = bulk_collect_candles(config)
+
+        assert [q['count'] for _, q in upbit_stub.requests] == ['2']
+        assert result['written_rows'] == 1
+        assert result['skipped_rows'] == 1
+        assert CoinCandle.objects.filter(coin=coin).count() == 30
+
+    def test_daily_collection_fills_gaps(self, upbit_stub, coin):
+        today = date.today()
+        upbit_stub.add_days("KRW-BTC", today - timedelta(days=60), today)
+        _store_candles(coin, [
+            d for d in self._days(today - timedelta(days=29), today)
+            if d not in (today - timedelta(days=20), today - timedelta(days=19))
+        ])
+        config = CoinCollectionConfig.objects.create(name="일봉", candle_type="days", period_days=30)
+        config.coins.add(coin)
+
+        bulk_collect_candles(config)
+
+        assert len(upbit_stub.requests) == 1
+        assert CoinCandle.objects.filter(coin=coin).count() == 30
+        assert CoinCandle.objects.get(coin=coin, trade_date=today - timedelta(days=20)).open_price == 1040
+
+
+@pytest.mark.django_db
+class TestCollectCandlesForConfigs:
+    def test_shared_coins_are_collected_once(self, upbit_stub, coin):
+        """여러 설정에 들어 있는 코인은 가장 긴 기간으로 한 번만 조회"""
+        eth = Coin.objects.create(market_code="KRW-ETH", korean_name="이더리움", english_name="Ethereum")
+        xrp = Coin.objects.create(market_code="KRW-XRP", korean_name="리플", english_name="Ripple")
+        today = date.today()
+        for market in ("KRW-BTC", "KRW-ETH"):
+            upbit_stub.add_days(market, today - timedelta(days=60), today)
+        upbit_stub.failing.add("KRW-XRP")
+
+        weekly = CoinCollectionConfig.objects.create(name="주요 코인", candle_type="days", period_days=7)
+        weekly.coins.add(coin, xrp)
+        monthly = CoinCollectionConfig.objects.create(name="전체", candle_type="days", period_days=30)
+        monthly.coins.add(coin, eth, xrp)
+
+        results = collect_candles_for_configs([weekly, monthly])
+
+        requested = sorted((q['market'], q['count']) for _, q in upbit_stub.requests)
+        assert requested == [('KRW-BTC', '30'), ('KRW-ETH', '30'), ('KRW-XRP', '30')]
+        assert CoinCandle.objects.filter(coin=coin).count() == 30
+
+        assert results[weekly.id]['success_count'] == 1
+        assert results[weekly.id]['fail_count'] == 1
+        assert results[monthly.id]['success_count'] == 2
+        assert results[monthly.id]['fail_count'] == 1
+        assert results[monthly.id]['written_rows'] == 60
+
+        # 실패한 코인은 한 번만 기록 (가장 긴 기간 기준)
+        failure = FetchFailure.objects.get()
+        assert failure.item == 'KRW-XRP'
+        assert failure.params == {'start_date': (today - timedelta(days=29)).isoformat()}
+
+    def test_unsupported_candle_type_skips_only_its_config(self, upbit_stub, coin):
+        """분봉 설정은 건너뛰고 다른 설정은 계속 수집"""
+        today = date.today()
+        upbit_stub.add_days("KRW-BTC", today - timedelta(days=10), today)
+        daily = CoinCollectionConfig.objects.create(name="일봉", candle_type="days", period_days=7)
+        daily.coins.add(coin)
+        minutes = CoinCollectionConfig.objects.create(name="분봉", candle_type="minutes", period_days=7)
+        minutes.coins.add(coin)
+
+        results = collect_candles_for_configs([daily, minutes])
+
+        assert results[daily.id]['success_count'] == 1
+        assert (results[minutes.id]['success_count'], results[minutes.id]['fail_count']) == (0, 1)
+        assert {path for path, _ in upbit_stub.requests} == {'/v1/candles/days'}
+        assert not FetchFailure.objects.exists()
+
+    def test_plan_rejects_unsupported_candle_type(self, coin):
+        with pytest.raises(ValueError):
+            plan_candle_ranges([coin], 'minutes', date(2024, 11, 1), date(2024, 11, 27))
+
+
+@pytest.mark.django_db
+class TestDerivedCandles:
+    def _daily(self, start, end):
+        days = pd.date_range(start, end, freq='D') + pd.Timedelta(hours=9)
+        prices = [1000.0 + i for i in range(len(days))]
+        return pd.DataFrame({
+            'open': prices,
+            'high': [p + 100 for p in prices],
+            'low': [p - 100 for p in prices],
+            'close': [p + 50 for p in prices],
+            'volume': 10.5,
+            'value': [p * 10 for p in prices],
+        }, index=days)
+
+    def test_rollup_uses_upbit_buckets(self):
+        """주봉은 월요일, 월봉은 1일 KST 09:00 캔들로 집계"""
+        daily = self._daily('2024-10-30', '2024-11-05')  # 수요일 ~ 다음 주 화요일
+
+        weeks = rollup_daily_candles(daily, 'weeks')
+        months = rollup_daily_candles(daily, 'months')
+
+        assert list(weeks.index) == [pd.Timestamp('2024-10-28 09:00'), pd.Timestamp('2024-11-04 09:00')]
+        assert weeks.iloc[0].to_dict() == {
+            'open': 1000.0, 'high': 1104.0, 'low': 900.0, 'close': 1054.0,
+            'volume': 52.5, 'value': 50100.0,
+        }
+        assert list(months.index) == [pd.Timestamp('2024-10-01 09:00'), pd.Timestamp('2024-11-01 09:00')]
+        assert months.iloc[1][['open', 'close', 'volume']].tolist() == [1002.0, 1056.0, 52.5]
+
+    def test_rollup_leaves_value_empty_when_daily_value_missing(self):
+        daily = self._daily('2024-11-04', '2024-11-10')
+        daily.iloc[3, daily.columns.get_loc('value')] = float('nan')
+
+        assert pd.isna(rollup_daily_candles(daily, 'weeks').iloc[0]['value'])
+
+    def test_weekly_config_fetches_only_daily_candles(self, upbit_stub, coin):
+        """주봉 설정은 첫 주 월요일부터 일봉만 받아 만들고, 표본 대조에만 주봉을 요청"""
+        today = date.today()
+        upbit_stub.add_days("KRW-BTC", today - timedelta(days=60), today)
+        config = CoinCollectionConfig.objects.create(name="주봉", candle_type="weeks", period_days=10)
+        config.coins.add(coin)
+        first_monday = today - timedelta(days=9 + (today - timedelta(days=9)).weekday())
+
+        results = collect_candles_for_configs([config])
+
+        paths = [path for path, _ in upbit_stub.requests]
+        assert paths.count('/v1/candles/weeks') == 1
+        assert set(paths) == {'/v1/candles/days', '/v1/candles/weeks'}
+        daily = CoinCandle.objects.filter(coin=coin, candle_type='days')
+        assert daily.order_by('trade_date').first().trade_date == first_monday
+        weekly = list(CoinCandle.objects.filter(coin=coin, candle_type='weeks').order_by('trade_date'))
+        assert [candle.trade_date for candle in weekly] == list(
+            pd.date_range(first_monday, today, freq='W-MON').date
+        )
+        assert weekly[0].volume == Decimal('73.5')
+        assert results[config.id]['success_count'] == 1
+        assert results[config.id]['written_rows'] == len(weekly)
+
+    def test_failed_daily_collection_fails_derived_candles(self, upbit_stub, coin):
+        upbit_stub.failing.add("KRW-BTC")
+        config = CoinCollectionConfig.objects.create(name="월봉", candle_type="months", period_days=30)
+        config.coins.add(coin)
+
+        results = collect_candles_for_configs([config])
+
+        assert results[config.id]['fail_count'] == 1
+        assert set(FetchFailure.objects.values_list('dataset', flat=True)) == {'days', 'months'}
+        assert not CoinCandle.objects.filter(candle_type='months').exists()
+
+    def test_reconcile_reports_mismatched_candles(self, upbit_stub, coin):
+        upbit_stub.add_days("KRW-BTC", date(2024, 9, 1), date(2024, 11, 27))
+        collect_derived_candles([coin], 'weeks', date(2024, 9, 1), date(2024, 11, 27))
+        CoinCandle.objects.filter(
+            coin=coin, candle_type='weeks', trade_date=date(2024, 11, 11)
+        ).update(close_price=1)
+
+        report = reconcile_derived_candles([coin], 'weeks', date(2024, 11, 27))
+
+        # 진행 중인 주(11/25)를 뺀 최근 4주만 비교
+        assert report['sampled'] == ['KRW-BTC']
+        assert report['compared'] == 4
+        assert report['mismatches'] == [
+            {'market': 'KRW-BTC', 'trade_date': date(2024, 11, 11), 'fields': ['close_price']}
+        ]
+        assert [q['to'] for path, q in upbit_stub.requests if path == '/v1/candles/weeks'] == [
+            '2024-11-25 00:00:00'
+        ]
+
+
+@pytest.mark.django_db
+class TestFetchCoinCandlesArchive:
+    @patch('pyupbit.get_ohlcv')
+    def test_replay_from_archive(self, mock_get_ohlcv, coin, settings, tmp_path):
+        """보관된 Upbit 응답으로 네트워크 없이 재수집"""
+        from apps.common.archive import archive_mode
+
+        settings.RAW_ARCHIVE_DIR = tmp_path
+        settings.RAW_ARCHIVE_MODE = "record"
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            'open': [50000000],
+            'high': [52000000],
+            'low': [49000000],
+            'close': [51000000],
+            'volume': [100.5],
+            'value': [5100000000]
+        }, index=pd.DatetimeIndex(['2024-11-27']))
+
+        assert fetch_coin_candles(coin, date(2024, 11, 27), date(2024, 11, 27)) == 1
+        CoinCandle.objects.all().delete()
+        mock_get_ohlcv.reset_mock()
+
+        with archive_mode("offline"):
+            assert fetch_coin_candles(coin, date(2024, 11, 27), date(2024, 11, 27)) == 1
+
+        mock_get_ohlcv.assert_not_called()
+        assert CoinCandle.objects.get().close_price == Decimal('51000000')
+
+
+@pytest.mark.django_db
+class TestFetchCoinCandlesChangeDetection:
+    @patch('pyupbit.get_ohlcv')
+    def test_skips_unchanged_candles(self, mock_get_ohlcv, coin):
+        """겹치는 수집 구간에서 값이 같은 캔들은 다시 쓰지 않음"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            'open': [0.00012345, 51000000],
+            'high': [52000000, 53000000],
+            'low': [49000000, 50000000],
+            'close': [51000000, 52000000],
+            'volume': [100.12345678, 150.3],
+            'value': [5100000000.55, 7800000000]
+        }, index=pd.DatetimeIndex(['2024-11-26', '2024-11-27']))
+        fetch_coin_candles(coin, date(2024, 11, 26), date(2024, 11, 27))
+        first_updated = CoinCandle.objects.get(trade_date=date(2024, 11, 26)).updated_at
+
+        # 마지막 캔들만 값이 바뀜
+        changed = mock_get_ohlcv.return_value.copy()
+        changed.loc['2024-11-27', 'close'] = 52500000
+        mock_get_ohlcv.return_value = changed
+        stats = {}
+        count = fetch_coin_candles(coin, date(2024, 11, 26), date(2024, 11, 27), stats=stats)
+
+        assert count == 2
+        assert len(stats.pop('checksums')) == 1
+        assert stats == {'written': 1, 'skipped': 1, 'failed': 0}
+        assert CoinCandle.objects.get(trade_date=date(2024, 11, 26)).updated_at == first_updated
+        assert CoinCandle.objects.get(trade_date=date(2024, 11, 27)).close_price == Decimal('52500000')
+
+    @patch('pyupbit.get_ohlcv')
+    def test_rejects_invalid_candles_before_upsert(self, mock_get_ohlcv, coin):
+        """저장할 수 없는 캔들은 날짜별로 실패 기록하고 나머지만 저장"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            'open': [50000000, float('nan'), 50000000, 50000000, 1e13],
+            'high': [52000000, 52000000, 48000000, 52000000, 1e13],
+            'low': [49000000, 49000000, 49000000, -1, 1e13],
+            'close': [51000.123456789, 51000000, 51000000, 51000000, 1e13],
+            'volume': [100.5, 100.5, 100.5, 100.5, 100.5],
+            'value': [float('nan'), 1, 1, 1, 1],
+        }, index=pd.DatetimeIndex(['2024-11-23', '2024-11-24', '2024-11-25', '2024-11-26', '2024-11-27']))
+        stats = {}
+
+        count = fetch_coin_candles(coin, date(2024, 11, 23), date(2024, 11, 27), stats=stats)
+
+        assert count == 1
+        assert (stats['written'], stats['failed']) == (1, 4)
+        candle = CoinCandle.objects.get()
+        assert candle.close_price == Decimal('51000.12345679')
+        assert candle.candle_acc_trade_volume is None
+        errors = dict(FetchFailure.objects.values_list('target_date', 'error'))
+        assert errors == {
+            date(2024, 11, 24): "missing or non-finite candle values",
+            date(2024, 11, 25): "high price below low price",
+            date(2024, 11, 26): "negative candle values",
+            date(2024, 11, 27): "candle values exceed 20 digits",
+        }
@@ -5,14 +5,19 @@ import pytest
 from unittest.mock import patch, MagicMock
 from datetime import date
 from celery.exceptions import Retry
+from django.utils import timezone
 
 from apps.crypto.tasks import (
     sync_coin_master_task,
     collect_crypto_candles_task,
-    recollect_candles_task
+    recollect_candles_task,
+    retry_failed_candles_task
 )
-from apps.crypto.models import Coin, CoinCollectionConfig
+from apps.crypto.models import Coin, CoinCandle, CoinCollectionConfig
 from apps.common.exceptions import CryptoDataFetchError
+from apps.common.failures import record_failure
+from apps.common.models import FetchFailure, IngestionRun
+from apps.common.utils import combine_checksums
 
 
 @pytest.mark.django_db
@@ -67,11 +72,9 @@ class TestCollectCryptoCandlesTask:
         )
         config.coins.add(coin)
 
-        with patch('apps.crypto.tasks.bulk_collect_candles') as mock_collect:
+        with patch('apps.crypto.tasks.collect_candles_for_configs') as mock_collect:
             mock_collect.return_value = {
-                'success_count': 1,
-                'fail_count': 0,
-                'total': 1
+                config.id: {'success_count': 1, 'fail_count': 0, 'total': 1}
             }
 
             result = collect_crypto_candles_task()
@@ -80,7 +83,7 @@ class TestCollectCryptoCandlesTask:
             assert result["configs_count"] == 1
             assert result["total_success"] == 1
             assert result["total_fail"] == 0
-            mock_collect.assert_called_once_with(config)
+            mock_collect.assert_called_once_with([config])
 
     def test_collect_crypto_candles_task_no_active_configs(self):
         """활성화된 설정이 없을 때 테스트"""
@@ -114,11 +117,11 @@ class TestCollectCryptoCandlesTask:
         )
         config2.coins.add(coin2)
 
-        with patch('apps.crypto.tasks.bulk_collect_candles') as mock_collect:
-            mock_collect.side_effect = [
-                {'success_count': 1, 'fail_count': 0, 'total': 1},
-                {'success_count': 1, 'fail_count': 0, 'total': 1}
-            ]
+        with patch('apps.crypto.tasks.collect_candles_for_configs') as mock_collect:
+            mock_collect.return_value = {
+                config1.id: {'success_count': 1, 'fail_count': 0, 'total': 1},
+                config2.id: {'success_count': 1, 'fail_count': 0, 'total': 1},
+            }
 
             result = collect_crypto_candles_task()
 
@@ -126,7 +129,8 @@ class TestCollectCryptoCandlesTask:
             assert result["configs_count"] == 2
             assert result["total_success"] == 2
             assert result["total_fail"] == 0
-            assert mock_collect.call_count == 2
+            # 모든 설정을 한 번의 계획으로 수집
+            mock_collect.assert_called_once()
 
     def test_collect_crypto_candles_task_partial_failure(self, coin):
         """일부 설정 수집 실패 테스트"""
@@ -138,14 +142,17 @@ class TestCollectCryptoCandlesTask:
         )
         config.coins.add(coin)
 
-        with patch('apps.crypto.tasks.bulk_collect_candles') as mock_collect:
-            mock_collect.side_effect = Exception("API Error")
+        with patch('apps.crypto.tasks.collect_candles_for_configs') as mock_collect:
+            mock_collect.return_value = {
+                config.id: {'success_count': 0, 'fail_count': 1, 'total': 1}
+            }
 
             result = collect_crypto_candles_task()
 
-            # 예외가 발생해도 태스크는 계속 진행
+            # 코인 수집이 실패해도 태스크는 설정별 실패 수를 집계하고 완료
             assert result["success"] is True
-            assert result["configs_count"] == 0  # 실패한 설정은 카운트되지 않음
+            assert result["configs_count"] == 1
+            assert result["total_fail"] == 1
 
     def test_collect_crypto_candles_task_retry_on_fetch_error(self):
         """CryptoDataFetchError 발생 시 재시도 테스트"""
@@ -174,8 +181,8 @@ class TestRecollectCandlesTask:
         start_date = "2024-11-01"
         end_date = "2024-11-30"
 
-        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
-            mock_fetch.return_value = 30
+        with patch('apps.crypto.tasks.collect_coin_candles') as mock_collect:
+            mock_collect.return_value = {"KRW-BTC": 30}
 
             result = recollect_candles_task(
                 config_id=config.id,
@@ -190,12 +197,10 @@ class TestRecollectCandlesTask:
             assert result["start_date"] == start_date
             assert result["end_date"] == end_date
 
-            mock_fetch.assert_called_once_with(
-                coin=coin,
-                start_date=date(2024, 11, 1),
-                end_date=date(2024, 11, 30),
-                candle_type="days"
-            )
+            coins, start, end, candle_type, stats = mock_collect.call_args.args
+            assert list(coins) == [coin]
+            assert (start, end, candle_type) == (date(2024, 11, 1), date(2024, 11, 30), "days")
+            assert stats == {'written': 0, 'skipped': 0}
 
     def test_recollect_candles_task_config_not_found(self):
         """존재하지 않는 설정 ID로 재수집 시 테스트"""
@@ -224,8 +229,8 @@ class TestRecollectCandlesTask:
         )
         config.coins.add(coin, coin2)
 
-        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
-            mock_fetch.return_value = 30
+        with patch('apps.crypto.tasks.collect_coin_candles') as mock_collect:
+            mock_collect.return_value = {"KRW-BTC": 30, "KRW-ETH": 30}
 
             result = recollect_candles_task(
                 config_id=config.id,
@@ -236,7 +241,8 @@ class TestRecollectCandlesTask:
             assert result["success"] is True
             assert result["success_count"] == 2
             assert result["fail_count"] == 0
-            assert mock_fetch.call_count == 2
+            # 코인마다 태스크를 나누지 않고 한 번에 수집
+            mock_collect.assert_called_once()
 
     def test_recollect_candles_task_partial_failure(self, coin):
         """일부 코인 재수집 실패 테스트"""
@@ -254,9 +260,9 @@ class TestRecollectCandlesTask:
         )
         config.coins.add(coin, coin2)
 
-        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
+        with patch('apps.crypto.tasks.collect_coin_candles') as mock_collect:
             # 첫 번째는 성공, 두 번째는 실패
-            mock_fetch.side_effect = [30, Exception("API Error")]
+            mock_collect.return_value = {"KRW-BTC": 30, "KRW-ETH": Exception("API Error")}
 
             result = recollect_candles_task(
                 config_id=config.id,
@@ -281,7 +287,7 @@ class TestRecollectCandlesTask:
         )
         config.coins.add(coin)
 
-        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
+        with patch('apps.crypto.services.iter_candle_frames') as mock_frames:
             result = recollect_candles_task(
                 config_id=config.id,
                 start_date_str="2024-11-01",
@@ -291,7 +297,7 @@ class TestRecollectCandlesTask:
             assert result["success"] is True
             assert result["success_count"] == 0
             assert result["fail_count"] == 0
-            mock_fetch.assert_not_called()
+            mock_frames.assert_not_called()
 
     def test_recollect_candles_task_zero_candles_collected(self, coin):
         """수집된 캔들이 0개일 때 실패로 카운트 테스트"""
@@ -316,3 +322,96 @@ class TestRecollectCandlesTask:
             assert result["success"] is True
             assert result["success_count"] == 0
             assert result["fail_count"] == 1  # 0개 수집은 실패로 카운트
+
+    def test_recollect_monthly_config_derives_from_daily(self, upbit_stub, coin):
+        """월봉 재수집은 Upbit 일봉으로 다시 만듦"""
+        upbit_stub.add_days("KRW-BTC", date(2024, 9, 1), date(2024, 11, 30))
+        config = CoinCollectionConfig.objects.create(name="월봉 설정", candle_type="months", period_days=90)
+        config.coins.add(coin)
+
+        result = recollect_candles_task(
+            config_id=config.id,
+            start_date_str="2024-10-15",
+            end_date_str="2024-11-30"
+        )
+
+        assert result["success_count"] == 1
+        assert result["written_rows"] == 2
+        assert {path for path, _ in upbit_stub.requests} == {'/v1/candles/days'}
+        october = CoinCandle.objects.get(coin=coin, candle_type='months', trade_date=date(2024, 10, 1))
+        assert october.open_price == 1030  # 10월 1일 일봉 시가
+
+
+@pytest.mark.django_db
+class TestRetryFailedCandlesTask:
+    def test_retries_only_failed_coins(self):
+        """실패 기록된 코인/기간만 다시 수집"""
+        btc = Coin.objects.create(market_code='KRW-BTC', korean_name='비트코인')
+        Coin.objects.create(market_code='KRW-ETH', korean_name='이더리움')
+        record_failure('upbit', 'days', 'KRW-BTC', date(2024, 11, 27), 'timeout',
+                       {'start_date': '2024-11-20'})
+        FetchFailure.objects.update(next_retry_at=timezone.now())
+
+        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
+            mock_fetch.return_value = 8
+            result = retry_failed_candles_task()
+
+        mock_fetch.assert_called_once_with(
+            coin=btc,
+            start_date=date(2024, 11, 20),
+            end_date=date(2024, 11, 27),
+            candle_type='days',
+            stats={'written': 0, 'skipped': 0, 'failed': 0}
+        )
+        assert result['resolved'] == 1
+        assert FetchFailure.objects.get().status == 'resolved'
+
+    def test_failed_retry_is_backed_off(self):
+        """재시도 실패 시 재시도 횟수 증가"""
+        Coin.objects.create(market_code='KRW-BTC', korean_name='비트코인')
+        record_failure('upbit', 'days', 'KRW-BTC', date(2024, 11, 27), 'timeout')
+        FetchFailure.objects.update(next_retry_at=timezone.now())
+
+        with patch('apps.crypto.tasks.fetch_coin_candles') as mock_fetch:
+            mock_fetch.side_effect = CryptoDataFetchError('API error')
+            result = retry_failed_candles_task()
+
+        failure = FetchFailure.objects.get()
+        assert result['failed'] == 1
+        assert failure.status == 'pending'
+        assert failure.attempts == 1
+        assert failure.next_retry_at > timezone.now()
+
+
+    def test_empty_retry_is_not_resolved(self):
+        """pyupbit가 None을 반환해 캔들을 하나도 받지 못하면 해결하지 않고 백오프"""
+        Coin.objects.create(market_code='KRW-BTC', korean_name='비트코인')
+        record_failure('upbit', 'days', 'KRW-BTC', date(2024, 11, 27), 'timeout',
+                       {'start_date': '2024-11-20'})
+        FetchFailure.objects.update(next_retry_at=timezone.now())
+
+        with patch('apps.crypto.services.pyupbit.get_ohlcv', return_value=None):
+            result = retry_failed_candles_task()
+
+        failure = FetchFailure.objects.get()
+        assert result['resolved'] == 0
+        assert result['failed'] == 1
+        assert failure.status == 'pending'
+        assert failure.attempts == 1
+
+@pytest.mark.django_db
+def test_collect_crypto_candles_task_skips_same_day_rerun():
+    """같은 날 이미 성공한 수집은 force 없이 다시 실행하지 않음"""
+    config = CoinCollectionConfig.objects.create(name='테스트 설정', candle_type='days', period_days=7)
+    result = {config.id: {'success_count': 1, 'fail_count': 0, 'total': 1,
+                          'written_rows': 7, 'skipped_rows': 0, 'checksum': 'abc'}}
+
+    with patch('apps.crypto.tasks.collect_candles_for_configs', return_value=result) as mock_collect:
+        collect_crypto_candles_task()
+        assert collect_crypto_candles_task()['reason'] == 'already_ingested'
+        collect_crypto_candles_task(force=True)
+
+    assert mock_collect.call_count == 2
+    run = IngestionRun.objects.latest('started_at')
+    assert (run.pipeline, run.source, run.target_date) == ('crypto_candles', 'upbit', date.today())
+    assert (run.rows_written, run.checksum) == (7, combine_checksums(['abc']))
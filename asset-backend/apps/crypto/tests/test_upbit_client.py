@@ -0,0 +1,134 @@
+"""
+Upbit 비동기 캔들 클라이언트 테스트 (로컬 스텁 서버 사용)
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from apps.common.archive import archive_mode
+from apps.common.exceptions import CryptoDataFetchError
+from apps.crypto.models import Coin, CoinCandle
+from apps.crypto.services import collect_coin_candles
+from apps.crypto.tests.upbit_stub import candle_payload
+from apps.crypto.upbit_client import CandleRangePager, iter_candle_frames, parse_candles
+
+
+@pytest.mark.unit
+class TestParseCandles:
+    def test_matches_pyupbit_format(self):
+        payload = [
+            candle_payload("KRW-BTC", date(2024, 11, 27), 2000.0),
+            candle_payload("KRW-BTC", date(2024, 11, 26), 1000.0),
+        ]
+
+        df = parse_candles(payload)
+
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume', 'value']
+        assert list(df.index) == [datetime(2024, 11, 26, 9), datetime(2024, 11, 27, 9)]
+        assert df.iloc[0].to_dict() == {
+            'open': 1000.0, 'high': 1100.0, 'low': 900.0, 'close': 1050.0,
+            'volume': 10.5, 'value': 10000.0,
+        }
+
+    def test_empty_payload(self):
+        assert parse_candles([]).empty
+
+
+@pytest.mark.unit
+class TestCandleRangePager:
+    def test_plans_pages_backward_until_start(self):
+        pager = CandleRangePager("KRW-BTC", "days", date(2024, 1, 1), date(2024, 12, 31))
+        assert pager.request == (datetime(2025, 1, 1), 200)
+
+        # 12/31부터 거꾸로 200일 -> 다음 커서는 가장 이른 캔들(6/15 09:00 KST)의 UTC 시각
+        first = parse_candles([
+            candle_payload("KRW-BTC", date(2024, 12, 31) - timedelta(days=offset), 1000.0)
+            for offset in range(200)
+        ])
+        assert pager.add(first) == (datetime(2024, 6, 15), 166)
+
+        last = parse_candles([
+            candle_payload("KRW-BTC", date(2024, 6, 14) - timedelta(days=offset), 1000.0)
+            for offset in range(166)
+        ])
+        assert pager.add(last) is None
+        assert len(pager.frame()) == 366
+
+    def test_empty_page_ends_paging(self):
+        pager = CandleRangePager("KRW-BTC", "days", date(2024, 1, 1), date(2024, 12, 31))
+
+        assert pager.add(parse_candles([])) is None
+        assert pager.frame() is None
+
+    def test_error_page_raises(self):
+        pager = CandleRangePager("KRW-BTC", "days", date(2024, 1, 1), date(2024, 12, 31))
+
+        with pytest.raises(CryptoDataFetchError):
+            pager.add(None)
+
+@pytest.mark.django_db
+class TestIterCandleFrames:
+    def test_pages_each_market_concurrently(self, upbit_stub):
+        markets = ["KRW-BTC", "KRW-ETH", "KRW-XRP"]
+        for market in markets:
+            upbit_stub.add_days(market, date(2023, 1, 1), date(2024, 6, 30))
+
+        frames = dict(iter_candle_frames(markets, date(2023, 1, 1), date(2024, 3, 31)))
+
+        assert set(frames) == set(markets)
+        for df in frames.values():
+            assert len(df) == 456
+            assert df.index.min() == datetime(2023, 1, 1, 9)
+            assert df.index.max() == datetime(2024, 3, 31, 9)
+            assert df.index.is_monotonic_increasing
+        cursors = sorted(q["to"] for _, q in upbit_stub.requests if q["market"] == "KRW-BTC")
+        assert cursors == ["2023-02-26 00:00:00", "2023-09-14 00:00:00", "2024-04-01 00:00:00"]
+
+    @patch('apps.crypto.upbit_client.THROTTLED_BACKOFF', 0.01)
+    def test_retries_throttled_requests(self, upbit_stub):
+        upbit_stub.add_days("KRW-BTC", date(2024, 11, 1), date(2024, 11, 30))
+        upbit_stub.throttle = 2
+
+        frames = dict(iter_candle_frames(["KRW-BTC"], date(2024, 11, 1), date(2024, 11, 30)))
+
+        assert len(frames["KRW-BTC"]) == 30
+        assert len(upbit_stub.requests) == 3
+
+    def test_failed_market_is_reported_without_stopping_others(self, upbit_stub):
+        upbit_stub.add_days("KRW-BTC", date(2024, 11, 1), date(2024, 11, 30))
+        upbit_stub.failing.add("KRW-ETH")
+
+        frames = dict(iter_candle_frames(["KRW-BTC", "KRW-ETH"], date(2024, 11, 1), date(2024, 11, 30)))
+
+        assert len(frames["KRW-BTC"]) == 30
+        assert isinstance(frames["KRW-ETH"], Exception)
+
+    def test_replays_archived_pages(self, upbit_stub, settings, tmp_path):
+        """보관된 응답으로 스텁 호출 없이 재조회"""
+        settings.RAW_ARCHIVE_DIR = tmp_path
+        upbit_stub.add_days("KRW-BTC", date(2024, 11, 1), date(2024, 11, 30))
+
+        with archive_mode("record"):
+            recorded = dict(iter_candle_frames(["KRW-BTC"], date(2024, 11, 1), date(2024, 11, 30)))
+        upbit_stub.requests.clear()
+        with archive_mode("offline"):
+            replayed = dict(iter_candle_frames(["KRW-BTC"], date(2024, 11, 1), date(2024, 11, 30)))
+
+        assert upbit_stub.requests == []
+        assert replayed["KRW-BTC"].equals(recorded["KRW-BTC"])
+
+
+@pytest.mark.django_db
+class TestCollectCoinCandles:
+    def test_saves_all_coins_in_write_stage(self, upbit_stub, coin):
+        eth = Coin.objects.create(market_code="KRW-ETH", korean_name="이더리움", english_name="Ethereum")
+        upbit_stub.add_days("KRW-BTC", date(2024, 1, 1), date(2024, 12, 31))
+        upbit_stub.add_days("KRW-ETH", date(2024, 6, 1), date(2024, 12, 31))
+        stats = {}
+
+        results = collect_coin_candles([coin, eth], date(2024, 1, 1), date(2024, 12, 31), stats=stats)
+
+        assert results == {"KRW-BTC": 366, "KRW-ETH": 214}
+        assert stats['written'] == 580
+        assert CoinCandle.objects.filter(coin=eth).count() == 214
+        assert CoinCandle.objects.get(coin=coin, trade_date=date(2024, 1, 1)).open_price == 1000
@@ -0,0 +1,135 @@
+"""
+테스트용 Upbit REST 캔들 API 스텁 서버
+
+로컬 포트에서 /v1/candles/{days,weeks,months}를 Upbit와 같은 규칙으로 응답합니다.
+- to(UTC, 미포함) 이전 캔들 중 최신 count개를 최신순으로 반환
+- 일봉 캔들 시각: KST 09:00 (UTC 00:00)
+- 주봉/월봉: 등록된 일봉을 월요일/1일 KST 09:00 시작 주기로 집계
+"""
+import json
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def candle_payload(market: str, day: date, price: float) -> dict:
+    """일봉 캔들 한 개의 Upbit 응답 형식"""
+    utc = datetime.combine(day, datetime.min.time())
+    return {
+        "market": market,
+        "candle_date_time_utc": utc.strftime("%Y-%m-%dT%H:%M:%S"),
+        "candle_date_time_kst": (utc + timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%S"),
+        "opening_price": price,
+        "high_price": price + 100,
+        "low_price": price - 100,
+        "trade_price": price + 50,
+        "timestamp": int(utc.timestamp() * 1000),
+        "candle_acc_trade_price": price * 10,
+        "candle_acc_trade_volume": 10.5,
+    }
+
+
+def period_payload(market: str, start: date, days: list[dict]) -> dict:
+    """일봉 응답 목록(오름차순)을 주기 시작일 캔들 한 개로 집계"""
+    candle = dict(candle_payload(market, start, days[0]["opening_price"]))
+    candle.update({
+        "high_price": max(day["high_price"] for day in days),
+        "low_price": min(day["low_price"] for day in days),
+        "trade_price": days[-1]["trade_price"],
+        "candle_acc_trade_price": sum(day["candle_acc_trade_price"] for day in days),
+        "candle_acc_trade_volume": sum(day["candle_acc_trade_volume"] for day in days),
+    })
+    return candle
+
+
+def period_start(candle_type: str, day: date) -> date:
+    if candle_type == "weeks":
+        return day - timedelta(days=day.weekday())
+    if candle_type == "months":
+        return day.replace(day=1)
+    return day
+
+
+class UpbitStub:
+    """
+    스텁 서버
+
+    Attributes:
+        candles: 마켓 -> {거래일: 기준 가격}
+        requests: 받은 요청 (경로, 쿼리) 목록
+        throttle: 남은 429 응답 횟수
+        failing: 500으로 응답할 마켓
+    """
+
+    def __init__(self):
+        self.candles: dict[str, dict[date, float]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.throttle = 0
+        self.failing: set[str] = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def add_days(self, market: str, start: date, end: date, base_price: float = 1000.0):
+        """기간 일봉 추가 (가격은 날짜마다 1씩 증가)"""
+        days = self.candles.setdefault(market, {})
+        for offset in range((end - start).days + 1):
+            days[start + timedelta(days=offset)] = base_price + offset
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, path: str, query: dict) -> tuple[int, object]:
+        with self._lock:
+            self.requests.append((path, query))
+            if self.throttle > 0:
+                self.throttle -= 1
+                return 429, {"error": {"name": "too_many_requests"}}
+
+        market = query.get("market")
+        if not path.startswith("/v1/candles/"):
+            return 404, {"error": {"name": "not_found"}}
+        if market in self.failing:
+            return 500, {"error": {"name": "server_error"}}
+
+        count = int(query.get("count", 1))
+        candle_type = path.rsplit("/", 1)[-1]
+        periods: dict[date, list[dict]] = {}
+        for d, price in sorted(self.candles.get(market, {}).items()):
+            periods.setdefault(period_start(candle_type, d), []).append(candle_payload(market, d, price))
+        if "to" in query:
+            to = datetime.strptime(query["to"], "%Y-%m-%d %H:%M:%S")
+            periods = {d: c for d, c in periods.items() if datetime.combine(d, datetime.min.time()) < to}
+        selected = sorted(periods, reverse=True)[:count]
+        return 200, [period_payload(market, d, periods[d]) for d in selected]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                status, body = stub.respond(parsed.path, query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,311 @@
+"""
+Upbit 캔들 조회 클라이언트
+
+- 페이지 규칙: to(UTC, 미포함) 커서로 과거 방향으로 최대 200개씩 조회하고,
+  다음 커서는 받은 페이지의 가장 이른 캔들 시각(KST)을 UTC로 바꾼 값입니다.
+  동기/비동기 조회 모두 CandleRangePager로 같은 페이지 계획과 종료 조건을 사용합니다.
+- UpbitCandleClient: httpx.AsyncClient 하나로 연결을 재사용하며 여러 코인을 동시에 조회합니다.
+  동시 요청 수는 concurrency로, 호출 속도는 공유 토큰 버킷(upbit:candles)으로 제한합니다.
+- iter_candle_range_frames: 이벤트 루프를 별도 스레드에서 돌려 코인별 결과를 받는 순서대로 넘기므로,
+  호출한 스레드는 ORM으로 바로 저장할 수 있습니다. 코인마다 여러 조회 기간(누락 구간)을 받을 수 있습니다.
+
+원본 응답은 pyupbit.get_ohlcv와 같은 형식/키로 보관소에 저장되어 동기 수집과 재처리 보관본을 공유합니다.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterator
+
+import httpx
+import pandas as pd
+from django.conf import settings
+
+from apps.common.archive import load_archived, store_archived
+from apps.common.exceptions import CryptoDataFetchError
+from apps.common.rate_limit import acquire_async
+
+logger = logging.getLogger(__name__)
+
+# Upbit 시세 API 요청 그룹별 속도 제한 (settings.RATE_LIMITS)
+UPBIT_MARKET_RATE_LIMIT = "upbit:market"
+UPBIT_CANDLES_RATE_LIMIT = "upbit:candles"
+
+# Upbit 캔들 조회 1회 최대 개수와 코인당 최대 페이지 수 (일봉 기준 약 55년)
+UPBIT_MAX_CANDLES_PER_REQUEST = 200
+UPBIT_MAX_PAGES = 100
+# 캔들 인덱스(KST)를 to 커서(UTC)로 바꿀 때의 시차
+KST_OFFSET = timedelta(hours=9)
+
+CANDLE_ENDPOINTS = {
+    'days': 'candles/days',
+    'weeks': 'candles/weeks',
+    'months': 'candles/months',
+}
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'value']
+
+REQUEST_TIMEOUT = 10.0
+# 429(요청 한도 초과) 응답 시 재시도 횟수와 대기 시간 (초, 시도마다 증가)
+THROTTLED_RETRIES = 3
+THROTTLED_BACKOFF = 0.5
+
+
+def check_candle_type(candle_type: str):
+    """Upbit에서 조회할 수 있는 캔들 타입인지 확인 (분봉 등은 ValueError)"""
+    if candle_type not in CANDLE_ENDPOINTS:
+        raise ValueError(f"Unsupported candle type: {candle_type}")
+
+
+def first_cursor(end_date: date) -> datetime:
+    """종료일 캔들까지 포함하는 첫 페이지 커서 (다음 날 00:00 UTC)"""
+    return datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+
+def page_count(candle_type: str, cursor: datetime, start_date: date) -> int:
+    """커서 이전 페이지에 요청할 캔들 수 (일봉은 남은 일수만큼만 요청)"""
+    if candle_type == 'days':
+        return max(1, min(UPBIT_MAX_CANDLES_PER_REQUEST, (cursor.date() - start_date).days))
+    return UPBIT_MAX_CANDLES_PER_REQUEST
+
+
+def next_cursor(page: pd.DataFrame, count: int, start_date: date) -> datetime | None:
+    """다음(더 과거) 페이지 커서, 기간을 다 채웠으면 None"""
+    earliest = pd.Timestamp(page.index.min()).to_pydatetime()
+    if len(page) < count or earliest.date() <= start_date:
+        return None
+    return earliest - KST_OFFSET
+
+
+def trim_page(page: pd.DataFrame, start_date: date, end_date: date) -> pd.DataFrame:
+    """[start_date, end_date] 구간 캔들만 남김"""
+    dates = pd.to_datetime(page.index).date
+    return page[(dates >= start_date) & (dates <= end_date)]
+
+
+def merge_pages(pages: list[pd.DataFrame]) -> pd.DataFrame | None:
+    """최신순으로 받은 페이지 병합 (겹치는 캔들은 먼저 받은 값 사용, 시각 오름차순)"""
+    if not pages:
+        return None
+    df = pd.concat(pages)
+    return df[~df.index.duplicated(keep='first')].sort_index()
+
+
+class CandleRangePager:
+    """
+    기간 조회 페이지 계획 (동기 fetch_candle_range와 UpbitCandleClient.fetch_range 공용)
+
+    request로 다음 페이지의 (to 커서, 개수)를 얻고 받은 페이지를 add로 넘기면 다음 요청을 돌려줍니다.
+    기간을 다 채웠거나, 빈 페이지를 받았거나, UPBIT_MAX_PAGES에 도달하면 요청이 None이 됩니다.
+    """
+
+    def __init__(self, market: str, candle_type: str, start_date: date, end_date: date):
+        check_candle_type(candle_type)
+        self.market = market
+        self.candle_type = candle_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.cursor = first_cursor(end_date)
+        self.count = page_count(candle_type, self.cursor, start_date)
+        self.pages: list[pd.DataFrame] = []
+        self.fetched = 0
+
+    @property
+    def request(self) -> tuple[datetime, int] | None:
+        return None if self.cursor is None else (self.cursor, self.count)
+
+    def add(self, page: pd.DataFrame | None) -> tuple[datetime, int] | None:
+        """
+        받은 페이지를 반영하고 다음 요청 반환
+
+        Raises:
+            CryptoDataFetchError: 페이지가 None(pyupbit 조회 오류)인 경우
+        """
+        if page is None:
+            # pyupbit는 요청 오류(429 등)를 None으로 반환하므로 잘린 기간을 성공으로 보지 않음
+            raise CryptoDataFetchError(
+                f"No response for {self.market} {self.candle_type} candles before {self.cursor}"
+            )
+
+        self.fetched += 1
+        if page.empty:
+            self.cursor = None
+            return None
+
+        self.pages.append(page)
+        self.cursor = next_cursor(page, self.count, self.start_date)
+        if self.cursor is not None and self.fetched >= UPBIT_MAX_PAGES:
+            logger.warning(
+                f"Stopped paging {self.market} after {UPBIT_MAX_PAGES} pages "
+                f"before reaching {self.start_date}"
+            )
+            self.cursor = None
+        if self.cursor is not None:
+            self.count = page_count(self.candle_type, self.cursor, self.start_date)
+        return self.request
+
+    def frame(self) -> pd.DataFrame | None:
+        """받은 페이지를 [start_date, end_date] 구간으로 잘라 병합 (데이터가 없으면 None)"""
+        return merge_pages([trim_page(page, self.start_date, self.end_date) for page in self.pages])
+
+
+def page_archive_key(market: str, candle_type: str, to: datetime, count: int) -> tuple[date, dict]:
+    """페이지 보관 키 (pyupbit.get_ohlcv 호출 파라미터와 같음)"""
+    to_str = to.strftime('%Y-%m-%d %H:%M:%S')
+    day = (to - timedelta(seconds=1)).date()
+    return day, {"ticker": market, "interval": candle_type, "count": count, "to": to_str}
+
+
+def parse_candles(payload: list[dict]) -> pd.DataFrame:
+    """Upbit 캔들 응답을 pyupbit.get_ohlcv 형식으로 변환 (KST 시각 인덱스, 오름차순)"""
+    if not payload:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+
+    raw = pd.DataFrame(payload)
+    df = pd.DataFrame({
+        'open': raw['opening_price'].to_numpy(),
+        'high': raw['high_price'].to_numpy(),
+        'low': raw['low_price'].to_numpy(),
+        'close': raw['trade_price'].to_numpy(),
+        'volume': raw['candle_acc_trade_volume'].to_numpy(),
+        'value': raw['candle_acc_trade_price'].to_numpy(),
+    }, index=pd.DatetimeIndex(pd.to_datetime(raw['candle_date_time_kst'])).rename(None))
+    return df.sort_index()
+
+
+class UpbitCandleClient:
+    """
+    Upbit 캔들 비동기 조회 클라이언트
+
+    Args:
+        base_url: REST API 주소 (기본값 settings.UPBIT_API_URL)
+        concurrency: 동시에 보낼 최대 요청 수 (연결 풀 크기)
+        timeout: 요청 제한 시간 (초)
+        transport: httpx 전송 계층 (테스트용)
+    """
+
+    def __init__(self, base_url: str | None = None, concurrency: int | None = None,
+                 timeout: float = REQUEST_TIMEOUT, transport: httpx.AsyncBaseTransport | None = None):
+        concurrency = concurrency or settings.UPBIT_CONCURRENCY
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=(base_url or settings.UPBIT_API_URL).rstrip('/') + '/',
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            headers={'Accept': 'application/json'},
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    async def _get(self, path: str, params: dict) -> list[dict]:
+        for attempt in range(THROTTLED_RETRIES + 1):
+            await acquire_async(UPBIT_CANDLES_RATE_LIMIT)
+            async with self.semaphore:
+                response = await self.client.get(path, params=params)
+
+            if response.status_code == 429 and attempt < THROTTLED_RETRIES:
+                logger.warning(f"Upbit throttled {path} {params.get('market')}, retrying")
+                await asyncio.sleep(THROTTLED_BACKOFF * (attempt + 1))
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    async def fetch_page(self, market: str, candle_type: str, to: datetime, count: int) -> pd.DataFrame:
+        """to(UTC, 미포함) 이전 캔들 최대 count개 조회 (원본 응답 보관소 경유)"""
+        day, params = page_archive_key(market, candle_type, to, count)
+        path, archived = load_archived("upbit", "ohlcv", day, params)
+        if archived is not None:
+            return archived
+
+        payload = await self._get(
+            CANDLE_ENDPOINTS[candle_type],
+            {'market': market, 'count': count, 'to': params['to']},
+        )
+        df = parse_candles(payload)
+        store_archived(path, df)
+        return df
+
+    async def fetch_range(self, market: str, start_date: date, end_date: date,
+                          candle_type: str = 'days') -> pd.DataFrame | None:
+        """
+        기간 전체 캔들 조회 (페이지를 이어 받아 병합)
+
+        Returns:
+            DataFrame: 캔들 시각 오름차순, 데이터가 없으면 None
+        """
+        pager = CandleRangePager(market, candle_type, start_date, end_date)
+        request = pager.request
+        while request is not None:
+            request = pager.add(await self.fetch_page(market, candle_type, *request))
+        return pager.frame()
+
+    async def fetch_ranges(self, market: str, ranges: list[tuple[date, date]],
+                           candle_type: str = 'days') -> pd.DataFrame | None:
+        """여러 기간을 동시에 조회하여 한 DataFrame으로 병합"""
+        frames = await asyncio.gather(
+            *(self.fetch_range(market, start, end, candle_type) for start, end in ranges)
+        )
+        return merge_pages([frame for frame in frames if frame is not None])
+
+
+def iter_candle_frames(
+    markets: list[str],
+    start_date: date,
+    end_date: date,
+    candle_type: str = 'days',
+    concurrency: int | None = None,
+    **client_kwargs,
+) -> Iterator[tuple[str, pd.DataFrame | None | Exception]]:
+    """여러 코인의 같은 기간 캔들 조회 (iter_candle_range_frames 참고)"""
+    ranges = {market: [(start_date, end_date)] for market in markets}
+    return iter_candle_range_frames(ranges, candle_type, concurrency, **client_kwargs)
+
+
+def iter_candle_range_frames(
+    ranges: dict[str, list[tuple[date, date]]],
+    candle_type: str = 'days',
+    concurrency: int | None = None,
+    **client_kwargs,
+) -> Iterator[tuple[str, pd.DataFrame | None | Exception]]:
+    """
+    코인별 조회 기간 목록의 캔들을 동시에 조회하여 받는 순서대로 (마켓, 결과) 반환
+
+    이벤트 루프는 별도 스레드에서 실행되므로 조회가 진행되는 동안 호출한 스레드에서
+    받은 프레임을 저장할 수 있습니다. 조회에 실패한 코인은 결과 자리에 예외를 담습니다.
+    """
+    results: queue.Queue = queue.Queue()
+    finished = object()
+
+    async def collect():
+        async with UpbitCandleClient(concurrency=concurrency, **client_kwargs) as client:
+            async def fetch(market, market_ranges):
+                try:
+                    result = await client.fetch_ranges(market, market_ranges, candle_type)
+                except Exception as e:
+                    logger.error(f"Failed to fetch candles for {market}: {e}")
+                    result = e
+                results.put((market, result))
+
+            await asyncio.gather(*(fetch(market, r) for market, r in ranges.items()))
+
+    def run():
+        try:
+            asyncio.run(collect())
+        except Exception as e:
+            results.put((None, e))
+        finally:
+            results.put(finished)
+
+    thread = threading.Thread(target=run, name="upbit-candles", daemon=True)
+    thread.start()
+    while (item := results.get()) is not finished:
+        market, result = item
+        if market is None:
+            raise result
+        yield market, result
+    thread.join()
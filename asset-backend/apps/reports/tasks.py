@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 
 from .services import create_daily_report_for_user
 from apps.common.exceptions import ReportGenerationError
+from apps.stocks.trading_calendar import is_trading_day
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -21,8 +22,10 @@ def create_daily_reports_for_all_users(self, target_date_str: str | None = None)
     Args:
         target_date_str: 리포트 생성 날짜 (YYYY-MM-DD 형식), None이면 오늘 날짜
 
+    비거래일(주말/휴장일)에는 시세가 없으므로 리포트를 만들지 않습니다.
+
     Returns:
-        dict: 성공 여부, 성공 건수, 실패 건수
+        dict: 성공 여부, 성공 건수, 실패 건수 (비거래일이면 skipped=True)
 
     Raises:
         Retry: 전체 태스크 실패 시 재시도
@@ -33,6 +36,10 @@ def create_daily_reports_for_all_users(self, target_date_str: str | None = None)
         else:
             target_date = date.today()
 
+        if not is_trading_day(target_date):
+            logger.info(f"[Task] Skipping daily reports for {target_date}: not a trading day")
+            return {"success": True, "success_count": 0, "fail_count": 0, "skipped": True}
+
         logger.info(f"[Task] Starting daily reports generation for {target_date}")
 
         users = User.objects.filter(receive_daily_report=True)
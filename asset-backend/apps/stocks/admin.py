@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Stock, DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice
+from .models import Stock, DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice, BackfillCheckpoint, MarketHoliday
 
 
 @admin.register(Stock)
@@ -204,3 +204,20 @@ class YearlyPriceAdmin(admin.ModelAdmin):
             color, obj.change_rate
         )
     change_rate_colored.short_description = "등락률"
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("trade_date", "status", "rows", "duration", "updated_at")
+    list_filter = ("status",)
+    date_hierarchy = "trade_date"
+    readonly_fields = ("trade_date", "rows", "duration", "error", "updated_at")
+    ordering = ("-trade_date",)
+
+
+@admin.register(MarketHoliday)
+class MarketHolidayAdmin(admin.ModelAdmin):
+    list_display = ("date", "name")
+    search_fields = ("name",)
+    date_hierarchy = "date"
+    ordering = ("-date",)
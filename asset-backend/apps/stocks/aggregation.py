@@ -0,0 +1,399 @@
+"""
+주봉/월봉/연봉 캔들 집계 엔진
+
+모든 집계는 리샘플링 엔진(resampling.resample)을 사용합니다.
+- rollup_timeframes: 종목별 일봉을 trade_date 순서로 한 번만 읽으면서 여러 캔들
+  타입을 동시에 만들고, 청크마다 주봉/월봉/연봉 테이블을 한 트랜잭션으로 저장합니다.
+- rollup_candles: 한 캔들 타입만 집계하는 rollup_timeframes 호출입니다.
+
+저장 전에 종목별 캔들 시계열에 lag 패스(apply_period_change)를 적용하여
+직전 캔들 대비 등락/등락률을 계산하고 마지막 시가총액을 이어 채웁니다.
+"""
+import logging
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice
+from .resampling import forward_fill, resample, series_from_rows
+from apps.common.utils import bulk_upsert, chunked
+
+logger = logging.getLogger(__name__)
+
+CANDLE_MODELS = {
+    "weekly": WeeklyPrice,
+    "monthly": MonthlyPrice,
+    "yearly": YearlyPrice,
+}
+CANDLE_UPDATE_FIELDS = [
+    "open_price", "high_price", "low_price", "close_price", "volume", "amount",
+    "change", "change_rate", "market_cap",
+]
+CANDLE_FIELDS = ("trade_date", *CANDLE_UPDATE_FIELDS)
+CANDLE_BATCH_SIZE = 1000
+
+# 캔들 타입별 버킷 시작일 계산 규칙. 새 버킷 종류는 여기에 추가합니다.
+BUCKET_STARTS = {
+    "weekly": lambda d: d - timedelta(days=d.weekday()),
+    "monthly": lambda d: d.replace(day=1),
+    "quarterly": lambda d: d.replace(month=(d.month - 1) // 3 * 3 + 1, day=1),
+    "yearly": lambda d: d.replace(month=1, day=1),
+}
+BUCKET_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+
+def bucket_start(timeframe: str, d: date) -> date:
+    """날짜가 속한 버킷(주/월/분기/연)의 시작일"""
+    if timeframe not in BUCKET_STARTS:
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+    return BUCKET_STARTS[timeframe](d)
+
+
+def bucket_end(timeframe: str, d: date) -> date:
+    """날짜가 속한 버킷(주/월/분기/연)의 마지막 날"""
+    start = bucket_start(timeframe, d)
+    if timeframe == "weekly":
+        return start + timedelta(days=6)
+
+    months = start.month - 1 + BUCKET_MONTHS[timeframe]
+    next_start = start.replace(year=start.year + months // 12, month=months % 12 + 1)
+    return next_start - timedelta(days=1)
+
+
+def fetch_previous_candles(
+    model,
+    before: date,
+    stock_ids: list[int] | None = None,
+) -> dict[int, tuple]:
+    """
+    종목별로 기준일 이전의 마지막 저장 캔들 조회
+
+    Returns:
+        dict: 종목 ID -> (종가, 시가총액)
+    """
+    queryset = model.objects.filter(trade_date__lt=before)
+    if stock_ids is None:
+        queryset = queryset.filter(stock__is_active=True)
+    else:
+        queryset = queryset.filter(stock_id__in=stock_ids)
+
+    latest = queryset.annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=[F("stock_id")],
+            order_by=F("trade_date").desc(),
+        )
+    ).filter(row_number=1)
+    return {
+        stock_id: (close_price, market_cap)
+        for stock_id, close_price, market_cap
+        in latest.values_list("stock_id", "close_price", "market_cap")
+    }
+
+
+def _nullable_floats(values) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+
+def apply_period_change(candles: list[dict], previous: tuple | None = None) -> list[dict]:
+    """
+    한 종목의 캔들 시계열에 직전 캔들 대비 등락/등락률과 시가총액을 채움
+
+    종가 배열을 한 칸 밀어(lag) 직전 종가를 만들고, 시가총액은 마지막 값을
+    앞으로 이어 채웁니다(forward fill).
+
+    Args:
+        candles: trade_date 오름차순 캔들 dict 목록 (제자리에서 갱신)
+        previous: 시계열 직전 캔들의 (종가, 시가총액)
+
+    Returns:
+        list: 갱신된 캔들 목록
+    """
+    if not candles:
+        return candles
+
+    prev_close, prev_market_cap = previous or (None, None)
+
+    closes = _nullable_floats(c["close_price"] for c in candles)
+    lagged = np.concatenate(([np.nan if prev_close is None else float(prev_close)], closes[:-1]))
+    changes = np.round(closes - lagged, 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.round(np.where(lagged > 0, changes / lagged * 100, np.nan), 2)
+
+    market_caps = _nullable_floats(c["market_cap"] for c in candles)
+    if prev_market_cap is not None:
+        market_caps = np.concatenate(([float(prev_market_cap)], market_caps))
+    filled = forward_fill(market_caps)
+    if prev_market_cap is not None:
+        filled = filled[1:]
+
+    for candle, change, rate, market_cap in zip(candles, changes, rates, filled):
+        candle["change"] = None if np.isnan(change) else Decimal(f"{change:.2f}")
+        candle["change_rate"] = None if np.isnan(rate) else Decimal(f"{rate:.2f}")
+        candle["market_cap"] = None if np.isnan(market_cap) else int(market_cap)
+    return candles
+
+
+def _delete_stale_candles(model, timeframe: str, candles: list, start_date: date, end_date: date):
+    """
+    다시 집계한 버킷에 남아 있는 이전 캔들 삭제
+
+    버킷의 마지막 거래일이 바뀌면(예: 주 중간에 집계 후 거래일 추가) 이전 거래일로
+    저장된 캔들이 남으므로, 같은 버킷인데 trade_date가 다른 행을 정리합니다.
+    """
+    latest = {(c.stock_id, bucket_start(timeframe, c.trade_date)): c.trade_date for c in candles}
+    stock_ids = {c.stock_id for c in candles}
+
+    stale_ids = []
+    for stock_ids_chunk in chunked(sorted(stock_ids), CANDLE_BATCH_SIZE):
+        existing = model.objects.filter(
+            stock_id__in=stock_ids_chunk,
+            trade_date__range=(start_date, end_date),
+        ).values_list("id", "stock_id", "trade_date")
+        for candle_id, stock_id, trade_date in existing:
+            current = latest.get((stock_id, bucket_start(timeframe, trade_date)))
+            if current is not None and current != trade_date:
+                stale_ids.append(candle_id)
+
+    for ids_chunk in chunked(stale_ids, CANDLE_BATCH_SIZE):
+        model.objects.filter(id__in=ids_chunk).delete()
+
+    if stale_ids:
+        logger.info(f"Deleted {len(stale_ids)} stale {timeframe} candles")
+
+
+def rollup_candles(
+    timeframe: str,
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None = None,
+) -> dict[int, int]:
+    """
+    여러 종목의 한 캔들 타입 기간 캔들을 집계하여 저장 (rollup_timeframes 참고)
+
+    시작일은 버킷 시작일로 내림 정렬하여 첫 버킷도 온전한 캔들로 계산합니다.
+
+    Args:
+        timeframe: weekly, monthly, yearly
+        start_date: 집계 시작일
+        end_date: 집계 종료일
+        stock_ids: 집계 대상 종목 ID 목록 (None이면 모든 활성 종목)
+
+    Returns:
+        dict: 종목 ID -> 저장된 캔들 수
+    """
+    return rollup_timeframes(start_date, end_date, stock_ids, (timeframe,))[timeframe]
+
+
+DAILY_SERIES_FIELDS = (
+    "stock_id", "trade_date", "open_price", "high_price",
+    "low_price", "close_price", "volume", "amount", "market_cap",
+)
+STREAM_CHUNK_SIZE = 5000
+
+
+def iter_stock_candles(
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None = None,
+    timeframes: tuple[str, ...] = tuple(CANDLE_MODELS),
+):
+    """
+    종목별 일봉을 한 번만 읽어 여러 캔들 타입을 생성
+
+    (stock_id, trade_date) 순서로 일봉을 스트리밍하면서 종목 단위로 배열을 만들어
+    캔들 타입마다 리샘플링 엔진(resampling.resample)으로 집계합니다.
+
+    Yields:
+        tuple: (stock_id, {캔들 타입: [캔들 dict, ...]})
+    """
+    queryset = DailyPrice.objects.filter(trade_date__range=(start_date, end_date))
+    if stock_ids is None:
+        queryset = queryset.filter(stock__is_active=True)
+    else:
+        queryset = queryset.filter(stock_id__in=stock_ids)
+
+    rows = (
+        queryset.order_by("stock_id", "trade_date")
+        .values_list(*DAILY_SERIES_FIELDS)
+        .iterator(chunk_size=STREAM_CHUNK_SIZE)
+    )
+    for stock_id, stock_rows in groupby(rows, key=itemgetter(0)):
+        series = series_from_rows([row[1:] for row in stock_rows])
+        candles = {}
+        for timeframe in timeframes:
+            candles[timeframe] = resample(series, timeframe).to_records()
+            for candle in candles[timeframe]:
+                candle["bucket"] = bucket_start(timeframe, candle["trade_date"])
+        yield stock_id, candles
+
+
+def _write_candle_chunk(pending: dict[str, list], starts: dict[str, date], end_date: date):
+    """청크 단위로 주봉/월봉/연봉 테이블을 한 트랜잭션으로 저장 (starts: 캔들 타입별 시작일)"""
+    try:
+        with transaction.atomic():
+            for timeframe, candles in pending.items():
+                CANDLE_MODELS[timeframe].objects.bulk_create(
+                    candles,
+                    update_conflicts=True,
+                    unique_fields=["stock", "trade_date"],
+                    update_fields=CANDLE_UPDATE_FIELDS,
+                )
+    except Exception as e:
+        logger.warning(f"Candle chunk write failed, retrying row by row: {e}")
+        for timeframe, candles in pending.items():
+            bulk_upsert(
+                CANDLE_MODELS[timeframe],
+                candles,
+                unique_fields=["stock", "trade_date"],
+                update_fields=CANDLE_UPDATE_FIELDS,
+                batch_size=1,
+                describe=lambda c: f"candle for stock_id={c.stock_id} on {c.trade_date}",
+            )
+
+    for timeframe, candles in pending.items():
+        _delete_stale_candles(
+            CANDLE_MODELS[timeframe], timeframe, candles, starts[timeframe], end_date
+        )
+
+
+def rollup_timeframes(
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None = None,
+    timeframes: tuple[str, ...] = tuple(CANDLE_MODELS),
+    buckets: dict[str, set[date]] | None = None,
+) -> dict[str, dict[int, int]]:
+    """
+    일봉을 한 번만 읽어 여러 캔들 타입을 함께 집계하여 저장
+
+    캔들 타입마다 시작일을 해당 버킷의 시작일로 내림 정렬하여 모든 캔들을 온전히 계산하고,
+    일봉은 그중 가장 이른 날부터 한 번만 읽습니다. 다른 캔들 타입 때문에 더 일찍 읽은 일봉으로
+    만든 앞쪽 버킷(예: 1월 초 재집계 시 주봉 때문에 읽은 12월 말 일봉의 월봉)은 저장하지 않습니다.
+
+    Args:
+        start_date: 집계 시작일
+        end_date: 집계 종료일
+        stock_ids: 집계 대상 종목 ID 목록 (None이면 모든 활성 종목)
+        timeframes: 저장할 캔들 타입 (CANDLE_MODELS에 정의된 타입)
+        buckets: 캔들 타입별로 저장할 버킷 시작일 (None이면 전체)
+
+    Returns:
+        dict: 캔들 타입 -> {종목 ID: 저장된 캔들 수}
+    """
+    unknown = set(timeframes) - set(CANDLE_MODELS)
+    if unknown:
+        raise ValueError(f"No candle table for timeframes: {sorted(unknown)}")
+
+    if stock_ids is not None and not stock_ids:
+        return {timeframe: {} for timeframe in timeframes}
+
+    counts = {timeframe: Counter() for timeframe in timeframes}
+    starts = {timeframe: bucket_start(timeframe, start_date) for timeframe in timeframes}
+    start_date = min(starts.values())
+    previous = {
+        timeframe: fetch_previous_candles(CANDLE_MODELS[timeframe], starts[timeframe], stock_ids)
+        for timeframe in timeframes
+    }
+
+    pending = {timeframe: [] for timeframe in timeframes}
+    pending_count = 0
+
+    for stock_id, candles_by_timeframe in iter_stock_candles(
+        start_date, end_date, stock_ids, timeframes
+    ):
+        for timeframe, candles in candles_by_timeframe.items():
+            model = CANDLE_MODELS[timeframe]
+            selected = buckets.get(timeframe) if buckets is not None else None
+            candles = [c for c in candles if c["bucket"] >= starts[timeframe]]
+            apply_period_change(candles, previous[timeframe].get(stock_id))
+            for candle in candles:
+                if selected is not None and candle["bucket"] not in selected:
+                    continue
+                fields = {field: candle[field] for field in CANDLE_FIELDS}
+                pending[timeframe].append(model(stock_id=stock_id, **fields))
+                counts[timeframe][stock_id] += 1
+                pending_count += 1
+
+        if pending_count >= CANDLE_BATCH_SIZE:
+            _write_candle_chunk(pending, starts, end_date)
+            pending = {timeframe: [] for timeframe in timeframes}
+            pending_count = 0
+
+    if pending_count:
+        _write_candle_chunk(pending, starts, end_date)
+
+    logger.info(
+        f"Rolled up {', '.join(f'{tf}={sum(c.values())}' for tf, c in counts.items())} "
+        f"candles from {start_date} to {end_date}"
+    )
+    return {timeframe: dict(counter) for timeframe, counter in counts.items()}
+
+
+def rollup_buckets_for_dates(
+    trade_dates: list[date],
+    stock_ids: list[int] | None = None,
+    timeframes: tuple[str, ...] = tuple(CANDLE_MODELS),
+) -> dict[str, int]:
+    """
+    지정한 거래일이 속한 버킷만 다시 집계 (증분 집계)
+
+    각 버킷은 시작일부터 마지막 날까지 온전히 다시 계산하므로 결과는 전체 재집계와
+    동일합니다. 겹치는 버킷 범위는 묶어서 일봉을 한 번만 읽습니다.
+
+    Args:
+        trade_dates: 새로 적재된 거래일 목록
+        stock_ids: 다시 집계할 종목 ID 목록 (None이면 해당 거래일에 일봉이 있는 종목)
+        timeframes: 집계할 캔들 타입
+
+    Returns:
+        dict: 캔들 타입 -> 저장된 캔들 수
+    """
+    results = {timeframe: 0 for timeframe in timeframes}
+    if not trade_dates:
+        return results
+
+    if stock_ids is None:
+        stock_ids = list(
+            DailyPrice.objects.filter(trade_date__in=trade_dates)
+            .values_list("stock_id", flat=True)
+            .distinct()
+        )
+
+    buckets = {
+        timeframe: {bucket_start(timeframe, d) for d in trade_dates}
+        for timeframe in timeframes
+    }
+
+    # 거래일마다 모든 버킷을 포함하는 범위를 만들고, 겹치는 범위는 합친다
+    spans = sorted(
+        (
+            min(bucket_start(timeframe, d) for timeframe in timeframes),
+            max(bucket_end(timeframe, d) for timeframe in timeframes),
+        )
+        for d in set(trade_dates)
+    )
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    for start, end in merged:
+        counts = rollup_timeframes(start, end, stock_ids, timeframes, buckets)
+        for timeframe, per_stock in counts.items():
+            results[timeframe] += sum(per_stock.values())
+
+    logger.info(
+        f"Refreshed candle buckets for {len(trade_dates)} dates and {len(stock_ids)} stocks: "
+        + ", ".join(f"{timeframe}={count}" for timeframe, count in results.items())
+    )
+    return results
@@ -0,0 +1,203 @@
+"""
+KRX 일봉 과거 데이터 백필
+
+기간을 거래일 단위 작업으로 나눠 제한된 병렬도로 sync_daily_prices_from_krx를 실행합니다.
+거래일마다 BackfillCheckpoint를 기록하므로 중단된 백필은 완료되지 않은 날짜부터 이어서 진행합니다.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Callable
+
+from django.db import close_old_connections
+
+from .models import BackfillCheckpoint, MarketHoliday
+from .services import check_krx_business_day, sync_daily_prices_from_krx
+from .trading_calendar import get_trading_calendar, invalidate_trading_calendar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_WORKERS = 4
+# pykrx는 조회 오류도 빈 DataFrame으로 반환하므로 거래일의 0행은 일시 장애로 보고 재시도
+EMPTY_TRADING_DAY_ERROR = "no rows returned for a trading day"
+# KRX 영업일 여부를 확인하지 못한 0행 날짜를 데이터 없음으로 완료 처리하기까지의 시도 횟수
+MAX_EMPTY_DAY_ATTEMPTS = 3
+
+
+def backfill_dates(start_date: date, end_date: date) -> list[date]:
+    """백필 대상 날짜 (거래일 캘린더상 주말/휴장일 제외)"""
+    return get_trading_calendar().trading_days_between(start_date, end_date)
+
+
+def pending_backfill_dates(dates: list[date], force: bool = False) -> list[date]:
+    """
+    아직 완료되지 않은 날짜만 반환
+
+    Args:
+        force: True면 체크포인트와 무관하게 모든 날짜 반환
+    """
+    if force or not dates:
+        return list(dates)
+
+    completed = set(
+        BackfillCheckpoint.objects.filter(
+            trade_date__in=dates,
+            status__in=BackfillCheckpoint.COMPLETE_STATUSES,
+        ).values_list("trade_date", flat=True)
+    )
+    return [d for d in dates if d not in completed]
+
+
+def classify_empty_day(trade_date: date, attempts: int) -> tuple[str, str]:
+    """
+    0행을 받은 날짜의 체크포인트 상태와 오류 메시지 결정
+
+    휴장일 테이블이 비어 있으면 평일 공휴일도 거래일로 보이므로 KRX 지수 일봉으로 한 번 더 확인합니다.
+    - 캘린더 또는 KRX가 휴장일로 확인: "empty" (KRX로 확인한 날짜는 MarketHoliday에 기록)
+    - 확인하지 못했거나 영업일인데 0행: "failed"로 재시도하되 MAX_EMPTY_DAY_ATTEMPTS번째 시도부터 "empty"
+    """
+    if not get_trading_calendar().is_trading_day(trade_date):
+        return "empty", ""
+
+    if check_krx_business_day(trade_date) is False:
+        logger.info(f"KRX was closed on {trade_date}, recording it as a market holiday")
+        MarketHoliday.objects.get_or_create(
+            date=trade_date, defaults={"name": "KRX 휴장 (백필 확인)"}
+        )
+        invalidate_trading_calendar()
+        return "empty", ""
+
+    if attempts >= MAX_EMPTY_DAY_ATTEMPTS:
+        logger.warning(
+            f"Backfill got no rows for {trade_date} after {attempts} attempts, marking it empty"
+        )
+        return "empty", f"{EMPTY_TRADING_DAY_ERROR} after {attempts} attempts"
+
+    logger.warning(f"Backfill got no rows for trading day {trade_date}, will retry")
+    return "failed", EMPTY_TRADING_DAY_ERROR
+
+
+def backfill_date(trade_date: date) -> dict:
+    """
+    한 거래일 일봉 적재 및 체크포인트 기록
+
+    Returns:
+        dict: 날짜, 상태, 저장 행 수, 소요 시간, 오류 메시지
+    """
+    started = time.monotonic()
+    checkpoint, _ = BackfillCheckpoint.objects.update_or_create(
+        trade_date=trade_date,
+        defaults={"status": "running", "rows": 0, "error": ""},
+    )
+    attempts = checkpoint.attempts + 1
+
+    try:
+        rows = sync_daily_prices_from_krx(trade_date)
+        if rows:
+            status, error = "done", ""
+        else:
+            status, error = classify_empty_day(trade_date, attempts)
+    except Exception as e:
+        logger.error(f"Backfill failed for {trade_date}: {e}")
+        rows, status, error = 0, "failed", str(e)
+
+    duration = time.monotonic() - started
+    BackfillCheckpoint.objects.filter(trade_date=trade_date).update(
+        status=status, rows=rows, duration=duration, error=error, attempts=attempts,
+    )
+    return {
+        "date": trade_date,
+        "status": status,
+        "rows": rows,
+        "duration": duration,
+        "error": error,
+    }
+
+
+def _backfill_in_thread(trade_date: date) -> dict:
+    # 스레드마다 별도 DB 커넥션을 쓰므로 작업 전후로 정리
+    close_old_connections()
+    try:
+        return backfill_date(trade_date)
+    finally:
+        close_old_connections()
+
+
+def run_backfill(
+    start_date: date,
+    end_date: date,
+    workers: int = DEFAULT_BACKFILL_WORKERS,
+    force: bool = False,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    기간 일봉 백필 실행
+
+    Args:
+        start_date: 시작일
+        end_date: 종료일
+        workers: 동시에 처리할 날짜 수 (1이면 현재 스레드에서 순차 실행)
+        force: 완료된 날짜도 다시 적재
+        progress: 날짜별 결과를 받는 콜백 (진행 상황 출력용)
+
+    Returns:
+        dict: 대상/건너뜀/완료/실패 날짜 수, 총 행 수, 소요 시간, 초당 행 수, 적재된 날짜, 실패한 날짜
+    """
+    dates = backfill_dates(start_date, end_date)
+    pending = pending_backfill_dates(dates, force)
+    logger.info(
+        f"Starting backfill from {start_date} to {end_date}: "
+        f"{len(pending)} dates pending, {len(dates) - len(pending)} skipped"
+    )
+
+    started = time.monotonic()
+    results = []
+
+    def record(result: dict):
+        results.append(result)
+        elapsed = time.monotonic() - started
+        total_rows = sum(r["rows"] for r in results)
+        result = {
+            **result,
+            "done": len(results),
+            "total": len(pending),
+            "rows_per_sec": total_rows / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"[{result['done']}/{result['total']}] {result['date']}: {result['status']}, "
+            f"{result['rows']} rows ({result['rows_per_sec']:.0f} rows/sec)"
+        )
+        if progress:
+            progress(result)
+
+    if workers <= 1:
+        for trade_date in pending:
+            record(backfill_date(trade_date))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_backfill_in_thread, d) for d in pending]
+            for future in as_completed(futures):
+                record(future.result())
+
+    elapsed = time.monotonic() - started
+    total_rows = sum(r["rows"] for r in results)
+    loaded = sorted(r["date"] for r in results if r["status"] == "done")
+    failed = sorted(r["date"] for r in results if r["status"] == "failed")
+
+    summary = {
+        "dates": len(dates),
+        "skipped": len(dates) - len(pending),
+        "completed": len(results) - len(failed),
+        "failed": len(failed),
+        "rows": total_rows,
+        "elapsed": elapsed,
+        "rows_per_sec": total_rows / elapsed if elapsed > 0 else 0.0,
+        "loaded_dates": loaded,
+        "failed_dates": failed,
+    }
+    logger.info(
+        f"Backfill finished: {summary['completed']} completed, {summary['failed']} failed, "
+        f"{total_rows} rows in {elapsed:.1f}s ({summary['rows_per_sec']:.0f} rows/sec)"
+    )
+    return summary
@@ -0,0 +1,87 @@
+from contextlib import nullcontext
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.archive import archive_mode
+from apps.stocks.backfill import DEFAULT_BACKFILL_WORKERS, run_backfill
+from apps.stocks.services import update_candles_for_dates
+
+
+class Command(BaseCommand):
+    help = "Backfill KRX daily prices over a date range (resumable)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=str,
+            required=True,
+            help="Start date in YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--end",
+            type=str,
+            help="End date in YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_BACKFILL_WORKERS,
+            help=f"Number of dates loaded in parallel (default: {DEFAULT_BACKFILL_WORKERS})",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Reload dates that already have a completed checkpoint",
+        )
+        parser.add_argument(
+            "--skip-candles",
+            action="store_true",
+            help="Skip weekly/monthly/yearly candle update after the backfill",
+        )
+        parser.add_argument(
+            "--from-archive",
+            action="store_true",
+            help="Reload from the raw payload archive only (no network calls)",
+        )
+
+    def handle(self, *args, **options):
+        start_date = date.fromisoformat(options["start"])
+        end_date = date.fromisoformat(options["end"]) if options["end"] else date.today()
+        if start_date > end_date:
+            raise CommandError("--start must be on or before --end")
+
+        self.stdout.write(self.style.NOTICE(f"Backfill range: {start_date} ~ {end_date}"))
+
+        def report(result):
+            style = self.style.ERROR if result["status"] == "failed" else self.style.SUCCESS
+            self.stdout.write(style(
+                f"[{result['done']}/{result['total']}] {result['date']}: "
+                f"{result['status']} {result['rows']} rows "
+                f"({result['rows_per_sec']:.0f} rows/sec)"
+            ))
+
+        with archive_mode("offline") if options["from_archive"] else nullcontext():
+            summary = run_backfill(
+                start_date,
+                end_date,
+                workers=options["workers"],
+                force=options["force"],
+                progress=report,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfill finished: {summary['completed']} completed, "
+            f"{summary['skipped']} skipped, {summary['failed']} failed, "
+            f"{summary['rows']} rows in {summary['elapsed']:.1f}s "
+            f"({summary['rows_per_sec']:.0f} rows/sec)"
+        ))
+
+        if summary["loaded_dates"] and not options["skip_candles"]:
+            self.stdout.write("Updating weekly/monthly/yearly candles...")
+            counts = update_candles_for_dates(summary["loaded_dates"])
+            self.stdout.write(self.style.SUCCESS(f"Candles updated: {counts}"))
+
+        if summary["failed"]:
+            raise CommandError(
+                f"{summary['failed']} dates failed; rerun the same command to retry them"
+            )
@@ -0,0 +1,48 @@
+import csv
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.utils import bulk_upsert
+from apps.stocks.models import MarketHoliday
+from apps.stocks.trading_calendar import invalidate_trading_calendar
+
+
+class Command(BaseCommand):
+    help = "Seed KRX market holidays used by the trading calendar"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "holidays",
+            nargs="*",
+            help="Holidays as YYYY-MM-DD or YYYY-MM-DD:name",
+        )
+        parser.add_argument(
+            "--file",
+            type=str,
+            help="CSV file with date,name rows",
+        )
+
+    def handle(self, *args, **options):
+        entries = [tuple(value.split(":", 1)) for value in options["holidays"]]
+
+        if options["file"]:
+            with open(options["file"], newline="", encoding="utf-8") as f:
+                entries.extend(tuple(row[:2]) for row in csv.reader(f) if row and not row[0].startswith("#"))
+
+        if not entries:
+            raise CommandError("No holidays given; pass dates or --file")
+
+        try:
+            holidays = [
+                MarketHoliday(
+                    date=date.fromisoformat(entry[0].strip()),
+                    name=entry[1].strip() if len(entry) > 1 else "",
+                )
+                for entry in entries
+            ]
+        except ValueError as e:
+            raise CommandError(f"Invalid holiday date: {e}")
+
+        count = bulk_upsert(MarketHoliday, holidays, unique_fields=["date"], update_fields=["name"])
+        invalidate_trading_calendar()
+        self.stdout.write(self.style.SUCCESS(f"Market holidays seeded: {count} items"))
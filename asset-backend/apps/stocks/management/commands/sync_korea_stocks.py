@@ -1,6 +1,8 @@
+from contextlib import nullcontext
 from datetime import date
 from django.core.management.base import BaseCommand
 
+from apps.common.archive import archive_mode
 from apps.stocks.services import (
     sync_stock_master_from_krx,
     sync_daily_prices_from_krx,
@@ -21,8 +23,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Skip stock master sync",
         )
+        parser.add_argument(
+            "--from-archive",
+            action="store_true",
+            help="Load from the raw payload archive only (no network calls)",
+        )
 
     def handle(self, *args, **options):
+        with archive_mode("offline") if options["from_archive"] else nullcontext():
+            self.sync(options)
+
+    def sync(self, options):
         if options["date"]:
             target_date = date.fromisoformat(options["date"])
         else:
@@ -30,10 +41,14 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.NOTICE(f"Target date: {target_date}"))
 
-        if not options["skip-master"]:
+        if not options["skip_master"]:
             self.stdout.write("Syncing stock master...")
-            cnt = sync_stock_master_from_krx(target_date)
-            self.stdout.write(self.style.SUCCESS(f"Stock master synced: {cnt} items"))
+            result = sync_stock_master_from_krx(target_date)
+            self.stdout.write(self.style.SUCCESS(
+                f"Stock master synced: {result['total']} items "
+                f"({result['inserted']} inserted, {result['updated']} updated, "
+                f"{result['delisted']} delisted)"
+            ))
 
         self.stdout.write("Syncing daily prices...")
         cnt = sync_daily_prices_from_krx(target_date)
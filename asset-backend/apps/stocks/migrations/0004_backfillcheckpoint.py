@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0003_monthlyprice_weeklyprice_yearlyprice_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trade_date', models.DateField(unique=True, verbose_name='거래일')),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('done', '완료'), ('empty', '데이터 없음'), ('failed', '실패')], default='running', max_length=20, verbose_name='상태')),
+                ('rows', models.IntegerField(default=0, verbose_name='저장 행 수')),
+                ('duration', models.FloatField(default=0, verbose_name='소요 시간(초)')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류 메시지')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '백필 체크포인트',
+                'verbose_name_plural': '백필 체크포인트 목록',
+                'ordering': ['-trade_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0004_backfillcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='휴장일')),
+                ('name', models.CharField(blank=True, default='', max_length=100, verbose_name='휴장 사유')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+            ],
+            options={
+                'verbose_name': '휴장일',
+                'verbose_name_plural': '휴장일 목록',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0005_marketholiday'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backfillcheckpoint',
+            name='attempts',
+            field=models.IntegerField(default=0, verbose_name='시도 횟수'),
+        ),
+    ]
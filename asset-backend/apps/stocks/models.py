@@ -126,3 +126,46 @@ class YearlyPrice(models.Model):
 
     def __str__(self):
         return f"{self.stock.code} - {self.trade_date} (연봉)"
+
+
+class BackfillCheckpoint(models.Model):
+    """일봉 과거 데이터 백필 거래일별 진행 상태"""
+    STATUS_CHOICES = [
+        ("running", "진행 중"),
+        ("done", "완료"),
+        ("empty", "데이터 없음"),
+        ("failed", "실패"),
+    ]
+    # 다시 실행할 필요가 없는 상태
+    COMPLETE_STATUSES = ("done", "empty")
+
+    trade_date = models.DateField("거래일", unique=True)
+    status = models.CharField("상태", max_length=20, choices=STATUS_CHOICES, default="running")
+    rows = models.IntegerField("저장 행 수", default=0)
+    duration = models.FloatField("소요 시간(초)", default=0)
+    error = models.TextField("오류 메시지", blank=True, default="")
+    attempts = models.IntegerField("시도 횟수", default=0)
+    updated_at = models.DateTimeField("수정일시", auto_now=True)
+
+    class Meta:
+        verbose_name = "백필 체크포인트"
+        verbose_name_plural = "백필 체크포인트 목록"
+        ordering = ["-trade_date"]
+
+    def __str__(self):
+        return f"{self.trade_date} ({self.get_status_display()})"
+
+
+class MarketHoliday(models.Model):
+    """KRX 휴장일 (주말 외 공휴일/임시 휴장일)"""
+    date = models.DateField("휴장일", unique=True)
+    name = models.CharField("휴장 사유", max_length=100, blank=True, default="")
+    created_at = models.DateTimeField("생성일시", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "휴장일"
+        verbose_name_plural = "휴장일 목록"
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.date} {self.name}".strip()
@@ -0,0 +1,191 @@
+"""
+일봉 OHLCV 리샘플링 엔진
+
+한 종목의 일봉을 NumPy 배열로 받아 임의 간격의 캔들을 만듭니다.
+버킷 경계는 벡터 연산으로 구하고, 고가/저가/거래량은 np.*.reduceat 으로 집계합니다.
+
+지원 간격:
+- "5D": N 거래일
+- "W", "2W": N 주 (월요일 시작)
+- "M", "Q", "Y", "6M": N 개월 / 분기 / N 년
+- anchors: 사용자 지정 경계일 목록 (각 경계일부터 새 버킷 시작)
+"""
+import re
+from decimal import Decimal
+from typing import NamedTuple
+
+import numpy as np
+
+# 캔들 타입 이름 -> 간격 표기
+NAMED_INTERVALS = {
+    "daily": "D",
+    "weekly": "W",
+    "monthly": "M",
+    "quarterly": "Q",
+    "yearly": "Y",
+}
+INTERVAL_PATTERN = re.compile(r"^(\d*)([DWMQY])$")
+# 1970-01-01(epoch)은 목요일이므로 3일을 더하면 월요일 기준 주 번호가 된다
+EPOCH_WEEKDAY_OFFSET = 3
+
+
+class DailySeries(NamedTuple):
+    """trade_date 오름차순 일봉 배열"""
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    amount: np.ndarray
+    market_cap: np.ndarray
+
+
+def _nullable(values, dtype=float, fill=np.nan) -> np.ndarray:
+    return np.array([fill if v is None else v for v in values], dtype=dtype)
+
+
+def series_from_rows(rows) -> DailySeries:
+    """
+    (trade_date, 시가, 고가, 저가, 종가, 거래량, 거래대금, 시가총액) 행 목록을 배열로 변환
+
+    거래대금의 NULL은 0으로, 시가총액의 NULL은 NaN으로 채웁니다.
+    """
+    columns = list(zip(*rows)) if rows else [()] * 8
+    trade_dates, opens, highs, lows, closes, volumes, amounts, market_caps = columns
+    return DailySeries(
+        dates=np.array(trade_dates, dtype="datetime64[D]"),
+        open=np.array(opens, dtype=float),
+        high=np.array(highs, dtype=float),
+        low=np.array(lows, dtype=float),
+        close=np.array(closes, dtype=float),
+        volume=np.array(volumes, dtype=np.int64),
+        amount=_nullable(amounts, dtype=np.int64, fill=0),
+        market_cap=_nullable(market_caps),
+    )
+
+
+def parse_interval(interval: str | None) -> tuple[int, str]:
+    """
+    간격 표기를 (크기, 단위)로 변환
+
+    Raises:
+        ValueError: 지원하지 않는 간격 표기
+    """
+    interval = NAMED_INTERVALS.get(interval, interval)
+    match = INTERVAL_PATTERN.match((interval or "").upper())
+    if not match:
+        raise ValueError(f"Invalid interval: {interval}")
+
+    size = int(match.group(1) or 1)
+    if size < 1:
+        raise ValueError(f"Invalid interval: {interval}")
+    return size, match.group(2)
+
+
+def bucket_ids(dates: np.ndarray, interval: str | None = None, anchors=None) -> np.ndarray:
+    """
+    각 일봉이 속한 버킷 번호 (dates가 정렬되어 있으면 단조 증가)
+
+    Args:
+        dates: datetime64[D] 배열
+        interval: 간격 표기 또는 캔들 타입 이름 (weekly, monthly, ...)
+        anchors: 사용자 지정 경계일 목록 (interval 대신 사용)
+    """
+    if anchors is not None:
+        anchor_days = np.sort(np.array(anchors, dtype="datetime64[D]"))
+        return np.searchsorted(anchor_days, dates, side="right")
+
+    size, unit = parse_interval(interval)
+
+    if unit == "D":
+        return np.arange(len(dates)) // size
+    if unit == "W":
+        return (dates.astype(np.int64) + EPOCH_WEEKDAY_OFFSET) // 7 // size
+    if unit == "Y":
+        return dates.astype("datetime64[Y]").astype(np.int64) // size
+
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    return months // (size * 3 if unit == "Q" else size)
+
+
+class Candles(NamedTuple):
+    """리샘플링 결과 배열 (버킷당 한 원소)"""
+    dates: np.ndarray
+    first_dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    amount: np.ndarray
+    market_cap: np.ndarray
+
+    def to_records(self) -> list[dict]:
+        """DB 필드 기준 캔들 dict 목록 (Decimal 가격, NULL 거래대금/시가총액 포함)"""
+        return [
+            {
+                "trade_date": last.item(),
+                "first_date": first.item(),
+                "open_price": Decimal(f"{o:.2f}"),
+                "high_price": Decimal(f"{h:.2f}"),
+                "low_price": Decimal(f"{lo:.2f}"),
+                "close_price": Decimal(f"{c:.2f}"),
+                "volume": int(v),
+                "amount": int(a) or None,
+                "market_cap": None if np.isnan(mc) else int(mc),
+            }
+            for last, first, o, h, lo, c, v, a, mc in zip(
+                self.dates, self.first_dates, self.open, self.high, self.low,
+                self.close, self.volume, self.amount, self.market_cap,
+            )
+        ]
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """NaN을 직전 유효값으로 채움 (앞쪽 NaN은 유지)"""
+    positions = np.where(np.isnan(values), -1, np.arange(len(values)))
+    positions = np.maximum.accumulate(positions)
+    return np.where(positions >= 0, values[np.maximum(positions, 0)], np.nan)
+
+
+def resample(series: DailySeries, interval: str | None = None, anchors=None) -> Candles:
+    """
+    일봉 배열을 지정 간격의 캔들로 집계
+
+    시가는 버킷 첫 거래일, 종가는 마지막 거래일 값이며, 고가/저가/거래량/거래대금은
+    reduceat 으로 집계합니다. 시가총액은 버킷 내 마지막 값(없으면 이전 값)입니다.
+    """
+    size = len(series.dates)
+    if size == 0:
+        empty = np.array([], dtype=float)
+        return Candles(
+            dates=np.array([], dtype="datetime64[D]"),
+            first_dates=np.array([], dtype="datetime64[D]"),
+            open=empty, high=empty, low=empty, close=empty,
+            volume=np.array([], dtype=np.int64),
+            amount=np.array([], dtype=np.int64),
+            market_cap=empty,
+        )
+
+    ids = bucket_ids(series.dates, interval, anchors)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+    ends = np.concatenate((starts[1:], [size])) - 1
+
+    return Candles(
+        dates=series.dates[ends],
+        first_dates=series.dates[starts],
+        open=series.open[starts],
+        high=np.maximum.reduceat(series.high, starts),
+        low=np.minimum.reduceat(series.low, starts),
+        close=series.close[ends],
+        volume=np.add.reduceat(series.volume, starts),
+        amount=np.add.reduceat(series.amount, starts),
+        market_cap=forward_fill(series.market_cap)[ends],
+    )
+
+
+def resample_rows(rows, interval: str | None = None, anchors=None) -> list[dict]:
+    """일봉 행 목록을 리샘플링하여 캔들 dict 목록으로 반환"""
+    return resample(series_from_rows(rows), interval, anchors).to_records()
+
@@ -1,12 +1,34 @@
 import logging
-from datetime import date
-from django.db import transaction
-from django.db.models import Min, Max, Sum, Q, F
-from django.db.models.functions import TruncWeek, TruncMonth, TruncYear
+import time
+from datetime import date, timedelta
+from decimal import Decimal
 
-from .models import Stock, DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+
+from .aggregation import (
+    apply_period_change,
+    bucket_start,
+    rollup_candles,
+    rollup_timeframes,
+    rollup_buckets_for_dates,
+)
+from .models import Stock, DailyPrice
+from .resampling import parse_interval, resample_rows
+from .trading_calendar import get_trading_calendar
+from apps.common.archive import archived_fetch
+from apps.common.cache import LRUCache, make_cache_key
 from apps.common.exceptions import StockDataFetchError
-from apps.common.utils import retry_on_failure, log_execution_time
+from apps.common.failures import record_failure, resolve_failures
+from apps.common.utils import (
+    retry_on_failure,
+    log_execution_time,
+    bulk_upsert,
+    frame_checksum,
+    unchanged_row_mask,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,329 +37,732 @@ def format_krx_date(d: date) -> str:
     return d.strftime("%Y%m%d")
 
 
+def check_krx_business_day(target_date: date) -> bool | None:
+    """
+    KOSPI 지수 일봉으로 KRX가 해당 날짜에 실제로 열렸는지 확인
+
+    Returns:
+        bool: 영업일이면 True, 휴장일이면 False. 조회 실패로 판단할 수 없으면 None
+    """
+    from pykrx import stock as krx
+
+    date_str = format_krx_date(target_date)
+    try:
+        nearest = krx.get_nearest_business_day_in_a_week(date_str, prev=True)
+    except Exception as e:
+        logger.warning(f"Could not confirm KRX business day for {target_date}: {e}")
+        return None
+    return nearest == date_str
+
+
+KRX_MARKETS = ("KOSPI", "KOSDAQ", "KONEX")
+
+
+def fetch_krx_stock_master(target_date: date) -> dict[str, tuple[str, str]]:
+    """
+    시장별 종목 목록 일괄 조회
+
+    시장(KOSPI/KOSDAQ/KONEX)마다 종목코드-종목명 테이블을 한 번씩 조회하므로
+    종목별 이름/시장 조회가 필요 없습니다.
+
+    Returns:
+        dict: 종목코드 -> (종목명, 시장). 조회 결과가 비어 있는 시장이 있으면 빈 dict
+    """
+    from pykrx.website import krx as krx_website
+
+    date_str = format_krx_date(target_date)
+    master: dict[str, tuple[str, str]] = {}
+
+    def fetch_tickers(market: str):
+        tickers = krx_website.get_market_ticker_and_name(date_str, market)
+        return None if tickers is None else tickers.rename("name").to_frame()
+
+    for market in KRX_MARKETS:
+        tickers = archived_fetch(
+            "krx", "ticker_and_name", target_date, {"market": market},
+            lambda: fetch_tickers(market),
+        )
+        if tickers is None or len(tickers) == 0:
+            logger.warning(f"No tickers received for {market} on {target_date}")
+            return {}
+
+        for code, name in tickers["name"].items():
+            master[str(code)] = (str(name), market)
+
+    return master
+
+
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
-def sync_stock_master_from_krx(target_date: date | None = None) -> int:
-    from pykrx import stock as krx
+def sync_stock_master_from_krx(target_date: date | None = None) -> dict:
+    """
+    주식 종목 마스터 동기화
+
+    KRX 종목 목록과 기존 Stock 행을 메모리에서 비교하여 신규 종목은 추가,
+    이름/시장이 바뀐 종목은 갱신, 목록에서 사라진 종목은 비활성화합니다.
 
+    Returns:
+        dict: {'inserted': int, 'updated': int, 'delisted': int, 'total': int}
+    """
     if target_date is None:
         target_date = date.today()
 
     logger.info(f"Starting stock master sync for {target_date}")
 
     try:
-        date_str = format_krx_date(target_date)
-        tickers = krx.get_market_ticker_list(date_str, market="ALL")
-        updated_count = 0
-
-        for code in tickers:
-            try:
-                name = krx.get_market_ticker_name(code)
-                try:
-                    market = krx.get_stock_market_from_ticker(code)
-                except Exception as e:
-                    logger.warning(f"Failed to get market for {code}: {e}")
-                    market = ""
-
-                Stock.objects.update_or_create(
-                    code=code,
-                    defaults={
-                        "name": name,
-                        "market": market,
-                        "is_active": True,
-                    },
-                )
-                updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to sync stock {code}: {e}")
+        master = fetch_krx_stock_master(target_date)
+
+        if not master:
+            logger.warning(f"Skipping stock master sync for {target_date}: empty ticker list")
+            return {"inserted": 0, "updated": 0, "delisted": 0, "total": 0}
+
+        existing = {
+            stock.code: stock
+            for stock in Stock.objects.only("id", "code", "name", "market", "is_active")
+        }
+
+        to_create = [
+            Stock(code=code, name=name, market=market, is_active=True)
+            for code, (name, market) in master.items()
+            if code not in existing
+        ]
+
+        to_update = []
+        for code, (name, market) in master.items():
+            stock = existing.get(code)
+            if stock is None:
                 continue
-
-        logger.info(f"Successfully synced {updated_count} stocks")
-        return updated_count
+            if stock.name != name or stock.market != market or not stock.is_active:
+                stock.name = name
+                stock.market = market
+                stock.is_active = True
+                to_update.append(stock)
+
+        delisted_ids = [
+            stock.id for code, stock in existing.items()
+            if stock.is_active and code not in master
+        ]
+
+        with transaction.atomic():
+            Stock.objects.bulk_create(to_create, batch_size=500)
+            Stock.objects.bulk_update(to_update, ["name", "market", "is_active"], batch_size=500)
+            delisted = Stock.objects.filter(id__in=delisted_ids).update(is_active=False)
+
+        result = {
+            "inserted": len(to_create),
+            "updated": len(to_update),
+            "delisted": delisted,
+            "total": len(master),
+        }
+        logger.info(
+            f"Successfully synced {result['total']} stocks: "
+            f"{result['inserted']} inserted, {result['updated']} updated, "
+            f"{result['delisted']} delisted"
+        )
+        return result
     except Exception as e:
         logger.error(f"Stock master sync failed: {e}", exc_info=True)
         raise StockDataFetchError(f"Failed to sync stock master: {e}")
 
 
+# pykrx OHLCV 컬럼 -> DailyPrice 필드 매핑
+KRX_OHLCV_COLUMNS = {
+    "시가": "open_price",
+    "고가": "high_price",
+    "저가": "low_price",
+    "종가": "close_price",
+    "거래량": "volume",
+    "거래대금": "amount",
+    "등락": "change",
+    "등락률": "change_rate",
+}
+DAILY_PRICE_REQUIRED_FIELDS = ["open_price", "high_price", "low_price", "close_price", "volume"]
+DAILY_PRICE_UPDATE_FIELDS = [
+    "open_price", "high_price", "low_price", "close_price",
+    "volume", "amount", "change", "change_rate", "market_cap",
+]
+DAILY_PRICE_BATCH_SIZE = 500
+KRX_MARKET_CAP_COLUMN = "시가총액"
+# 수집 실패 기록(FetchFailure) 구분
+DAILY_PRICE_FAILURE_SOURCE = "krx"
+DAILY_PRICE_FAILURE_DATASET = "daily_price"
+INVALID_OHLCV_ERROR = "missing or non-numeric OHLCV values"
+
+
+def fetch_krx_market_caps(target_date: date) -> pd.Series:
+    """
+    전 종목 시가총액 일괄 조회
+
+    Returns:
+        Series: 종목코드 -> 시가총액. 조회 실패 또는 데이터가 없으면 빈 Series
+    """
+    from pykrx import stock as krx
+
+    date_str = format_krx_date(target_date)
+    try:
+        df = archived_fetch(
+            "krx", "market_cap_by_ticker", target_date, {"market": "ALL"},
+            lambda: krx.get_market_cap_by_ticker(date_str, market="ALL"),
+        )
+    except Exception as e:
+        # 시가총액은 보조 데이터이므로 가격 동기화는 계속 진행
+        logger.warning(f"Failed to fetch market caps for {target_date}: {e}")
+        return pd.Series(dtype=float)
+
+    if df is None or df.empty or KRX_MARKET_CAP_COLUMN not in df.columns:
+        logger.warning(f"No market cap data available for {target_date}")
+        return pd.Series(dtype=float)
+
+    caps = pd.to_numeric(df[KRX_MARKET_CAP_COLUMN], errors="coerce")
+    caps.index = df.index.astype(str)
+    return caps
+
+
+def build_daily_price_frame(df: pd.DataFrame, market_caps: pd.Series | None = None) -> pd.DataFrame:
+    """
+    KRX OHLCV DataFrame을 DailyPrice 필드 기준 DataFrame으로 변환
+
+    컬럼 단위로 숫자 변환을 수행하며, 필수 값이 비어 있거나 숫자가 아닌 행은
+    로그를 남기고 제외합니다. 인덱스는 종목코드입니다.
+    시가총액은 종목코드 기준으로 붙이며, 없는 종목은 NULL입니다.
+    """
+    frame = pd.DataFrame(index=df.index.astype(str))
+    for column, field in KRX_OHLCV_COLUMNS.items():
+        if column in df.columns:
+            frame[field] = pd.to_numeric(df[column].to_numpy(), errors="coerce")
+        else:
+            frame[field] = 0 if field == "amount" else np.nan
+
+    invalid = frame[DAILY_PRICE_REQUIRED_FIELDS].isna().any(axis=1)
+    for code in frame.index[invalid]:
+        logger.error(f"Failed to sync price for {code}: {INVALID_OHLCV_ERROR}")
+    frame = frame[~invalid]
+
+    if market_caps is None:
+        market_caps = pd.Series(dtype=float)
+    frame["market_cap"] = market_caps.reindex(frame.index).to_numpy(dtype=float)
+
+    frame[["volume", "amount", "market_cap"]] = frame[["volume", "amount", "market_cap"]].round()
+    frame[["change", "change_rate"]] = frame[["change", "change_rate"]].round(2)
+    return frame
+
+
+def resolve_stock_ids(codes: list[str]) -> dict[str, int]:
+    """
+    종목코드 -> Stock ID 매핑 조회
+
+    한 번의 쿼리로 기존 종목을 조회하고, 없는 종목은 일괄 생성합니다.
+    """
+    stock_ids = dict(Stock.objects.filter(code__in=codes).values_list("code", "id"))
+    missing = [code for code in codes if code not in stock_ids]
+
+    if missing:
+        Stock.objects.bulk_create(
+            [Stock(code=code, name=code) for code in missing],
+            ignore_conflicts=True,
+        )
+        stock_ids.update(Stock.objects.filter(code__in=missing).values_list("code", "id"))
+        logger.info(f"Created {len(missing)} missing stocks")
+
+    return stock_ids
+
+
+def _to_decimal(value) -> Decimal | None:
+    return None if value is None else Decimal(str(value))
+
+
+def _to_int(value) -> int | None:
+    return None if value is None else int(value)
+
+
+def build_daily_prices(frame: pd.DataFrame, stock_ids: dict[str, int], target_date: date) -> list[DailyPrice]:
+    """build_daily_price_frame 결과를 DailyPrice 인스턴스 목록으로 변환"""
+    records = frame.astype(object).where(frame.notna(), None)
+    return [
+        DailyPrice(
+            stock_id=stock_ids[code],
+            trade_date=target_date,
+            open_price=_to_decimal(row.open_price),
+            high_price=_to_decimal(row.high_price),
+            low_price=_to_decimal(row.low_price),
+            close_price=_to_decimal(row.close_price),
+            volume=_to_int(row.volume),
+            amount=_to_int(row.amount),
+            change=_to_decimal(row.change),
+            change_rate=_to_decimal(row.change_rate),
+            market_cap=_to_int(row.market_cap),
+        )
+        for code, row in zip(records.index, records.itertuples(index=False))
+    ]
+
+
+def upsert_daily_prices(
+    prices: list[DailyPrice],
+    stock_ids: dict[str, int],
+    update_fields: list[str],
+) -> tuple[int, dict[str, str]]:
+    """
+    일봉 청크 upsert
+
+    Returns:
+        tuple: (저장된 행 수, 저장에 실패한 종목코드 -> 오류 메시지)
+    """
+    codes_by_id = {stock_id: code for code, stock_id in stock_ids.items()}
+    errors = {}
+
+    def on_error(price, error):
+        errors[codes_by_id[price.stock_id]] = str(error)
+
+    written = bulk_upsert(
+        DailyPrice,
+        prices,
+        unique_fields=["stock", "trade_date"],
+        update_fields=update_fields,
+        batch_size=DAILY_PRICE_BATCH_SIZE,
+        describe=lambda price: f"price for {codes_by_id[price.stock_id]}",
+        on_error=on_error,
+    )
+    return written, errors
+
+
+def record_daily_price_failures(target_date: date, errors: dict[str, str]):
+    """종목별 일봉 수집 실패 기록"""
+    for code, error in errors.items():
+        record_failure(
+            DAILY_PRICE_FAILURE_SOURCE, DAILY_PRICE_FAILURE_DATASET, code, target_date, error
+        )
+
+
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
-@transaction.atomic
-def sync_daily_prices_from_krx(target_date: date) -> int:
+def sync_daily_price_changes(target_date: date) -> dict:
+    """
+    일별 주가 동기화 (변경 감지)
+
+    전 종목 OHLCV와 시가총액을 한 번씩 조회하여 종목코드로 병합한 뒤 종목 ID를 일괄 조회/생성하고,
+    같은 날짜의 저장된 값과 열 단위로 비교하여 새로 생기거나 바뀐 행만
+    (stock_id, trade_date) 기준 청크 단위 upsert로 저장합니다.
+    거래일 캘린더상 비거래일(주말/휴장일)이면 KRX를 호출하지 않습니다.
+
+    Returns:
+        dict: {'count': 수신 행 수, 'written': 저장한 행 수, 'skipped': 변경 없어 건너뛴 행 수,
+               'checksum': 수신한 KRX OHLCV 원본 체크섬 (데이터가 없으면 빈 문자열),
+               'stock_ids': 저장한 종목 ID 목록 (캔들 증분 집계 대상)}
+    """
     from pykrx import stock as krx
 
+    result = {"count": 0, "written": 0, "skipped": 0, "checksum": "", "stock_ids": []}
+
+    calendar = get_trading_calendar()
+    if not calendar.is_trading_day(target_date):
+        logger.info(f"Skipping daily price sync for {target_date}: not a trading day")
+        return result
+
     logger.info(f"Starting daily price sync for {target_date}")
 
     try:
         date_str = format_krx_date(target_date)
-        df = krx.get_market_ohlcv_by_ticker(date_str, market="ALL")
+        df = archived_fetch(
+            "krx", "ohlcv_by_ticker", target_date, {"market": "ALL"},
+            lambda: krx.get_market_ohlcv_by_ticker(date_str, market="ALL"),
+        )
 
         if df.empty:
             logger.warning(f"No price data available for {target_date}")
-            return 0
-
-        updated_rows = 0
-
-        for code, row in df.iterrows():
-            try:
-                stock, _ = Stock.objects.get_or_create(code=code, defaults={"name": code})
-                open_price = row.get("시가")
-                high_price = row.get("고가")
-                low_price = row.get("저가")
-                close_price = row.get("종가")
-                volume = row.get("거래량")
-                amount = row.get("거래대금", 0)
-                change = row.get("등락", None)
-                change_rate = row.get("등락률", None)
-
-                DailyPrice.objects.update_or_create(
-                    stock=stock,
-                    trade_date=target_date,
-                    defaults={
-                        "open_price": open_price,
-                        "high_price": high_price,
-                        "low_price": low_price,
-                        "close_price": close_price,
-                        "volume": volume,
-                        "amount": amount,
-                        "change": change,
-                        "change_rate": change_rate,
-                    },
-                )
-                updated_rows += 1
-            except Exception as e:
-                logger.error(f"Failed to sync price for {code}: {e}")
-                continue
-
-        logger.info(f"Successfully synced {updated_rows} daily prices")
-        return updated_rows
+            return result
+
+        market_caps = fetch_krx_market_caps(target_date)
+        frame = build_daily_price_frame(df, market_caps)
+        stock_ids = resolve_stock_ids(list(frame.index))
+
+        # 시가총액을 받지 못했으면 저장된 시가총액을 NULL로 덮어쓰지 않음
+        update_fields = [
+            field for field in DAILY_PRICE_UPDATE_FIELDS
+            if field != "market_cap" or not market_caps.empty
+        ]
+        stored = pd.DataFrame.from_records(
+            DailyPrice.objects.filter(trade_date=target_date)
+            .values_list("stock_id", *update_fields),
+            columns=["stock_id", *update_fields],
+            index="stock_id",
+        )
+        unchanged = unchanged_row_mask(
+            frame.set_axis(frame.index.map(stock_ids)), stored, update_fields
+        ).to_numpy()
+        changed = frame[~unchanged]
+
+        prices = build_daily_prices(changed, stock_ids, target_date)
+        written, errors = upsert_daily_prices(prices, stock_ids, update_fields)
+        skipped = int(unchanged.sum())
+
+        # 실패한 종목만 기록하여 재수집 태스크가 해당 종목만 다시 조회하도록 함
+        invalid_codes = df.index.astype(str).difference(frame.index)
+        errors.update({code: INVALID_OHLCV_ERROR for code in invalid_codes})
+        record_daily_price_failures(target_date, errors)
+        resolve_failures(
+            DAILY_PRICE_FAILURE_SOURCE, DAILY_PRICE_FAILURE_DATASET, target_date,
+            [code for code in frame.index if code not in errors],
+        )
+
+        result = {
+            "count": written + skipped,
+            "written": written,
+            "skipped": skipped,
+            "checksum": frame_checksum(df),
+            "stock_ids": [stock_ids[code] for code in changed.index if code not in errors],
+        }
+        if result["count"]:
+            calendar.mark_trading_day(target_date)
+        logger.info(f"Successfully synced {written} daily prices ({skipped} unchanged)")
+        return result
     except Exception as e:
         logger.error(f"Daily price sync failed: {e}", exc_info=True)
         raise StockDataFetchError(f"Failed to sync daily prices: {e}")
 
 
-@log_execution_time
-@retry_on_failure(max_retries=3, delay=2.0)
-@transaction.atomic
-def aggregate_weekly_prices(stock: Stock, start_date: date, end_date: date) -> int:
+def sync_daily_prices_from_krx(target_date: date) -> int:
     """
-    주봉 캔들 데이터 집계
+    일별 주가 동기화
 
-    일봉 데이터를 주 단위로 그룹화하여 주봉 캔들 생성
-    ISO 주차 기준 (월요일 시작, 일요일 종료)
+    Returns:
+        int: 해당 날짜의 동기화된 가격 데이터 수 (변경 없어 건너뛴 행 포함)
+    """
+    return sync_daily_price_changes(target_date)["count"]
+
+
+def refetch_daily_prices(target_date: date, codes: list[str]) -> dict[str, str]:
     """
-    logger.info(f"Aggregating weekly prices for {stock.code} from {start_date} to {end_date}")
+    실패 기록된 종목의 일봉만 종목별로 다시 조회하여 저장
+
+    전 종목 조회 대신 종목별 OHLCV를 조회하며, 시가총액과 응답에 없는 컬럼(예: 등락)은
+    저장된 값을 NULL/0으로 덮어쓰지 않도록 갱신하지 않습니다.
+    재시도 대상이므로 원본 응답 보관소를 거치지 않고 항상 새로 조회합니다.
+
+    Returns:
+        dict: 여전히 실패한 종목코드 -> 오류 메시지 (빈 dict면 모두 저장)
+    """
+    from pykrx import stock as krx
+
+    date_str = format_krx_date(target_date)
+    errors = {}
+    frames = []
+
+    for code in codes:
+        try:
+            df = krx.get_market_ohlcv(date_str, date_str, code)
+        except Exception as e:
+            logger.warning(f"Failed to refetch price for {code} on {target_date}: {e}")
+            errors[code] = str(e)
+            continue
+        if df is None or df.empty:
+            errors[code] = f"No price data for {code} on {target_date}"
+            continue
+        frames.append(df.iloc[[-1]].set_axis([code]))
+
+    if frames:
+        df = pd.concat(frames)
+        frame = build_daily_price_frame(df)
+        errors.update({code: INVALID_OHLCV_ERROR for code in df.index.difference(frame.index)})
+
+        stock_ids = resolve_stock_ids(list(frame.index))
+        received = {field for column, field in KRX_OHLCV_COLUMNS.items() if column in df.columns}
+        update_fields = [field for field in DAILY_PRICE_UPDATE_FIELDS if field in received]
+        _, upsert_errors = upsert_daily_prices(
+            build_daily_prices(frame, stock_ids, target_date), stock_ids, update_fields
+        )
+        errors.update(upsert_errors)
+
+    logger.info(
+        f"Refetched daily prices for {target_date}: "
+        f"{len(codes) - len(errors)} saved, {len(errors)} failed"
+    )
+    return errors
+
+
+def _aggregate_stock_candles(timeframe: str, stock: Stock, start_date: date, end_date: date) -> int:
+    logger.info(f"Aggregating {timeframe} prices for {stock.code} from {start_date} to {end_date}")
 
     try:
-        # 기간 내 일봉 데이터 조회
-        daily_prices = DailyPrice.objects.filter(
-            stock=stock,
-            trade_date__range=[start_date, end_date]
-        ).order_by('trade_date')
+        counts = rollup_candles(timeframe, start_date, end_date, stock_ids=[stock.id])
+        created_count = counts.get(stock.id, 0)
 
-        if not daily_prices.exists():
+        if created_count == 0:
             logger.warning(f"No daily prices found for {stock.code}")
             return 0
 
-        # 주 단위로 그룹화
-        weekly_data = {}
-        for price in daily_prices:
-            # ISO 주차 계산 (년도-주차)
-            year, week, _ = price.trade_date.isocalendar()
-            week_key = f"{year}-W{week:02d}"
-
-            if week_key not in weekly_data:
-                weekly_data[week_key] = {
-                    'prices': [],
-                    'dates': []
-                }
-
-            weekly_data[week_key]['prices'].append(price)
-            weekly_data[week_key]['dates'].append(price.trade_date)
-
-        # 주봉 생성
-        created_count = 0
-        for week_key, data in weekly_data.items():
-            prices = data['prices']
-            dates = data['dates']
-
-            # 주의 마지막 거래일
-            last_date = max(dates)
-
-            # OHLC 계산
-            open_price = next(p.open_price for p in prices if p.trade_date == min(dates))
-            high_price = max(p.high_price for p in prices)
-            low_price = min(p.low_price for p in prices)
-            close_price = next(p.close_price for p in prices if p.trade_date == last_date)
-            volume = sum(p.volume for p in prices)
-            amount = sum(p.amount for p in prices if p.amount) if any(p.amount for p in prices) else None
-
-            WeeklyPrice.objects.update_or_create(
-                stock=stock,
-                trade_date=last_date,
-                defaults={
-                    'open_price': open_price,
-                    'high_price': high_price,
-                    'low_price': low_price,
-                    'close_price': close_price,
-                    'volume': volume,
-                    'amount': amount,
-                }
-            )
-            created_count += 1
-
-        logger.info(f"Successfully aggregated {created_count} weekly prices for {stock.code}")
+        logger.info(f"Successfully aggregated {created_count} {timeframe} prices for {stock.code}")
         return created_count
 
     except Exception as e:
-        logger.error(f"Weekly price aggregation failed for {stock.code}: {e}", exc_info=True)
-        raise StockDataFetchError(f"Failed to aggregate weekly prices: {e}")
+        logger.error(
+            f"{timeframe.capitalize()} price aggregation failed for {stock.code}: {e}",
+            exc_info=True,
+        )
+        raise StockDataFetchError(f"Failed to aggregate {timeframe} prices: {e}")
+
+
+@log_execution_time
+@retry_on_failure(max_retries=3, delay=2.0)
+def aggregate_weekly_prices(stock: Stock, start_date: date, end_date: date) -> int:
+    """
+    주봉 캔들 데이터 집계
+
+    일봉 데이터를 주 단위로 그룹화하여 주봉 캔들 생성
+    ISO 주차 기준 (월요일 시작, 일요일 종료)
+    """
+    return _aggregate_stock_candles("weekly", stock, start_date, end_date)
 
 
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
-@transaction.atomic
 def aggregate_monthly_prices(stock: Stock, start_date: date, end_date: date) -> int:
     """
     월봉 캔들 데이터 집계
 
     일봉 데이터를 월 단위로 그룹화하여 월봉 캔들 생성
     """
-    logger.info(f"Aggregating monthly prices for {stock.code} from {start_date} to {end_date}")
+    return _aggregate_stock_candles("monthly", stock, start_date, end_date)
 
-    try:
-        # 기간 내 일봉 데이터 조회
-        daily_prices = DailyPrice.objects.filter(
-            stock=stock,
-            trade_date__range=[start_date, end_date]
-        ).order_by('trade_date')
 
-        if not daily_prices.exists():
-            logger.warning(f"No daily prices found for {stock.code}")
-            return 0
+@log_execution_time
+@retry_on_failure(max_retries=3, delay=2.0)
+def aggregate_yearly_prices(stock: Stock, start_date: date, end_date: date) -> int:
+    """
+    연봉 캔들 데이터 집계
 
-        # 월 단위로 그룹화
-        monthly_data = {}
-        for price in daily_prices:
-            month_key = f"{price.trade_date.year}-{price.trade_date.month:02d}"
-
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    'prices': [],
-                    'dates': []
-                }
-
-            monthly_data[month_key]['prices'].append(price)
-            monthly_data[month_key]['dates'].append(price.trade_date)
-
-        # 월봉 생성
-        created_count = 0
-        for month_key, data in monthly_data.items():
-            prices = data['prices']
-            dates = data['dates']
-
-            # 월의 마지막 거래일
-            last_date = max(dates)
-
-            # OHLC 계산
-            open_price = next(p.open_price for p in prices if p.trade_date == min(dates))
-            high_price = max(p.high_price for p in prices)
-            low_price = min(p.low_price for p in prices)
-            close_price = next(p.close_price for p in prices if p.trade_date == last_date)
-            volume = sum(p.volume for p in prices)
-            amount = sum(p.amount for p in prices if p.amount) if any(p.amount for p in prices) else None
-
-            MonthlyPrice.objects.update_or_create(
-                stock=stock,
-                trade_date=last_date,
-                defaults={
-                    'open_price': open_price,
-                    'high_price': high_price,
-                    'low_price': low_price,
-                    'close_price': close_price,
-                    'volume': volume,
-                    'amount': amount,
-                }
-            )
-            created_count += 1
-
-        logger.info(f"Successfully aggregated {created_count} monthly prices for {stock.code}")
-        return created_count
+    일봉 데이터를 연 단위로 그룹화하여 연봉 캔들 생성
+    """
+    return _aggregate_stock_candles("yearly", stock, start_date, end_date)
 
+
+@log_execution_time
+@retry_on_failure(max_retries=3, delay=2.0)
+def aggregate_candles(
+    timeframe: str,
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None = None,
+) -> dict[int, int]:
+    """
+    전 종목 기간 캔들 일괄 집계
+
+    Args:
+        timeframe: weekly, monthly, yearly
+        stock_ids: 집계 대상 종목 ID 목록 (None이면 모든 활성 종목)
+
+    Returns:
+        dict: 종목 ID -> 저장된 캔들 수
+    """
+    logger.info(f"Aggregating {timeframe} prices from {start_date} to {end_date}")
+
+    try:
+        return rollup_candles(timeframe, start_date, end_date, stock_ids)
     except Exception as e:
-        logger.error(f"Monthly price aggregation failed for {stock.code}: {e}", exc_info=True)
-        raise StockDataFetchError(f"Failed to aggregate monthly prices: {e}")
+        logger.error(f"{timeframe.capitalize()} price aggregation failed: {e}", exc_info=True)
+        raise StockDataFetchError(f"Failed to aggregate {timeframe} prices: {e}")
 
 
 @log_execution_time
 @retry_on_failure(max_retries=3, delay=2.0)
-@transaction.atomic
-def aggregate_yearly_prices(stock: Stock, start_date: date, end_date: date) -> int:
+def aggregate_all_candles(
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None = None,
+) -> dict[str, dict[int, int]]:
     """
-    연봉 캔들 데이터 집계
+    주봉/월봉/연봉 동시 집계
 
-    일봉 데이터를 연 단위로 그룹화하여 연봉 캔들 생성
+    일봉을 종목별로 한 번만 읽어 세 캔들 타입을 함께 계산하고 저장합니다.
+
+    Args:
+        stock_ids: 집계 대상 종목 ID 목록 (None이면 모든 활성 종목)
+
+    Returns:
+        dict: 캔들 타입 -> {종목 ID: 저장된 캔들 수}
     """
-    logger.info(f"Aggregating yearly prices for {stock.code} from {start_date} to {end_date}")
+    logger.info(f"Aggregating all candle types from {start_date} to {end_date}")
 
     try:
-        # 기간 내 일봉 데이터 조회
-        daily_prices = DailyPrice.objects.filter(
-            stock=stock,
-            trade_date__range=[start_date, end_date]
-        ).order_by('trade_date')
+        return rollup_timeframes(start_date, end_date, stock_ids)
+    except Exception as e:
+        logger.error(f"Candle aggregation failed: {e}", exc_info=True)
+        raise StockDataFetchError(f"Failed to aggregate candles: {e}")
 
-        if not daily_prices.exists():
-            logger.warning(f"No daily prices found for {stock.code}")
-            return 0
 
-        # 연 단위로 그룹화
-        yearly_data = {}
-        for price in daily_prices:
-            year_key = str(price.trade_date.year)
-
-            if year_key not in yearly_data:
-                yearly_data[year_key] = {
-                    'prices': [],
-                    'dates': []
-                }
-
-            yearly_data[year_key]['prices'].append(price)
-            yearly_data[year_key]['dates'].append(price.trade_date)
-
-        # 연봉 생성
-        created_count = 0
-        for year_key, data in yearly_data.items():
-            prices = data['prices']
-            dates = data['dates']
-
-            # 연의 마지막 거래일
-            last_date = max(dates)
-
-            # OHLC 계산
-            open_price = next(p.open_price for p in prices if p.trade_date == min(dates))
-            high_price = max(p.high_price for p in prices)
-            low_price = min(p.low_price for p in prices)
-            close_price = next(p.close_price for p in prices if p.trade_date == last_date)
-            volume = sum(p.volume for p in prices)
-            amount = sum(p.amount for p in prices if p.amount) if any(p.amount for p in prices) else None
-
-            YearlyPrice.objects.update_or_create(
-                stock=stock,
-                trade_date=last_date,
-                defaults={
-                    'open_price': open_price,
-                    'high_price': high_price,
-                    'low_price': low_price,
-                    'close_price': close_price,
-                    'volume': volume,
-                    'amount': amount,
-                }
-            )
-            created_count += 1
-
-        logger.info(f"Successfully aggregated {created_count} yearly prices for {stock.code}")
-        return created_count
+@log_execution_time
+@retry_on_failure(max_retries=3, delay=2.0)
+def update_candles_for_dates(
+    trade_dates: list[date],
+    stock_ids: list[int] | None = None,
+) -> dict[str, int]:
+    """
+    새로 적재된 거래일이 속한 주/월/연 버킷만 증분 집계
 
+    Args:
+        trade_dates: 새로 적재된 거래일 목록
+        stock_ids: 변경된 종목 ID 목록 (None이면 해당 거래일에 일봉이 있는 종목)
+
+    Returns:
+        dict: 캔들 타입 -> 저장된 캔들 수
+    """
+    calendar = get_trading_calendar()
+    trade_dates = [d for d in trade_dates if calendar.is_trading_day(d)]
+    logger.info(f"Updating candles for {len(trade_dates)} trade dates")
+
+    try:
+        return rollup_buckets_for_dates(trade_dates, stock_ids)
     except Exception as e:
-        logger.error(f"Yearly price aggregation failed for {stock.code}: {e}", exc_info=True)
-        raise StockDataFetchError(f"Failed to aggregate yearly prices: {e}")
+        logger.error(f"Incremental candle update failed: {e}", exc_info=True)
+        raise StockDataFetchError(f"Failed to update candles: {e}")
+
+
+# 저장된 캔들 테이블로 바로 조회할 수 있는 간격
+STORED_CANDLE_INTERVALS = {
+    (1, "D"): "daily",
+    (1, "W"): "weekly",
+    (1, "M"): "monthly",
+    (1, "Y"): "yearly",
+}
+RESAMPLE_ROW_FIELDS = (
+    "trade_date", "open_price", "high_price", "low_price",
+    "close_price", "volume", "amount", "market_cap",
+)
+# 워터마크로 잡지 못한 변경도 일정 시간 후에는 반영되도록 TTL을 둠
+RESAMPLED_PRICE_CACHE_TTL = 60 * 15
+resampled_price_cache = LRUCache(max_size=512, ttl=RESAMPLED_PRICE_CACHE_TTL)
+
+# 같은 구간의 재집계를 반복 요청하지 않도록 최근 요청 시각을 기록
+materialization_requests = LRUCache(max_size=1024)
+MATERIALIZATION_RETRY_SECONDS = 600
+
+
+def stored_candle_type(interval: str) -> str | None:
+    """
+    간격이 저장된 캔들 테이블로 제공되면 candle_type 반환
+
+    Raises:
+        ValueError: 지원하지 않는 간격 표기
+    """
+    return STORED_CANDLE_INTERVALS.get(parse_interval(interval))
+
+
+def get_resampled_prices(
+    stock: Stock,
+    interval: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list[dict]:
+    """
+    저장된 일봉을 요청 간격으로 리샘플링한 캔들 목록 (trade_date 오름차순)
+
+    결과는 (종목, 간격, 기간, 데이터 워터마크) 키로 크기 제한 캐시에 저장됩니다.
+    워터마크는 종목 일봉의 마지막 거래일, 행 수와 집계 필드별 합계이므로 새 일봉이 적재되거나
+    기존 일봉이 재수집/수정으로 바뀌면 키가 바뀝니다. 캐시 항목은 RESAMPLED_PRICE_CACHE_TTL 후 만료됩니다.
+    시작일이 없으면 보유한 전체 일봉을 기준으로 집계합니다.
+    """
+    size, unit = parse_interval(interval)
+
+    queryset = DailyPrice.objects.filter(stock=stock)
+    if start_date:
+        queryset = queryset.filter(trade_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(trade_date__lte=end_date)
+
+    watermark = queryset.aggregate(
+        latest=Max("trade_date"),
+        rows=Count("id"),
+        **{field: Sum(field) for field in RESAMPLE_ROW_FIELDS[1:]},
+    )
+    cache_key = make_cache_key(
+        "resampled_prices", stock.id, f"{size}{unit}", start_date, end_date,
+        *watermark.values(),
+    )
+
+    candles = resampled_price_cache.get(cache_key)
+    if candles is None:
+        rows = list(queryset.order_by("trade_date").values_list(*RESAMPLE_ROW_FIELDS))
+        candles = apply_period_change(resample_rows(rows, f"{size}{unit}"))
+        resampled_price_cache.set(cache_key, candles)
+        logger.debug(f"Resampled {len(rows)} daily prices of {stock.code} into {len(candles)} candles")
+
+    return candles
+
+
+def find_missing_candles(
+    stock: Stock,
+    candle_type: str,
+    stored_dates: list[date],
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int = 30,
+) -> tuple[list[dict], date, date] | None:
+    """
+    저장된 주/월/연 캔들에 빠지거나 오래된 구간이 있는지 일봉과 비교
+
+    조회 범위의 최신 limit개 기간(등락 계산용 직전 기간 포함)의 일봉만 리샘플링(캐시 사용)한 뒤
+    캔들 날짜를 저장된 캔들 날짜와 비교합니다. 집계 태스크가 아직 돌지 않은 종목이나
+    연중 신규 상장 종목의 빈 구간을 찾는 데 사용합니다.
+
+    Args:
+        stored_dates: 같은 조건으로 조회한 저장 캔들의 trade_date 목록
+
+    Returns:
+        tuple: (trade_date 오름차순 계산 캔들, 재집계 시작일, 재집계 종료일)
+               빠진 구간이 없으면 None
+    """
+    if not limit:
+        return None
+
+    latest = DailyPrice.objects.filter(stock=stock)
+    if end_date:
+        latest = latest.filter(trade_date__lte=end_date)
+    anchor = latest.aggregate(latest=Max("trade_date"))["latest"]
+    if anchor is None:
+        return None
+
+    # 최신 limit개 기간 + 직전 기간(첫 캔들 등락 계산용)의 시작일부터만 읽음
+    read_start = bucket_start(candle_type, anchor)
+    for _ in range(limit):
+        read_start = bucket_start(candle_type, read_start - timedelta(days=1))
+    if start_date:
+        previous_start = bucket_start(
+            candle_type, bucket_start(candle_type, start_date) - timedelta(days=1)
+        )
+        read_start = max(read_start, previous_start)
+
+    candles = get_resampled_prices(stock, candle_type, read_start, end_date)
+    if start_date:
+        candles = [c for c in candles if c["trade_date"] >= start_date]
+
+    window = candles[-limit:]
+    stored = set(stored_dates)
+    if not window or {c["trade_date"] for c in window} == stored:
+        return None
+
+    missing = [c for c in window if c["trade_date"] not in stored] or window
+    logger.info(
+        f"Found {len(missing)} missing {candle_type} candles for {stock.code}"
+    )
+    return window, missing[0]["first_date"], missing[-1]["trade_date"]
+
+
+def claim_materialization(stock_id: int, candle_type: str, start_date: date, end_date: date) -> bool:
+    """
+    재집계 요청 중복 방지
+
+    같은 구간을 최근 MATERIALIZATION_RETRY_SECONDS 이내에 요청했으면 False를 반환합니다.
+    """
+    key = make_cache_key("materialize", stock_id, candle_type, start_date, end_date)
+    now = time.monotonic()
+    requested_at = materialization_requests.get(key)
+    if requested_at is not None and now - requested_at < MATERIALIZATION_RETRY_SECONDS:
+        return False
+    materialization_requests.set(key, now)
+    return True
+
+
+def release_materialization(stock_id: int, candle_type: str, start_date: date, end_date: date):
+    """claim_materialization으로 잡은 구간 해제 (태스크 등록 실패 시 다음 요청이 다시 등록)"""
+    materialization_requests.delete(
+        make_cache_key("materialize", stock_id, candle_type, start_date, end_date)
+    )
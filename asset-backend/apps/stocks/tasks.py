@@ -5,20 +5,44 @@ KRX API를 통해 주식 종목 마스터 데이터와 일별 가격 데이터
 """
 import logging
 from datetime import date, timedelta
-from celery import shared_task
+from celery import chord, shared_task
+from celery.exceptions import Ignore
+from django.db.models import Count, Max
 
 from .services import (
+    DAILY_PRICE_FAILURE_DATASET,
+    DAILY_PRICE_FAILURE_SOURCE,
     sync_stock_master_from_krx,
-    sync_daily_prices_from_krx,
-    aggregate_weekly_prices,
-    aggregate_monthly_prices,
-    aggregate_yearly_prices,
+    sync_daily_price_changes,
+    refetch_daily_prices,
+    aggregate_candles,
+    aggregate_all_candles,
+    update_candles_for_dates,
 )
-from .models import Stock
+from .backfill import DEFAULT_BACKFILL_WORKERS, run_backfill
+from .models import DailyPrice, Stock
 from apps.common.exceptions import StockDataFetchError
+from apps.common.failures import due_failures, mark_retry_failed, resolve_failures
+from apps.common.ingestion import (
+    finish_ingestion,
+    previous_run,
+    skipped_run_result,
+    start_ingestion,
+    track_ingestion,
+)
+from apps.common.models import IngestionRun
+from apps.common.utils import chunked, combine_checksums
 
 logger = logging.getLogger(__name__)
 
+# 전체 재집계 시 한 워커가 처리할 종목 수
+AGGREGATION_CHUNK_SIZE = 200
+# 재수집 태스크 한 번에 처리할 최대 실패 기록 수
+FAILURE_RETRY_BATCH_SIZE = 500
+# 실행 기록(IngestionRun) 파이프라인/소스 구분
+STOCK_SOURCE = "krx"
+DAILY_PRICES_PIPELINE = "daily_prices"
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def sync_stock_master_task(self, target_date_str: str | None = None):
@@ -29,7 +53,7 @@ def sync_stock_master_task(self, target_date_str: str | None = None):
         target_date_str: 동기화할 날짜 (YYYY-MM-DD 형식), None이면 오늘 날짜
 
     Returns:
-        dict: 성공 여부, 동기화된 종목 수, 날짜
+        dict: 성공 여부, 동기화된 종목 수, 추가/갱신/비활성화 종목 수, 날짜
 
     Raises:
         Retry: StockDataFetchError 발생 시 재시도
@@ -41,9 +65,20 @@ def sync_stock_master_task(self, target_date_str: str | None = None):
             target_date = date.today()
 
         logger.info(f"[Task] Starting stock master sync for {target_date}")
-        count = sync_stock_master_from_krx(target_date)
-        logger.info(f"[Task] Completed stock master sync: {count} stocks")
-        return {"success": True, "count": count, "date": target_date.isoformat()}
+        result = sync_stock_master_from_krx(target_date)
+        logger.info(
+            f"[Task] Completed stock master sync: {result['total']} stocks "
+            f"({result['inserted']} inserted, {result['updated']} updated, "
+            f"{result['delisted']} delisted)"
+        )
+        return {
+            "success": True,
+            "count": result["total"],
+            "inserted": result["inserted"],
+            "updated": result["updated"],
+            "delisted": result["delisted"],
+            "date": target_date.isoformat(),
+        }
 
     except StockDataFetchError as exc:
         logger.error(f"[Task] Stock master sync failed: {exc}", exc_info=True)
@@ -54,15 +89,21 @@ def sync_stock_master_task(self, target_date_str: str | None = None):
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def sync_daily_prices_task(self, target_date_str: str | None = None):
+def sync_daily_prices_task(self, target_date_str: str | None = None, force: bool = False):
     """
     일별 주가 데이터 동기화 태스크
 
     Args:
         target_date_str: 동기화할 날짜 (YYYY-MM-DD 형식), None이면 오늘 날짜
+        force: 이미 성공한 실행 기록이 있어도 다시 동기화
 
     Returns:
-        dict: 성공 여부, 동기화된 가격 데이터 수, 날짜
+        dict: 성공 여부, 동기화된 가격 데이터 수, 저장/건너뛴(변경 없음) 행 수, 날짜
+              (이미 수집된 날짜면 ingested=False와 사유)
+
+    저장된 행이 있으면 저장된 종목만 해당 거래일이 속한 주/월/연 캔들 증분 집계
+    태스크(update_candles_task)를 이어서 실행합니다.
+    실행 결과는 IngestionRun(daily_prices, krx)으로 기록됩니다.
 
     Raises:
         Retry: StockDataFetchError 발생 시 재시도
@@ -73,10 +114,32 @@ def sync_daily_prices_task(self, target_date_str: str | None = None):
         else:
             target_date = date.today()
 
+        if not force and (previous := previous_run(DAILY_PRICES_PIPELINE, STOCK_SOURCE, target_date)):
+            return skipped_run_result(previous)
+
         logger.info(f"[Task] Starting daily price sync for {target_date}")
-        count = sync_daily_prices_from_krx(target_date)
-        logger.info(f"[Task] Completed daily price sync: {count} prices")
-        return {"success": True, "count": count, "date": target_date.isoformat()}
+        run = start_ingestion(DAILY_PRICES_PIPELINE, STOCK_SOURCE, target_date)
+        with track_ingestion(run):
+            result = sync_daily_price_changes(target_date)
+            run.rows_fetched = result["count"]
+            run.rows_written = result["written"]
+            run.rows_skipped = result["skipped"]
+            run.checksum = result.get("checksum", "")
+        logger.info(
+            f"[Task] Completed daily price sync: {result['count']} prices "
+            f"({result['written']} written, {result['skipped']} unchanged)"
+        )
+
+        # 바뀐 종목만 캔들을 다시 계산 (바뀐 행이 없으면 생략)
+        if result["stock_ids"]:
+            update_candles_task.delay([target_date.isoformat()], result["stock_ids"])
+        return {
+            "success": True,
+            "count": result["count"],
+            "written": result["written"],
+            "skipped": result["skipped"],
+            "date": target_date.isoformat(),
+        }
 
     except StockDataFetchError as exc:
         logger.error(f"[Task] Daily price sync failed: {exc}", exc_info=True)
@@ -86,20 +149,384 @@ def sync_daily_prices_task(self, target_date_str: str | None = None):
         raise self.retry(exc=exc, countdown=60)
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def retry_failed_daily_prices_task(self, limit: int = FAILURE_RETRY_BATCH_SIZE):
+    """
+    실패 기록된 종목 일봉 재수집 태스크
+
+    재시도 시점이 된 FetchFailure만 날짜별로 묶어 해당 종목만 다시 조회합니다.
+    성공한 항목은 해결 처리하고, 실패한 항목은 백오프를 늘려 다음 실행으로 미룹니다.
+    저장된 날짜는 주/월/연 캔들 증분 집계를 이어서 실행합니다.
+
+    Args:
+        limit: 한 번에 처리할 최대 실패 기록 수
+
+    Returns:
+        dict: 성공 여부, 재시도/해결/실패 항목 수, 저장된 날짜 목록
+    """
+    try:
+        failures = list(due_failures(DAILY_PRICE_FAILURE_SOURCE, DAILY_PRICE_FAILURE_DATASET, limit))
+        if not failures:
+            return {"success": True, "retried": 0, "resolved": 0, "failed": 0, "dates": []}
+
+        logger.info(f"[Task] Retrying {len(failures)} failed daily prices")
+
+        by_date = {}
+        for failure in failures:
+            by_date.setdefault(failure.target_date, []).append(failure)
+
+        resolved = 0
+        resolved_dates = []
+        for target_date, group in by_date.items():
+            codes = [failure.item for failure in group]
+            try:
+                errors = refetch_daily_prices(target_date, codes)
+            except Exception as e:
+                logger.error(f"[Task] Refetch failed for {target_date}: {e}", exc_info=True)
+                errors = {code: str(e) for code in codes}
+
+            for failure in group:
+                if failure.item in errors:
+                    mark_retry_failed(failure, errors[failure.item])
+
+            saved = [code for code in codes if code not in errors]
+            resolved += resolve_failures(
+                DAILY_PRICE_FAILURE_SOURCE, DAILY_PRICE_FAILURE_DATASET, target_date, saved
+            )
+            if saved:
+                resolved_dates.append(target_date.isoformat())
+
+        if resolved_dates:
+            update_candles_task.delay(resolved_dates)
+
+        logger.info(
+            f"[Task] Completed daily price retry: {resolved} resolved, "
+            f"{len(failures) - resolved} still failing"
+        )
+        return {
+            "success": True,
+            "retried": len(failures),
+            "resolved": resolved,
+            "failed": len(failures) - resolved,
+            "dates": resolved_dates,
+        }
+
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in daily price retry: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def backfill_daily_prices_task(
+    self,
+    start_date_str: str,
+    end_date_str: str,
+    workers: int = DEFAULT_BACKFILL_WORKERS,
+    force: bool = False,
+):
+    """
+    기간 일봉 백필 태스크
+
+    거래일별 체크포인트를 남기므로 재시도 시 완료된 날짜는 건너뜁니다.
+    실패한 날짜가 있으면 재시도하고, 적재된 날짜의 주/월/연 캔들은 증분 집계합니다.
+
+    Args:
+        start_date_str: 시작일 (YYYY-MM-DD)
+        end_date_str: 종료일 (YYYY-MM-DD)
+        workers: 동시에 처리할 날짜 수
+        force: 완료된 날짜도 다시 적재
+
+    Returns:
+        dict: 성공 여부, 완료/건너뜀/실패 날짜 수, 총 행 수, 초당 행 수
+    """
+    try:
+        start_date = date.fromisoformat(start_date_str)
+        end_date = date.fromisoformat(end_date_str)
+
+        logger.info(f"[Task] Starting backfill from {start_date} to {end_date}")
+        summary = run_backfill(start_date, end_date, workers=workers, force=force)
+
+        if summary["loaded_dates"]:
+            update_candles_task.delay([d.isoformat() for d in summary["loaded_dates"]])
+
+        if summary["failed"]:
+            raise StockDataFetchError(
+                f"Backfill failed for {summary['failed']} dates: "
+                f"{', '.join(d.isoformat() for d in summary['failed_dates'][:10])}"
+            )
+
+        return {
+            "success": True,
+            "completed": summary["completed"],
+            "skipped": summary["skipped"],
+            "failed": summary["failed"],
+            "rows": summary["rows"],
+            "rows_per_sec": round(summary["rows_per_sec"], 1),
+            "start_date": start_date_str,
+            "end_date": end_date_str,
+        }
+
+    except StockDataFetchError as exc:
+        logger.error(f"[Task] Backfill failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in backfill: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def update_candles_task(self, trade_date_strs: list[str], stock_ids: list[int] | None = None):
+    """
+    주/월/연 캔들 증분 집계 태스크
+
+    새로 적재된 거래일이 속한 버킷만, 변경된 종목에 대해서만 다시 집계합니다.
+    전체 재집계가 필요하면 aggregate_*_prices_task에 기간을 지정해 실행합니다.
+
+    Args:
+        trade_date_strs: 새로 적재된 거래일 목록 (YYYY-MM-DD)
+        stock_ids: 변경된 종목 ID 목록 (None이면 해당 거래일에 일봉이 있는 종목)
+
+    Returns:
+        dict: 성공 여부, 캔들 타입별 저장된 캔들 수, 거래일 목록
+    """
+    try:
+        trade_dates = [date.fromisoformat(d) for d in trade_date_strs]
+
+        logger.info(f"[Task] Starting incremental candle update for {trade_date_strs}")
+        counts = update_candles_for_dates(trade_dates, stock_ids)
+        logger.info(f"[Task] Completed incremental candle update: {counts}")
+        return {"success": True, "candles": counts, "dates": trade_date_strs}
+
+    except StockDataFetchError as exc:
+        logger.error(f"[Task] Incremental candle update failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in incremental candle update: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def materialize_candles_task(
+    self,
+    stock_id: int,
+    candle_type: str,
+    start_date_str: str,
+    end_date_str: str,
+):
+    """
+    조회 시 발견된 빠진 캔들 구간 저장 태스크
+
+    가격 조회 API가 일봉에서 바로 계산해 응답한 구간을 캔들 테이블에 기록합니다.
+
+    Args:
+        stock_id: 종목 ID
+        candle_type: weekly, monthly, yearly
+        start_date_str: 재집계 시작일 (YYYY-MM-DD)
+        end_date_str: 재집계 종료일 (YYYY-MM-DD)
+
+    Returns:
+        dict: 성공 여부, 캔들 타입, 저장된 캔들 수
+    """
+    try:
+        start_date = date.fromisoformat(start_date_str)
+        end_date = date.fromisoformat(end_date_str)
+
+        logger.info(
+            f"[Task] Materializing {candle_type} candles for stock {stock_id} "
+            f"from {start_date} to {end_date}"
+        )
+        counts = aggregate_candles(candle_type, start_date, end_date, [stock_id])
+        return {
+            "success": True,
+            "candle_type": candle_type,
+            "total_candles": sum(counts.values()),
+        }
+
+    except StockDataFetchError as exc:
+        logger.error(f"[Task] Candle materialization failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in candle materialization: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def aggregate_candles_chunk_task(
+    self,
+    timeframe: str,
+    stock_ids: list[int],
+    start_date_str: str,
+    end_date_str: str,
+):
+    """
+    종목 청크 단위 캔들 집계 태스크 (aggregation_chord의 헤더)
+
+    Returns:
+        dict: 집계된 종목 수, 총 캔들 수
+    """
+    try:
+        counts = aggregate_candles(
+            timeframe,
+            date.fromisoformat(start_date_str),
+            date.fromisoformat(end_date_str),
+            stock_ids,
+        )
+        return {"stocks_count": len(counts), "total_candles": sum(counts.values())}
+
+    except StockDataFetchError as exc:
+        logger.error(f"[Task] {timeframe.capitalize()} chunk aggregation failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in {timeframe} chunk aggregation: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task
+def collect_aggregation_results(
+    results: list[dict],
+    timeframe: str,
+    start_date_str: str,
+    end_date_str: str,
+    run_id: int | None = None,
+):
+    """
+    청크별 집계 결과 합산 (aggregation_chord의 콜백)
+
+    run_id가 있으면 해당 실행 기록(IngestionRun)을 완료 처리합니다.
+
+    Returns:
+        dict: 성공 여부, 집계된 종목 수, 총 캔들 수 (단일 태스크 실행과 같은 형식)
+    """
+    success_count = sum(r["stocks_count"] for r in results)
+    total_count = sum(r["total_candles"] for r in results)
+
+    run = IngestionRun.objects.filter(id=run_id).first() if run_id else None
+    if run:
+        run.rows_fetched = success_count
+        run.rows_written = total_count
+        finish_ingestion(run)
+
+    logger.info(
+        f"[Task] Completed {timeframe} aggregation in {len(results)} chunks: "
+        f"{success_count} stocks, {total_count} candles"
+    )
+    return {
+        "success": True,
+        "stocks_count": success_count,
+        "total_candles": total_count,
+        "start_date": start_date_str,
+        "end_date": end_date_str,
+    }
+
+
+@shared_task
+def fail_aggregation_run(request, exc, traceback, run_id: int | None = None):
+    """
+    청크 집계 실패 처리 (aggregation_chord 콜백의 link_error)
+
+    청크가 하나라도 실패하면 콜백이 실행되지 않으므로 진행 중인 실행 기록을 실패로 완료합니다.
+    """
+    logger.error(f"[Task] Chunked aggregation failed (run {run_id}): {exc}")
+    run = IngestionRun.objects.filter(id=run_id, status="running").first() if run_id else None
+    if run:
+        finish_ingestion(run, error=exc)
+
+
+def aggregation_chord(
+    timeframe: str,
+    stock_ids: list[int],
+    start_date: date,
+    end_date: date,
+    run_id: int | None = None,
+):
+    """종목 목록을 청크로 나눠 집계하고 콜백에서 합산하는 chord 시그니처 (실패 시 실행 기록을 failed로)"""
+    start_date_str, end_date_str = start_date.isoformat(), end_date.isoformat()
+    header = [
+        aggregate_candles_chunk_task.s(timeframe, chunk, start_date_str, end_date_str)
+        for chunk in chunked(stock_ids, AGGREGATION_CHUNK_SIZE)
+    ]
+    callback = collect_aggregation_results.s(timeframe, start_date_str, end_date_str, run_id=run_id)
+    callback.link_error(fail_aggregation_run.s(run_id=run_id))
+    return chord(header, callback)
+
+
+def aggregation_input_checksum(start_date: date, end_date: date, stock_ids: list[int] | None) -> str:
+    """
+    집계 입력(일봉) 체크섬
+
+    기간 내 일봉 수와 마지막 거래일, 거래일별 최근 일봉 수집 실행의 원본 체크섬을 결합합니다.
+    일봉이 새로 적재되거나 다른 값으로 다시 수집되면 값이 바뀝니다.
+    """
+    prices = DailyPrice.objects.filter(trade_date__range=(start_date, end_date))
+    if stock_ids is not None:
+        prices = prices.filter(stock_id__in=stock_ids)
+    stats = prices.aggregate(rows=Count("id"), latest=Max("trade_date"))
+
+    latest_checksums = {}
+    runs = IngestionRun.objects.filter(
+        pipeline=DAILY_PRICES_PIPELINE,
+        source=STOCK_SOURCE,
+        target_date__range=(start_date, end_date),
+        status="success",
+    ).order_by("target_date", "-started_at").values_list("target_date", "checksum")
+    for trade_date, checksum in runs:
+        latest_checksums.setdefault(trade_date, checksum)
+
+    return combine_checksums([
+        f"rows={stats['rows']}",
+        f"latest={stats['latest']}",
+        *latest_checksums.values(),
+    ])
+
+
+def begin_aggregation_run(
+    pipeline: str,
+    stock_code: str | None,
+    start_date: date,
+    end_date: date,
+    stock_ids: list[int] | None,
+    force: bool,
+) -> tuple[IngestionRun | None, dict | None]:
+    """
+    전체 재집계 실행 기록 시작
+
+    같은 기간/종목으로 성공한 실행이 있고 그 뒤로 입력 일봉이 바뀌지 않았으면
+    (None, 건너뛴 결과)를, 아니면 (새 실행 기록, None)을 반환합니다.
+    """
+    params = {
+        "stock_code": stock_code,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+    }
+    checksum = aggregation_input_checksum(start_date, end_date, stock_ids)
+    if not force and (previous := previous_run(pipeline, STOCK_SOURCE, end_date, params, checksum)):
+        return None, skipped_run_result(previous)
+
+    run = start_ingestion(pipeline, STOCK_SOURCE, end_date, params)
+    run.checksum = checksum
+    return run, None
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def aggregate_weekly_prices_task(
     self,
     stock_code: str | None = None,
     start_date_str: str | None = None,
-    end_date_str: str | None = None
+    end_date_str: str | None = None,
+    force: bool = False
 ):
     """
-    주봉 캔들 집계 태스크
+    주봉 캔들 집계 태스크 (전체 재집계)
+
+    지정한 기간의 모든 버킷을 다시 계산합니다. 일상적인 갱신은 update_candles_task가
+    담당하며, 이 태스크는 누락/오류 복구용으로 사용합니다.
+    종목 수가 AGGREGATION_CHUNK_SIZE를 넘으면 청크별 chord로 교체되어 병렬 처리됩니다.
 
     Args:
         stock_code: 집계할 종목 코드 (None이면 모든 활성 종목)
         start_date_str: 집계 시작일 (YYYY-MM-DD), None이면 1년 전부터
         end_date_str: 집계 종료일 (YYYY-MM-DD), None이면 오늘까지
+        force: 같은 조건으로 성공한 실행 기록이 있어도 다시 집계
 
     Returns:
         dict: 성공 여부, 집계된 종목 수, 총 주봉 수
@@ -122,19 +549,27 @@ def aggregate_weekly_prices_task(
         else:
             stocks = Stock.objects.filter(is_active=True)
 
-        logger.info(f"[Task] Starting weekly aggregation for {stocks.count()} stocks")
+        stock_ids = list(stocks.values_list("id", flat=True))
+        run, skipped = begin_aggregation_run(
+            "weekly_candles", stock_code, start_date, end_date,
+            stock_ids if stock_code else None, force,
+        )
+        if skipped:
+            return skipped
 
-        total_count = 0
-        success_count = 0
+        logger.info(f"[Task] Starting weekly aggregation for {len(stock_ids)} stocks")
 
-        for stock in stocks:
-            try:
-                count = aggregate_weekly_prices(stock, start_date, end_date)
-                total_count += count
-                success_count += 1
-            except Exception as e:
-                logger.error(f"[Task] Failed to aggregate weekly prices for {stock.code}: {e}")
-                continue
+        if len(stock_ids) > AGGREGATION_CHUNK_SIZE:
+            # 종목 청크별로 나눠 워커 풀에 분산, 결과는 콜백이 합산하여 반환
+            run.save(update_fields=["checksum"])
+            return self.replace(aggregation_chord("weekly", stock_ids, start_date, end_date, run.id))
+
+        with track_ingestion(run):
+            counts = aggregate_candles("weekly", start_date, end_date, stock_ids if stock_code else None)
+            success_count = len(counts)
+            total_count = sum(counts.values())
+            run.rows_fetched = success_count
+            run.rows_written = total_count
 
         logger.info(f"[Task] Completed weekly aggregation: {success_count} stocks, {total_count} candles")
         return {
@@ -145,6 +580,8 @@ def aggregate_weekly_prices_task(
             "end_date": end_date.isoformat()
         }
 
+    except Ignore:
+        raise
     except StockDataFetchError as exc:
         logger.error(f"[Task] Weekly aggregation failed: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=60)
@@ -158,15 +595,21 @@ def aggregate_monthly_prices_task(
     self,
     stock_code: str | None = None,
     start_date_str: str | None = None,
-    end_date_str: str | None = None
+    end_date_str: str | None = None,
+    force: bool = False
 ):
     """
-    월봉 캔들 집계 태스크
+    월봉 캔들 집계 태스크 (전체 재집계)
+
+    지정한 기간의 모든 버킷을 다시 계산합니다. 일상적인 갱신은 update_candles_task가
+    담당하며, 이 태스크는 누락/오류 복구용으로 사용합니다.
+    종목 수가 AGGREGATION_CHUNK_SIZE를 넘으면 청크별 chord로 교체되어 병렬 처리됩니다.
 
     Args:
         stock_code: 집계할 종목 코드 (None이면 모든 활성 종목)
         start_date_str: 집계 시작일 (YYYY-MM-DD), None이면 1년 전부터
         end_date_str: 집계 종료일 (YYYY-MM-DD), None이면 오늘까지
+        force: 같은 조건으로 성공한 실행 기록이 있어도 다시 집계
 
     Returns:
         dict: 성공 여부, 집계된 종목 수, 총 월봉 수
@@ -189,19 +632,27 @@ def aggregate_monthly_prices_task(
         else:
             stocks = Stock.objects.filter(is_active=True)
 
-        logger.info(f"[Task] Starting monthly aggregation for {stocks.count()} stocks")
+        stock_ids = list(stocks.values_list("id", flat=True))
+        run, skipped = begin_aggregation_run(
+            "monthly_candles", stock_code, start_date, end_date,
+            stock_ids if stock_code else None, force,
+        )
+        if skipped:
+            return skipped
 
-        total_count = 0
-        success_count = 0
+        logger.info(f"[Task] Starting monthly aggregation for {len(stock_ids)} stocks")
 
-        for stock in stocks:
-            try:
-                count = aggregate_monthly_prices(stock, start_date, end_date)
-                total_count += count
-                success_count += 1
-            except Exception as e:
-                logger.error(f"[Task] Failed to aggregate monthly prices for {stock.code}: {e}")
-                continue
+        if len(stock_ids) > AGGREGATION_CHUNK_SIZE:
+            # 종목 청크별로 나눠 워커 풀에 분산, 결과는 콜백이 합산하여 반환
+            run.save(update_fields=["checksum"])
+            return self.replace(aggregation_chord("monthly", stock_ids, start_date, end_date, run.id))
+
+        with track_ingestion(run):
+            counts = aggregate_candles("monthly", start_date, end_date, stock_ids if stock_code else None)
+            success_count = len(counts)
+            total_count = sum(counts.values())
+            run.rows_fetched = success_count
+            run.rows_written = total_count
 
         logger.info(f"[Task] Completed monthly aggregation: {success_count} stocks, {total_count} candles")
         return {
@@ -212,6 +663,8 @@ def aggregate_monthly_prices_task(
             "end_date": end_date.isoformat()
         }
 
+    except Ignore:
+        raise
     except StockDataFetchError as exc:
         logger.error(f"[Task] Monthly aggregation failed: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=60)
@@ -225,15 +678,21 @@ def aggregate_yearly_prices_task(
     self,
     stock_code: str | None = None,
     start_date_str: str | None = None,
-    end_date_str: str | None = None
+    end_date_str: str | None = None,
+    force: bool = False
 ):
     """
-    연봉 캔들 집계 태스크
+    연봉 캔들 집계 태스크 (전체 재집계)
+
+    지정한 기간의 모든 버킷을 다시 계산합니다. 일상적인 갱신은 update_candles_task가
+    담당하며, 이 태스크는 누락/오류 복구용으로 사용합니다.
+    종목 수가 AGGREGATION_CHUNK_SIZE를 넘으면 청크별 chord로 교체되어 병렬 처리됩니다.
 
     Args:
         stock_code: 집계할 종목 코드 (None이면 모든 활성 종목)
         start_date_str: 집계 시작일 (YYYY-MM-DD), None이면 5년 전부터
         end_date_str: 집계 종료일 (YYYY-MM-DD), None이면 오늘까지
+        force: 같은 조건으로 성공한 실행 기록이 있어도 다시 집계
 
     Returns:
         dict: 성공 여부, 집계된 종목 수, 총 연봉 수
@@ -256,19 +715,27 @@ def aggregate_yearly_prices_task(
         else:
             stocks = Stock.objects.filter(is_active=True)
 
-        logger.info(f"[Task] Starting yearly aggregation for {stocks.count()} stocks")
+        stock_ids = list(stocks.values_list("id", flat=True))
+        run, skipped = begin_aggregation_run(
+            "yearly_candles", stock_code, start_date, end_date,
+            stock_ids if stock_code else None, force,
+        )
+        if skipped:
+            return skipped
 
-        total_count = 0
-        success_count = 0
+        logger.info(f"[Task] Starting yearly aggregation for {len(stock_ids)} stocks")
 
-        for stock in stocks:
-            try:
-                count = aggregate_yearly_prices(stock, start_date, end_date)
-                total_count += count
-                success_count += 1
-            except Exception as e:
-                logger.error(f"[Task] Failed to aggregate yearly prices for {stock.code}: {e}")
-                continue
+        if len(stock_ids) > AGGREGATION_CHUNK_SIZE:
+            # 종목 청크별로 나눠 워커 풀에 분산, 결과는 콜백이 합산하여 반환
+            run.save(update_fields=["checksum"])
+            return self.replace(aggregation_chord("yearly", stock_ids, start_date, end_date, run.id))
+
+        with track_ingestion(run):
+            counts = aggregate_candles("yearly", start_date, end_date, stock_ids if stock_code else None)
+            success_count = len(counts)
+            total_count = sum(counts.values())
+            run.rows_fetched = success_count
+            run.rows_written = total_count
 
         logger.info(f"[Task] Completed yearly aggregation: {success_count} stocks, {total_count} candles")
         return {
@@ -279,9 +746,86 @@ def aggregate_yearly_prices_task(
             "end_date": end_date.isoformat()
         }
 
+    except Ignore:
+        raise
     except StockDataFetchError as exc:
         logger.error(f"[Task] Yearly aggregation failed: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=60)
     except Exception as exc:
         logger.error(f"[Task] Unexpected error in yearly aggregation: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def aggregate_all_prices_task(
+    self,
+    stock_code: str | None = None,
+    start_date_str: str | None = None,
+    end_date_str: str | None = None,
+    force: bool = False
+):
+    """
+    주봉/월봉/연봉 동시 집계 태스크 (전체 재집계)
+
+    일봉을 한 번만 읽어 세 캔들 타입을 함께 다시 계산합니다.
+
+    Args:
+        stock_code: 집계할 종목 코드 (None이면 모든 활성 종목)
+        start_date_str: 집계 시작일 (YYYY-MM-DD), None이면 5년 전부터
+        end_date_str: 집계 종료일 (YYYY-MM-DD), None이면 오늘까지
+        force: 같은 조건으로 성공한 실행 기록이 있어도 다시 집계
+
+    Returns:
+        dict: 성공 여부, 캔들 타입별 집계된 종목 수와 캔들 수
+    """
+    try:
+        if end_date_str:
+            end_date = date.fromisoformat(end_date_str)
+        else:
+            end_date = date.today()
+
+        if start_date_str:
+            start_date = date.fromisoformat(start_date_str)
+        else:
+            start_date = end_date - timedelta(days=365*5)
+
+        if stock_code:
+            stocks = Stock.objects.filter(code=stock_code, is_active=True)
+        else:
+            stocks = Stock.objects.filter(is_active=True)
+
+        stock_ids = list(stocks.values_list("id", flat=True)) if stock_code else None
+        run, skipped = begin_aggregation_run(
+            "all_candles", stock_code, start_date, end_date, stock_ids, force
+        )
+        if skipped:
+            return skipped
+
+        logger.info(f"[Task] Starting candle aggregation for {stocks.count()} stocks")
+
+        with track_ingestion(run):
+            counts = aggregate_all_candles(start_date, end_date, stock_ids)
+            candles = {
+                timeframe: {
+                    "stocks_count": len(per_stock),
+                    "total_candles": sum(per_stock.values()),
+                }
+                for timeframe, per_stock in counts.items()
+            }
+            run.rows_fetched = max((c["stocks_count"] for c in candles.values()), default=0)
+            run.rows_written = sum(c["total_candles"] for c in candles.values())
+
+        logger.info(f"[Task] Completed candle aggregation: {candles}")
+        return {
+            "success": True,
+            "candles": candles,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat()
+        }
+
+    except StockDataFetchError as exc:
+        logger.error(f"[Task] Candle aggregation failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    except Exception as exc:
+        logger.error(f"[Task] Unexpected error in candle aggregation: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
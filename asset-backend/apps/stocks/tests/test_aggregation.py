@@ -0,0 +1,304 @@
+"""
+캔들 집계 엔진 테스트
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.stocks.aggregation import (
+    bucket_end,
+    bucket_start,
+    apply_period_change,
+    iter_stock_candles,
+    rollup_buckets_for_dates,
+    rollup_candles,
+    rollup_timeframes,
+)
+from apps.stocks.models import Stock, DailyPrice, WeeklyPrice, MonthlyPrice, YearlyPrice
+
+
+def _create_daily_prices(stock, start, days, base=Decimal("10000")):
+    """주말을 제외한 연속 거래일 일봉 생성"""
+    prices = []
+    current = start
+    i = 0
+    while len(prices) < days:
+        if current.weekday() < 5:
+            close = base + Decimal(i * 10)
+            prices.append(DailyPrice(
+                stock=stock,
+                trade_date=current,
+                open_price=close - Decimal(5),
+                high_price=close + Decimal(i % 7 * 3),
+                low_price=close - Decimal(i % 5 * 4),
+                close_price=close,
+                volume=1000 + i,
+                amount=None if i % 4 == 0 else 100000 + i,
+            ))
+            i += 1
+        current += timedelta(days=1)
+    DailyPrice.objects.bulk_create(prices)
+    return prices
+
+
+def _reference_candles(prices, timeframe):
+    """기존 Python 집계 방식으로 계산한 기대값"""
+    buckets = {}
+    for p in sorted(prices, key=lambda p: p.trade_date):
+        buckets.setdefault(bucket_start(timeframe, p.trade_date), []).append(p)
+
+    expected = {}
+    for group in buckets.values():
+        amounts = [p.amount for p in group if p.amount]
+        expected[group[-1].trade_date] = {
+            "open_price": group[0].open_price,
+            "high_price": max(p.high_price for p in group),
+            "low_price": min(p.low_price for p in group),
+            "close_price": group[-1].close_price,
+            "volume": sum(p.volume for p in group),
+            "amount": sum(amounts) if amounts else None,
+        }
+    return expected
+
+
+def _stored_candles(model, stock):
+    return {
+        c.trade_date: {
+            "open_price": c.open_price,
+            "high_price": c.high_price,
+            "low_price": c.low_price,
+            "close_price": c.close_price,
+            "volume": c.volume,
+            "amount": c.amount,
+        }
+        for c in model.objects.filter(stock=stock)
+    }
+
+
+@pytest.mark.unit
+class TestBucketStart:
+    def test_bucket_start(self):
+        d = date(2024, 11, 27)  # 수요일
+        assert bucket_start("weekly", d) == date(2024, 11, 25)
+        assert bucket_start("monthly", d) == date(2024, 11, 1)
+        assert bucket_start("yearly", d) == date(2024, 1, 1)
+
+    def test_bucket_start_unknown_timeframe(self):
+        with pytest.raises(ValueError):
+            bucket_start("hourly", date(2024, 11, 27))
+
+
+@pytest.mark.django_db
+class TestRollupCandles:
+    @pytest.mark.parametrize("timeframe, model", [
+        ("weekly", WeeklyPrice),
+        ("monthly", MonthlyPrice),
+        ("yearly", YearlyPrice),
+    ])
+    def test_rollup_matches_reference(self, stock, timeframe, model):
+        other = Stock.objects.create(code="000660", name="SK하이닉스", market="KOSPI")
+        prices = _create_daily_prices(stock, date(2023, 12, 20), 60)
+        other_prices = _create_daily_prices(other, date(2024, 1, 3), 30, base=Decimal("50000"))
+
+        counts = rollup_candles(timeframe, date(2023, 12, 20), date(2024, 3, 31))
+
+        assert _stored_candles(model, stock) == _reference_candles(prices, timeframe)
+        assert _stored_candles(model, other) == _reference_candles(other_prices, timeframe)
+        assert counts[stock.id] == len(_reference_candles(prices, timeframe))
+
+    def test_rollup_aligns_start_to_bucket(self, stock):
+        """시작일이 주 중간이어도 해당 주 전체를 집계"""
+        prices = _create_daily_prices(stock, date(2024, 11, 25), 5)
+
+        rollup_candles("weekly", date(2024, 11, 27), date(2024, 11, 29))
+
+        candle = WeeklyPrice.objects.get(stock=stock)
+        assert candle.trade_date == date(2024, 11, 29)
+        assert candle.open_price == prices[0].open_price
+        assert candle.volume == sum(p.volume for p in prices)
+
+    def test_rollup_replaces_stale_candle(self, stock):
+        """주 중간 집계 이후 거래일이 추가되면 이전 캔들을 대체"""
+        _create_daily_prices(stock, date(2024, 11, 25), 3)
+        rollup_candles("weekly", date(2024, 11, 25), date(2024, 11, 27))
+        assert WeeklyPrice.objects.get(stock=stock).trade_date == date(2024, 11, 27)
+
+        _create_daily_prices(stock, date(2024, 11, 28), 2)
+        rollup_candles("weekly", date(2024, 11, 25), date(2024, 11, 29))
+
+        assert list(WeeklyPrice.objects.filter(stock=stock).values_list("trade_date", flat=True)) == [
+            date(2024, 11, 29)
+        ]
+
+    def test_rollup_skips_inactive_stocks(self, stock):
+        stock.is_active = False
+        stock.save()
+        _create_daily_prices(stock, date(2024, 11, 25), 5)
+
+        assert rollup_candles("weekly", date(2024, 11, 25), date(2024, 11, 29)) == {}
+        assert rollup_candles("weekly", date(2024, 11, 25), date(2024, 11, 29), []) == {}
+        assert WeeklyPrice.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestRollupBucketsForDates:
+    def test_incremental_matches_full_rebuild(self, stock):
+        prices = _create_daily_prices(stock, date(2024, 1, 2), 80)
+        history_end = prices[-2].trade_date
+        DailyPrice.objects.filter(trade_date__gt=history_end).delete()
+        rollup_candles("weekly", date(2024, 1, 1), history_end)
+        rollup_candles("monthly", date(2024, 1, 1), history_end)
+        rollup_candles("yearly", date(2024, 1, 1), history_end)
+
+        # 새 거래일 적재 후 증분 집계
+        DailyPrice.objects.bulk_create([prices[-1]])
+        result = rollup_buckets_for_dates([prices[-1].trade_date])
+
+        assert result == {"weekly": 1, "monthly": 1, "yearly": 1}
+        for timeframe, model in [
+            ("weekly", WeeklyPrice),
+            ("monthly", MonthlyPrice),
+            ("yearly", YearlyPrice),
+        ]:
+            assert _stored_candles(model, stock) == _reference_candles(prices, timeframe)
+
+    def test_only_stocks_with_new_rows(self, stock):
+        other = Stock.objects.create(code="000660", name="SK하이닉스", market="KOSPI")
+        _create_daily_prices(stock, date(2024, 11, 25), 5)
+        _create_daily_prices(other, date(2024, 11, 18), 5)
+
+        rollup_buckets_for_dates([date(2024, 11, 29)])
+
+        assert WeeklyPrice.objects.filter(stock=stock).count() == 1
+        assert not WeeklyPrice.objects.filter(stock=other).exists()
+
+    def test_bucket_end(self):
+        assert bucket_end("weekly", date(2024, 11, 27)) == date(2024, 12, 1)
+        assert bucket_end("quarterly", date(2024, 11, 27)) == date(2024, 12, 31)
+        assert bucket_end("monthly", date(2024, 2, 10)) == date(2024, 2, 29)
+        assert bucket_end("monthly", date(2024, 12, 10)) == date(2024, 12, 31)
+        assert bucket_end("yearly", date(2024, 2, 10)) == date(2024, 12, 31)
+
+
+@pytest.mark.django_db
+class TestRollupTimeframes:
+    def test_single_pass_matches_reference(self, stock):
+        other = Stock.objects.create(code="000660", name="SK하이닉스", market="KOSPI")
+        prices = _create_daily_prices(stock, date(2023, 11, 1), 120)
+        other_prices = _create_daily_prices(other, date(2024, 1, 3), 30, base=Decimal("50000"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            counts = rollup_timeframes(date(2023, 11, 1), date(2024, 6, 30))
+
+        daily_reads = [q for q in ctx.captured_queries if "FROM \"stocks_dailyprice\"" in q["sql"]]
+        assert len(daily_reads) == 1
+        for timeframe, model in [
+            ("weekly", WeeklyPrice),
+            ("monthly", MonthlyPrice),
+            ("yearly", YearlyPrice),
+        ]:
+            assert _stored_candles(model, stock) == _reference_candles(prices, timeframe)
+            assert _stored_candles(model, other) == _reference_candles(other_prices, timeframe)
+            assert counts[timeframe][stock.id] == len(_reference_candles(prices, timeframe))
+
+    def test_quarterly_bucket(self, stock):
+        prices = _create_daily_prices(stock, date(2024, 1, 2), 140)
+
+        [(stock_id, candles)] = list(
+            iter_stock_candles(date(2024, 1, 1), date(2024, 12, 31), [stock.id], ("quarterly",))
+        )
+
+        assert stock_id == stock.id
+        expected = _reference_candles(prices, "quarterly")
+        assert {c["trade_date"]: c["close_price"] for c in candles["quarterly"]} == {
+            d: v["close_price"] for d, v in expected.items()
+        }
+        assert [c["bucket"] for c in candles["quarterly"]] == [
+            date(2024, 1, 1), date(2024, 4, 1), date(2024, 7, 1)
+        ]
+
+    def test_rejects_timeframe_without_table(self):
+        with pytest.raises(ValueError):
+            rollup_timeframes(date(2024, 1, 1), date(2024, 12, 31), timeframes=("quarterly",))
+
+    def test_rebuild_from_early_january_keeps_previous_year(self, stock):
+        """주봉 때문에 12월 말 일봉을 읽어도 12월 월봉/2024 연봉은 덮어쓰지 않음"""
+        prices = _create_daily_prices(stock, date(2024, 11, 1), 65)
+        rollup_timeframes(date(2024, 11, 1), date(2025, 1, 31))
+
+        rollup_timeframes(date(2025, 1, 1), date(2025, 1, 31))
+
+        for timeframe, model in [
+            ("weekly", WeeklyPrice),
+            ("monthly", MonthlyPrice),
+            ("yearly", YearlyPrice),
+        ]:
+            assert _stored_candles(model, stock) == _reference_candles(prices, timeframe)
+        december, january = MonthlyPrice.objects.filter(stock=stock).order_by("trade_date")[1:]
+        assert january.change == january.close_price - december.close_price
+
+
+@pytest.mark.unit
+class TestApplyPeriodChange:
+    def test_lag_and_market_cap_forward_fill(self):
+        candles = [
+            {"close_price": Decimal("100"), "market_cap": None},
+            {"close_price": Decimal("110"), "market_cap": 5000},
+            {"close_price": Decimal("99"), "market_cap": None},
+        ]
+
+        apply_period_change(candles, previous=(Decimal("80"), 4000))
+
+        assert [c["change"] for c in candles] == [Decimal("20.00"), Decimal("10.00"), Decimal("-11.00")]
+        assert [c["change_rate"] for c in candles] == [
+            Decimal("25.00"), Decimal("10.00"), Decimal("-10.00")
+        ]
+        assert [c["market_cap"] for c in candles] == [4000, 5000, 5000]
+
+    def test_first_candle_without_previous(self):
+        candles = [
+            {"close_price": Decimal("100"), "market_cap": None},
+            {"close_price": Decimal("150"), "market_cap": None},
+        ]
+
+        apply_period_change(candles)
+
+        assert candles[0]["change"] is None
+        assert candles[0]["change_rate"] is None
+        assert candles[1]["change"] == Decimal("50.00")
+        assert candles[1]["change_rate"] == Decimal("50.00")
+        assert candles[1]["market_cap"] is None
+
+
+@pytest.mark.django_db
+class TestCandlePeriodChange:
+    @pytest.mark.parametrize("entry", ["rollup_candles", "rollup_timeframes"])
+    def test_change_and_market_cap_filled(self, stock, entry):
+        prices = _create_daily_prices(stock, date(2024, 11, 4), 15)
+        DailyPrice.objects.filter(stock=stock, trade_date=date(2024, 11, 14)).update(market_cap=900)
+
+        if entry == "rollup_candles":
+            rollup_candles("weekly", date(2024, 11, 4), date(2024, 11, 22))
+        else:
+            rollup_timeframes(date(2024, 11, 4), date(2024, 11, 22), timeframes=("weekly",))
+
+        weeks = list(WeeklyPrice.objects.filter(stock=stock).order_by("trade_date"))
+        closes = [p.close_price for p in prices if p.trade_date.weekday() == 4]
+        assert [w.close_price for w in weeks] == closes
+        assert weeks[0].change is None
+        assert weeks[1].change == closes[1] - closes[0]
+        assert weeks[1].change_rate == ((closes[1] - closes[0]) / closes[0] * 100).quantize(Decimal("0.01"))
+        assert [w.market_cap for w in weeks] == [None, 900, 900]
+
+    def test_incremental_uses_previous_stored_candle(self, stock):
+        prices = _create_daily_prices(stock, date(2024, 11, 4), 15)
+        rollup_candles("weekly", date(2024, 11, 4), date(2024, 11, 22))
+        WeeklyPrice.objects.filter(stock=stock, trade_date=date(2024, 11, 22)).delete()
+
+        rollup_buckets_for_dates([date(2024, 11, 22)], timeframes=("weekly",))
+
+        last_week = WeeklyPrice.objects.get(stock=stock, trade_date=date(2024, 11, 22))
+        assert last_week.change == prices[-1].close_price - prices[-6].close_price
@@ -0,0 +1,136 @@
+"""
+원본 응답 보관소 테스트
+"""
+import pytest
+import pandas as pd
+from datetime import date
+from unittest.mock import patch
+
+from apps.common.archive import archive_mode, archive_path, archived_fetch, save_frame
+from apps.common.exceptions import ArchiveMissError, StockDataFetchError
+from apps.stocks.models import DailyPrice
+from apps.stocks.services import sync_daily_prices_from_krx
+
+
+@pytest.fixture
+def archive_dir(settings, tmp_path):
+    settings.RAW_ARCHIVE_DIR = tmp_path
+    settings.RAW_ARCHIVE_MODE = "record"
+    return tmp_path
+
+
+def _ohlcv_frame():
+    return pd.DataFrame({
+        "시가": [70000],
+        "고가": [71000],
+        "저가": [69000],
+        "종가": [70500],
+        "거래량": [1000000],
+        "거래대금": [70500000000],
+        "등락률": [0.71],
+    }, index=pd.Index(["005930"], name="티커"))
+
+
+class TestArchivedFetch:
+    """archived_fetch 테스트"""
+
+    def test_round_trip_preserves_frame(self, archive_dir):
+        df = _ohlcv_frame()
+
+        archived_fetch("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"}, lambda: df)
+
+        path = archive_path("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"})
+        assert path == archive_dir / "krx" / "ohlcv_by_ticker" / "2024-11-25" / "market=ALL.parquet"
+        with archive_mode("offline"):
+            loaded = archived_fetch(
+                "krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"},
+                lambda: pytest.fail("network fetch in offline mode"),
+            )
+        pd.testing.assert_frame_equal(loaded, df)
+
+    def test_record_reuses_fresh_archive(self, archive_dir):
+        """record 모드에서 재시도는 방금 저장한 보관본 사용"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return _ohlcv_frame()
+
+        for _ in range(2):
+            archived_fetch("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"}, fetch)
+
+        assert len(calls) == 1
+
+    def test_record_refetches_stale_archive(self, archive_dir, settings):
+        settings.RAW_ARCHIVE_MAX_AGE = -1
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return _ohlcv_frame()
+
+        for _ in range(2):
+            archived_fetch("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"}, fetch)
+
+        assert len(calls) == 2
+
+    def test_offline_miss_raises(self, archive_dir):
+        with archive_mode("offline"), pytest.raises(ArchiveMissError):
+            archived_fetch("krx", "ohlcv_by_ticker", date(2024, 11, 25), {}, _ohlcv_frame)
+
+    def test_empty_payload_is_refetched(self, archive_dir):
+        """일시 장애로 받은 빈 응답은 보관하지 않고 다음 조회에서 다시 받음"""
+        key = ("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"})
+        archived_fetch(*key, pd.DataFrame)
+
+        assert not archive_path(*key).exists()
+        with archive_mode("replay"):
+            df = archived_fetch(*key, _ohlcv_frame)
+        pd.testing.assert_frame_equal(df, _ohlcv_frame())
+
+    def test_archived_empty_payload_is_not_replayed(self, archive_dir):
+        key = ("krx", "ohlcv_by_ticker", date(2024, 11, 25), {"market": "ALL"})
+        save_frame(archive_path(*key), pd.DataFrame())
+
+        with archive_mode("replay"):
+            df = archived_fetch(*key, _ohlcv_frame)
+
+        pd.testing.assert_frame_equal(df, _ohlcv_frame())
+
+    def test_off_mode_does_not_write(self, archive_dir, settings):
+        settings.RAW_ARCHIVE_MODE = "off"
+
+        archived_fetch("krx", "ohlcv_by_ticker", date(2024, 11, 25), {}, _ohlcv_frame)
+
+        assert list(archive_dir.iterdir()) == []
+
+
+@pytest.mark.django_db
+class TestDailyPriceReplay:
+    """보관본 기반 일봉 재적재 테스트"""
+
+    def test_reingest_from_archive(self, archive_dir, stock):
+        with patch("pykrx.stock.get_market_ohlcv_by_ticker") as mock_get_ohlcv, \
+                patch("pykrx.stock.get_market_cap_by_ticker") as mock_get_market_cap:
+            mock_get_ohlcv.return_value = _ohlcv_frame()
+            mock_get_market_cap.return_value = pd.DataFrame(
+                {"시가총액": [420000000000000]}, index=["005930"]
+            )
+            assert sync_daily_prices_from_krx(date(2024, 11, 25)) == 1
+
+        DailyPrice.objects.all().delete()
+
+        with archive_mode("offline"), \
+                patch("pykrx.stock.get_market_ohlcv_by_ticker") as mock_get_ohlcv, \
+                patch("pykrx.stock.get_market_cap_by_ticker") as mock_get_market_cap:
+            assert sync_daily_prices_from_krx(date(2024, 11, 25)) == 1
+
+        mock_get_ohlcv.assert_not_called()
+        mock_get_market_cap.assert_not_called()
+        price = DailyPrice.objects.get()
+        assert price.close_price == 70500
+        assert price.market_cap == 420000000000000
+
+    def test_offline_without_archive_fails(self, archive_dir, stock):
+        with archive_mode("offline"), patch("time.sleep"), pytest.raises(StockDataFetchError):
+            sync_daily_prices_from_krx(date(2024, 11, 25))
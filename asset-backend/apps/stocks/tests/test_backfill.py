@@ -0,0 +1,152 @@
+"""
+일봉 백필 테스트
+"""
+import pytest
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from apps.stocks.backfill import (
+    MAX_EMPTY_DAY_ATTEMPTS,
+    backfill_date,
+    backfill_dates,
+    pending_backfill_dates,
+    run_backfill,
+)
+from apps.stocks.models import BackfillCheckpoint, MarketHoliday
+
+
+@pytest.mark.django_db
+def test_backfill_dates_skip_non_trading_days():
+    """주말과 휴장일은 백필 대상에서 제외"""
+    MarketHoliday.objects.create(date=date(2024, 1, 8), name="임시 휴장")
+
+    dates = backfill_dates(date(2024, 1, 5), date(2024, 1, 9))
+
+    assert dates == [date(2024, 1, 5), date(2024, 1, 9)]
+
+
+@pytest.mark.django_db
+class TestRunBackfill:
+    """run_backfill 테스트"""
+
+    def test_records_checkpoints(self):
+        """날짜별 체크포인트와 처리량 기록"""
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+            mock_sync.return_value = 100
+            summary = run_backfill(date(2024, 1, 2), date(2024, 1, 4), workers=1)
+
+        assert summary["completed"] == 3
+        assert summary["failed"] == 0
+        assert summary["rows"] == 300
+        assert summary["rows_per_sec"] > 0
+        assert summary["loaded_dates"] == [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)]
+
+        statuses = dict(BackfillCheckpoint.objects.values_list("trade_date", "status"))
+        assert set(statuses.values()) == {"done"}
+
+    def test_empty_trading_day_is_retried(self):
+        """거래일에 0행이면 일시 장애로 보고 다음 실행에서 다시 적재"""
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync, \
+                patch("apps.stocks.backfill.check_krx_business_day", return_value=True):
+            mock_sync.side_effect = lambda d: 0 if d == date(2024, 1, 3) else 100
+            first = run_backfill(date(2024, 1, 2), date(2024, 1, 4), workers=1)
+
+        assert first["failed_dates"] == [date(2024, 1, 3)]
+        assert BackfillCheckpoint.objects.get(trade_date=date(2024, 1, 3)).status == "failed"
+
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+            mock_sync.return_value = 100
+            run_backfill(date(2024, 1, 2), date(2024, 1, 4), workers=1)
+
+        mock_sync.assert_called_once_with(date(2024, 1, 3))
+
+    def test_empty_holiday_is_complete(self):
+        """휴장일로 확인된 날짜의 0행은 데이터 없음으로 완료"""
+        MarketHoliday.objects.create(date=date(2024, 1, 3), name="임시 휴장")
+
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx", return_value=0):
+            result = backfill_date(date(2024, 1, 3))
+
+        assert result["status"] == "empty"
+        assert pending_backfill_dates([date(2024, 1, 3)]) == []
+
+    def test_unseeded_holiday_confirmed_by_krx_is_complete(self):
+        """휴장일 테이블에 없는 평일 공휴일은 KRX로 휴장을 확인해 완료하고 휴장일로 기록"""
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx", return_value=0), \
+                patch("apps.stocks.backfill.check_krx_business_day", return_value=False):
+            result = backfill_date(date(2024, 2, 9))
+
+        assert result["status"] == "empty"
+        assert MarketHoliday.objects.filter(date=date(2024, 2, 9)).exists()
+        assert date(2024, 2, 9) not in backfill_dates(date(2024, 2, 8), date(2024, 2, 13))
+
+    def test_unconfirmed_empty_day_completes_after_max_attempts(self):
+        """KRX로 확인할 수 없는 0행 날짜는 정해진 횟수만큼 재시도한 뒤 데이터 없음으로 완료"""
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx", return_value=0), \
+                patch("apps.stocks.backfill.check_krx_business_day", return_value=None):
+            statuses = [
+                run_backfill(date(2024, 2, 9), date(2024, 2, 9), workers=1)["failed"]
+                for _ in range(MAX_EMPTY_DAY_ATTEMPTS)
+            ]
+
+        assert statuses == [1] * (MAX_EMPTY_DAY_ATTEMPTS - 1) + [0]
+        checkpoint = BackfillCheckpoint.objects.get(trade_date=date(2024, 2, 9))
+        assert checkpoint.status == "empty"
+        assert checkpoint.attempts == MAX_EMPTY_DAY_ATTEMPTS
+        assert pending_backfill_dates([date(2024, 2, 9)]) == []
+
+    def test_resumes_after_failure(self):
+        """중단된 백필은 완료되지 않은 날짜부터 이어서 진행"""
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+            mock_sync.side_effect = [100, Exception("KRX timeout"), 100]
+            first = run_backfill(date(2024, 1, 2), date(2024, 1, 4), workers=1)
+
+        assert first["failed"] == 1
+        assert first["failed_dates"] == [date(2024, 1, 3)]
+        failed = BackfillCheckpoint.objects.get(trade_date=date(2024, 1, 3))
+        assert failed.status == "failed"
+        assert "KRX timeout" in failed.error
+
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+            mock_sync.return_value = 100
+            second = run_backfill(date(2024, 1, 2), date(2024, 1, 4), workers=1)
+
+        mock_sync.assert_called_once_with(date(2024, 1, 3))
+        assert second["skipped"] == 2
+        assert second["completed"] == 1
+        assert pending_backfill_dates(backfill_dates(date(2024, 1, 2), date(2024, 1, 4))) == []
+
+    def test_force_reloads_completed_dates(self):
+        """force=True면 완료된 날짜도 다시 적재"""
+        BackfillCheckpoint.objects.create(trade_date=date(2024, 1, 2), status="done", rows=100)
+
+        with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+            mock_sync.return_value = 100
+            summary = run_backfill(date(2024, 1, 2), date(2024, 1, 2), workers=1, force=True)
+
+        mock_sync.assert_called_once_with(date(2024, 1, 2))
+        assert summary["skipped"] == 0
+
+
+@pytest.mark.django_db
+def test_backfill_command_reports_progress():
+    """백필 명령은 날짜별 진행 상황과 처리량 출력"""
+    out = StringIO()
+    with patch("apps.stocks.backfill.sync_daily_prices_from_krx") as mock_sync:
+        mock_sync.return_value = 100
+        call_command(
+            "backfill_daily_prices",
+            "--start", "2024-01-02",
+            "--end", "2024-01-03",
+            "--workers", "1",
+            "--skip-candles",
+            stdout=out,
+        )
+
+    output = out.getvalue()
+    assert "[2/2] 2024-01-03: done 100 rows" in output
+    assert "2 completed, 0 skipped, 0 failed, 200 rows" in output
+    assert "rows/sec" in output
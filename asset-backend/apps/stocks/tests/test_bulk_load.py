@@ -0,0 +1,166 @@
+"""
+COPY 기반 대용량 적재 테스트
+
+COPY/병합은 PostgreSQL 전용이므로 SQLite에서는 파일 읽기, COPY 텍스트 변환, SQL 생성과
+커서 모의 객체로 적재 단계 순서를 검증하고, 실제 COPY -> 스테이징 -> 병합은
+PostgreSQL에서만 실행되는 integration 테스트로 검증합니다.
+"""
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from apps.common.bulk_load import (
+    LOAD_TARGETS,
+    STAGING_TABLE,
+    bulk_load,
+    frame_to_copy_buffer,
+    iter_frames,
+    merge_sql,
+)
+from apps.crypto.models import CoinCandle
+from apps.stocks.models import DailyPrice, Stock
+
+KRX_COLUMNS = list(LOAD_TARGETS["krx_daily"].columns)
+
+
+class TestIterFrames:
+    def test_csv_streams_chunks_as_text(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        path.write_text(
+            "code,trade_date,open_price,high_price,low_price,close_price,volume,extra\n"
+            "005930,2024-11-25,70000.10,71000,69000,70500,1000000,x\n"
+            "000660,2024-11-25,120000,125000,119000,124000,500000,y\n"
+            "035720,2024-11-25,40000,41000,39000,40500,,z\n"
+        )
+
+        frames = list(iter_frames(path, KRX_COLUMNS, chunk_size=2))
+
+        assert [len(f) for f in frames] == [2, 1]
+        assert list(frames[0].columns) == KRX_COLUMNS
+        # 문자열 그대로 유지하여 소수 정밀도 보존
+        assert frames[0].loc[0, "open_price"] == "70000.10"
+        assert frames[0].loc[0, "code"] == "005930"
+        assert pd.isna(frames[1].iloc[0]["volume"])
+        assert frames[0]["market_cap"].isna().all()
+
+    def test_parquet_reads_only_target_columns(self, tmp_path):
+        path = tmp_path / "candles.parquet"
+        pd.DataFrame({
+            "market_code": ["KRW-BTC"],
+            "trade_date": [datetime(2024, 11, 27)],
+            "open_price": [0.00012345],
+            "close_price": [50000000.5],
+            "ignored": [1],
+        }).to_parquet(path)
+
+        (frame,) = iter_frames(path, list(LOAD_TARGETS["upbit_candles"].columns))
+
+        assert list(frame.columns) == list(LOAD_TARGETS["upbit_candles"].columns)
+        assert frame["candle_type"].isna().all()
+
+    def test_unsupported_file_type(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(iter_frames(tmp_path / "prices.xlsx", KRX_COLUMNS))
+
+
+def test_frame_to_copy_buffer_formats_dates_and_nulls():
+    frame = pd.DataFrame({
+        "code": ["005930"],
+        "trade_date": pd.to_datetime(["2024-11-25"]),
+        "amount": [None],
+    })
+
+    assert frame_to_copy_buffer(frame).getvalue() == "005930,2024-11-25,\n"
+
+
+def test_merge_sql_joins_codes_and_upserts_once():
+    sql = merge_sql(LOAD_TARGETS["upbit_candles"])
+
+    assert sql.startswith('INSERT INTO "crypto_coin_candle"')
+    assert 'JOIN "crypto_coin" ref ON ref."market_code" = st."market_code"' in sql
+    assert 'DISTINCT ON (st."market_code", st."candle_type", st."trade_date")' in sql
+    assert 'ON CONFLICT ("coin_id", "candle_type", "trade_date") DO UPDATE SET' in sql
+    assert '"created_at" = EXCLUDED' not in sql
+    assert '"updated_at" = EXCLUDED."updated_at"' in sql
+
+
+@pytest.mark.django_db
+def test_command_requires_postgresql(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("code,trade_date\n")
+
+    with pytest.raises(CommandError, match="PostgreSQL"):
+        call_command("bulk_load_prices", "krx_daily", str(path))
+
+
+def test_load_targets_use_model_tables():
+    assert LOAD_TARGETS["krx_daily"].table == DailyPrice._meta.db_table
+    assert LOAD_TARGETS["krx_daily"].ref_table == Stock._meta.db_table
+    assert LOAD_TARGETS["upbit_candles"].table == CoinCandle._meta.db_table
+
+
+@pytest.mark.django_db
+def test_bulk_load_copies_chunks_then_merges(tmp_path):
+    """청크마다 스테이징에 COPY하고 참조 생성 후 병합은 한 번만 실행"""
+    path = tmp_path / "prices.csv"
+    path.write_text(
+        "code,trade_date,open_price,high_price,low_price,close_price,volume\n"
+        "005930,2024-11-25,70000,71000,69000,70500,1000\n"
+        "000660,2024-11-25,120000,125000,119000,124000,500\n"
+        "035720,2024-11-25,40000,41000,39000,40500,300\n"
+    )
+    fake_connection = MagicMock(vendor="postgresql")
+    fake_connection.ops.quote_name = connection.ops.quote_name
+    cursor = fake_connection.cursor.return_value.__enter__.return_value
+    cursor.rowcount = 3
+    copy = cursor.copy.return_value.__enter__.return_value
+
+    with patch("apps.common.bulk_load.connection", fake_connection):
+        summary = bulk_load(path, "krx_daily", chunk_size=2, create_missing=True)
+
+    executed = [c.args[0] for c in cursor.execute.call_args_list]
+    assert executed[0] == "SET LOCAL synchronous_commit = off"
+    assert executed[1].startswith(f"CREATE TEMPORARY TABLE {STAGING_TABLE}")
+    assert executed[2] == f"ANALYZE {STAGING_TABLE}"
+    assert executed[3].startswith('INSERT INTO "stocks_stock"')
+    assert executed[4] == merge_sql(LOAD_TARGETS["krx_daily"])
+    assert cursor.copy.call_count == 2
+    written = "".join(c.args[0] for c in copy.write.call_args_list)
+    assert written.splitlines()[0] == "005930,2024-11-25,70000,71000,69000,70500,1000,,,,"
+    assert summary["rows_read"] == 3
+    assert summary["rows_merged"] == 3
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY requires PostgreSQL")
+def test_bulk_load_merges_into_postgresql(tmp_path):
+    """스테이징 병합: 코드 조인, 필수 값 누락 행 제외, 중복 키는 나중 행, 기존 행 갱신"""
+    stock = Stock.objects.create(code="005930", name="삼성전자")
+    DailyPrice.objects.create(
+        stock=stock, trade_date=date(2024, 11, 25), open_price=1, high_price=1,
+        low_price=1, close_price=1, volume=1,
+    )
+    path = tmp_path / "prices.csv"
+    path.write_text(
+        "code,trade_date,open_price,high_price,low_price,close_price,volume\n"
+        "005930,2024-11-25,70000,71000,69000,70500,1000\n"
+        "005930,2024-11-25,70000,71000,69000,70600,1100\n"
+        "000660,2024-11-25,120000,125000,119000,124000,500\n"
+        "035720,2024-11-25,40000,41000,39000,40500,\n"
+    )
+
+    summary = bulk_load(path, "krx_daily", chunk_size=2, create_missing=True)
+
+    assert summary["rows_read"] == 4
+    assert summary["rows_merged"] == 2
+    saved = dict(DailyPrice.objects.values_list("stock__code", "close_price"))
+    assert saved == {"005930": Decimal("70600"), "000660": Decimal("124000")}
+    assert DailyPrice.objects.get(stock=stock).volume == 1100
+    assert Stock.objects.filter(code="000660", name="000660").exists()
@@ -0,0 +1,140 @@
+"""
+수집 실패 기록 및 종목별 재수집 테스트
+"""
+import pytest
+import pandas as pd
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from apps.common.failures import (
+    FAILURE_MAX_ATTEMPTS,
+    due_failures,
+    mark_retry_failed,
+    record_failure,
+)
+from apps.common.models import FetchFailure
+from apps.stocks.models import DailyPrice
+from apps.stocks.services import sync_daily_prices_from_krx
+from apps.stocks.tasks import retry_failed_daily_prices_task
+
+TRADE_DATE = date(2024, 11, 25)
+
+
+def _make_due():
+    FetchFailure.objects.update(next_retry_at=timezone.now() - timedelta(seconds=1))
+
+
+@pytest.mark.django_db
+class TestFailureLedger:
+    def test_record_failure_is_idempotent(self):
+        record_failure("krx", "daily_price", "005930", TRADE_DATE, "timeout")
+        failure = record_failure("krx", "daily_price", "005930", TRADE_DATE, "reset")
+
+        assert FetchFailure.objects.count() == 1
+        assert failure.error == "reset"
+        assert failure.status == "pending"
+        assert failure.next_retry_at > timezone.now()
+
+    def test_due_failures_respects_backoff(self):
+        record_failure("krx", "daily_price", "005930", TRADE_DATE, "timeout")
+        assert list(due_failures("krx")) == []
+
+        _make_due()
+        assert [f.item for f in due_failures("krx")] == ["005930"]
+
+    def test_mark_retry_failed_backs_off_then_abandons(self):
+        failure = record_failure("krx", "daily_price", "005930", TRADE_DATE, "timeout")
+
+        mark_retry_failed(failure, "timeout")
+        first_delay = failure.next_retry_at - timezone.now()
+        mark_retry_failed(failure, "timeout")
+        assert failure.next_retry_at - timezone.now() > first_delay
+
+        for _ in range(FAILURE_MAX_ATTEMPTS - 2):
+            mark_retry_failed(failure, "timeout")
+        assert failure.status == "abandoned"
+        assert failure.next_retry_at is None
+
+
+@pytest.mark.django_db
+class TestDailyPriceFailureRetry:
+    @patch("pykrx.stock.get_market_cap_by_ticker", return_value=pd.DataFrame())
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_records_invalid_rows(self, mock_get_ohlcv, mock_get_market_cap, stock):
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000, None],
+            "고가": [71000, 125000],
+            "저가": [69000, 119000],
+            "종가": [70500, 124000],
+            "거래량": [1000000, 500000],
+        }, index=["005930", "000660"])
+
+        sync_daily_prices_from_krx(TRADE_DATE)
+
+        failure = FetchFailure.objects.get()
+        assert (failure.source, failure.dataset, failure.item) == ("krx", "daily_price", "000660")
+        assert failure.target_date == TRADE_DATE
+
+    @patch("apps.stocks.tasks.update_candles_task.delay")
+    @patch("pykrx.stock.get_market_ohlcv")
+    def test_retry_refetches_only_failed_tickers(self, mock_get_ohlcv, mock_update_candles, stock):
+        for code in ("005930", "000660", "035720"):
+            record_failure("krx", "daily_price", code, TRADE_DATE, "timeout")
+        _make_due()
+
+        def fetch(start, end, code):
+            if code == "035720":
+                raise ConnectionError("reset by peer")
+            return pd.DataFrame({
+                "시가": [70000], "고가": [71000], "저가": [69000],
+                "종가": [70500], "거래량": [1000000],
+            }, index=pd.to_datetime([TRADE_DATE]))
+
+        mock_get_ohlcv.side_effect = fetch
+
+        result = retry_failed_daily_prices_task()
+
+        assert mock_get_ohlcv.call_count == 3
+        assert result["retried"] == 3
+        assert result["resolved"] == 2
+        assert result["failed"] == 1
+        assert set(
+            DailyPrice.objects.filter(trade_date=TRADE_DATE).values_list("stock__code", flat=True)
+        ) == {"005930", "000660"}
+        mock_update_candles.assert_called_once_with([TRADE_DATE.isoformat()])
+
+        pending = FetchFailure.objects.get(status="pending")
+        assert pending.item == "035720"
+        assert pending.attempts == 1
+        assert "reset by peer" in pending.error
+
+        # 백오프 중인 항목은 다음 실행에서 다시 조회하지 않음
+        mock_get_ohlcv.reset_mock()
+        assert retry_failed_daily_prices_task()["retried"] == 0
+        mock_get_ohlcv.assert_not_called()
+
+    @patch("apps.stocks.tasks.update_candles_task.delay")
+    @patch("pykrx.stock.get_market_ohlcv")
+    def test_retry_keeps_columns_missing_from_ticker_ohlcv(self, mock_get_ohlcv, mock_update_candles, stock):
+        """종목별 OHLCV에 없는 등락/거래대금은 저장된 값을 유지"""
+        DailyPrice.objects.create(
+            stock=stock, trade_date=TRADE_DATE, open_price=70000, high_price=71000,
+            low_price=69000, close_price=70000, volume=900000, amount=63000000000,
+            change=Decimal("1800"), change_rate=Decimal("2.64"), market_cap=420000000000000,
+        )
+        record_failure("krx", "daily_price", stock.code, TRADE_DATE, "timeout")
+        _make_due()
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000], "고가": [71000], "저가": [69000],
+            "종가": [70500], "거래량": [1000000], "등락률": [2.69],
+        }, index=pd.to_datetime([TRADE_DATE]))
+
+        assert retry_failed_daily_prices_task()["resolved"] == 1
+
+        price = DailyPrice.objects.get(stock=stock, trade_date=TRADE_DATE)
+        assert (price.close_price, price.volume, price.change_rate) == (70500, 1000000, Decimal("2.69"))
+        assert (price.change, price.amount) == (Decimal("1800"), 63000000000)
+        assert price.market_cap == 420000000000000
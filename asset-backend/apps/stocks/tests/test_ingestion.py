@@ -0,0 +1,123 @@
+"""
+수집 실행 기록(IngestionRun) 기반 중복 실행 방지 테스트
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.utils import timezone
+
+from apps.common.ingestion import previous_run, start_ingestion
+from apps.common.models import IngestionRun
+from apps.stocks.models import DailyPrice, Stock
+from apps.stocks.tasks import aggregate_weekly_prices_task, sync_daily_prices_task
+
+SYNC_RESULT = {"count": 600, "written": 600, "skipped": 0, "checksum": "abc", "stock_ids": [1]}
+
+
+@pytest.mark.django_db
+class TestDailyPriceIngestionRun:
+    def test_records_run(self):
+        with patch("apps.stocks.tasks.sync_daily_price_changes", return_value=SYNC_RESULT), \
+                patch("apps.stocks.tasks.update_candles_task.delay"):
+            sync_daily_prices_task(target_date_str="2025-01-15")
+
+        run = IngestionRun.objects.get()
+        assert (run.pipeline, run.source, run.target_date) == ("daily_prices", "krx", date(2025, 1, 15))
+        assert run.status == "success"
+        assert (run.rows_fetched, run.rows_written, run.rows_skipped) == (600, 600, 0)
+        assert run.checksum == "abc"
+        assert run.finished_at is not None
+
+    def test_skips_already_ingested_date_unless_forced(self):
+        with patch("apps.stocks.tasks.sync_daily_price_changes", return_value=SYNC_RESULT) as mock_sync, \
+                patch("apps.stocks.tasks.update_candles_task.delay"):
+            sync_daily_prices_task(target_date_str="2025-01-15")
+            result = sync_daily_prices_task(target_date_str="2025-01-15")
+
+            assert result["ingested"] is False
+            assert result["reason"] == "already_ingested"
+            assert mock_sync.call_count == 1
+
+            sync_daily_prices_task(target_date_str="2025-01-15", force=True)
+            assert mock_sync.call_count == 2
+
+        assert IngestionRun.objects.filter(status="success").count() == 2
+
+    def test_failed_run_does_not_short_circuit(self):
+        with patch("apps.stocks.tasks.sync_daily_price_changes") as mock_sync, \
+                patch.object(sync_daily_prices_task, "retry", side_effect=RuntimeError("retry")), \
+                patch("apps.stocks.tasks.update_candles_task.delay"):
+            mock_sync.side_effect = Exception("KRX down")
+            with pytest.raises(RuntimeError):
+                sync_daily_prices_task(target_date_str="2025-01-15")
+
+            mock_sync.side_effect = None
+            mock_sync.return_value = SYNC_RESULT
+            result = sync_daily_prices_task(target_date_str="2025-01-15")
+
+        assert result["written"] == 600
+        assert list(IngestionRun.objects.order_by("started_at").values_list("status", flat=True)) == [
+            "failed", "success"
+        ]
+        assert "KRX down" in IngestionRun.objects.get(status="failed").error
+
+    def test_in_progress_run_short_circuits_until_stale(self):
+        run = start_ingestion("daily_prices", "krx", date(2025, 1, 15))
+        assert previous_run("daily_prices", "krx", date(2025, 1, 15)) == run
+
+        IngestionRun.objects.filter(pk=run.pk).update(started_at=timezone.now() - timedelta(hours=2))
+        assert previous_run("daily_prices", "krx", date(2025, 1, 15)) is None
+
+
+@pytest.mark.django_db
+class TestAggregationIngestionRun:
+    def test_skips_until_daily_prices_change(self, stock):
+        kwargs = {"stock_code": stock.code, "end_date_str": "2025-01-15"}
+        with patch("apps.stocks.tasks.aggregate_candles", return_value={stock.id: 52}) as mock_aggregate:
+            aggregate_weekly_prices_task(**kwargs)
+            assert aggregate_weekly_prices_task(**kwargs)["reason"] == "already_ingested"
+            assert mock_aggregate.call_count == 1
+
+            DailyPrice.objects.create(
+                stock=stock, trade_date=date(2025, 1, 14),
+                open_price=Decimal("70000"), high_price=Decimal("71000"),
+                low_price=Decimal("69000"), close_price=Decimal("70500"), volume=1000,
+            )
+            assert aggregate_weekly_prices_task(**kwargs)["success"] is True
+            assert mock_aggregate.call_count == 2
+
+    def test_chord_failure_marks_run_failed(self):
+        """청크 실패로 콜백이 실행되지 않으면 link_error가 실행 기록을 failed로 완료"""
+        from celery import signature
+        from apps.common.ingestion import start_ingestion
+        from apps.stocks.tasks import aggregation_chord
+
+        run = start_ingestion("weekly_candles", "krx", date(2025, 1, 15))
+        workflow = aggregation_chord(
+            "weekly", [1, 2, 3], date(2024, 1, 16), date(2025, 1, 15), run.id
+        )
+
+        (errback,) = workflow.body.options["link_error"]
+        signature(errback)(MagicMock(id="chunk-task"), RuntimeError("worker lost"), None)
+
+        run.refresh_from_db()
+        assert run.status == "failed"
+        assert "worker lost" in run.error
+        assert run.finished_at is not None
+
+    def test_chord_callback_finishes_run(self):
+        for code in ("000001", "000002", "000003"):
+            Stock.objects.create(code=code, name=code, market="KOSPI", is_active=True)
+
+        with patch("apps.stocks.tasks.AGGREGATION_CHUNK_SIZE", 2), \
+                patch("apps.stocks.tasks.aggregate_candles") as mock_aggregate:
+            mock_aggregate.side_effect = lambda tf, start, end, ids: {i: 52 for i in ids}
+            aggregate_weekly_prices_task.apply(kwargs={"end_date_str": "2025-01-15"}).get()
+
+        run = IngestionRun.objects.get()
+        assert run.pipeline == "weekly_candles"
+        assert run.status == "success"
+        assert (run.rows_fetched, run.rows_written) == (3, 156)
+
@@ -0,0 +1,107 @@
+"""
+일봉 리샘플링 엔진 테스트
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from apps.stocks.aggregation import CANDLE_MODELS, rollup_candles
+from apps.stocks.models import DailyPrice
+from apps.stocks.resampling import bucket_ids, resample, resample_rows, series_from_rows
+from apps.stocks.tests.test_aggregation import _create_daily_prices, _stored_candles
+
+ROW_FIELDS = (
+    "trade_date", "open_price", "high_price", "low_price",
+    "close_price", "volume", "amount", "market_cap",
+)
+
+
+def _rows(stock):
+    return list(
+        DailyPrice.objects.filter(stock=stock).order_by("trade_date").values_list(*ROW_FIELDS)
+    )
+
+
+@pytest.mark.django_db
+class TestStoredRollupMatchesResample:
+    @pytest.mark.parametrize("timeframe", ["weekly", "monthly", "yearly"])
+    def test_matches_resample_rows(self, stock, timeframe):
+        _create_daily_prices(stock, date(2023, 10, 2), 200)
+        rollup_candles(timeframe, date(2023, 10, 2), date(2024, 12, 31))
+
+        candles = resample_rows(_rows(stock), timeframe)
+
+        fields = ("open_price", "high_price", "low_price", "close_price", "volume", "amount")
+        assert {c["trade_date"]: {f: c[f] for f in fields} for c in candles} == {
+            d: {f: v[f] for f in fields}
+            for d, v in _stored_candles(CANDLE_MODELS[timeframe], stock).items()
+        }
+
+
+@pytest.mark.unit
+class TestResample:
+    def _series(self):
+        rows = [
+            (date(2024, 11, 25), 10, 12, 9, 11, 100, None, None),
+            (date(2024, 11, 26), 11, 15, 10, 14, 200, 3000, 500),
+            (date(2024, 11, 27), 14, 14, 8, 9, 300, 4000, None),
+            (date(2024, 12, 2), 9, 10, 7, 8, 400, None, None),
+            (date(2024, 12, 3), 8, 20, 8, 19, 500, 1000, 700),
+        ]
+        return series_from_rows(rows)
+
+    def test_n_trading_days(self):
+        candles = resample(self._series(), "2D").to_records()
+
+        assert [c["trade_date"] for c in candles] == [
+            date(2024, 11, 26), date(2024, 12, 2), date(2024, 12, 3)
+        ]
+        assert candles[0]["open_price"] == Decimal("10.00")
+        assert candles[0]["high_price"] == Decimal("15.00")
+        assert candles[0]["volume"] == 300
+        assert candles[1]["low_price"] == Decimal("7.00")
+        assert candles[1]["amount"] == 4000
+        assert candles[1]["market_cap"] == 500
+
+    def test_weekly_and_monthly(self):
+        weekly = resample(self._series(), "W").to_records()
+        monthly = resample(self._series(), "M").to_records()
+
+        assert [(c["first_date"], c["trade_date"]) for c in weekly] == [
+            (date(2024, 11, 25), date(2024, 11, 27)),
+            (date(2024, 12, 2), date(2024, 12, 3)),
+        ]
+        assert [c["close_price"] for c in monthly] == [Decimal("9.00"), Decimal("19.00")]
+        assert monthly[0]["amount"] == 7000
+
+    def test_custom_anchors(self):
+        candles = resample(self._series(), anchors=[date(2024, 11, 27)]).to_records()
+
+        assert [c["trade_date"] for c in candles] == [date(2024, 11, 26), date(2024, 12, 3)]
+        assert candles[0]["amount"] == 3000
+        assert candles[1]["volume"] == 1200
+
+    def test_quarter_and_multi_unit_boundaries(self):
+        dates = np.array(
+            ["2024-03-29", "2024-04-01", "2024-06-28", "2024-07-01", "2025-01-02"],
+            dtype="datetime64[D]",
+        )
+        assert list(bucket_ids(dates, "Q")) == sorted(bucket_ids(dates, "Q"))
+        assert len(set(bucket_ids(dates, "quarterly"))) == 4
+        assert len(set(bucket_ids(dates, "6M"))) == 3
+        assert len(set(bucket_ids(dates, "Y"))) == 2
+
+    def test_named_intervals(self):
+        dates = np.array(["2024-11-25", "2024-11-26", "2024-12-02"], dtype="datetime64[D]")
+        assert list(bucket_ids(dates, "daily")) == list(bucket_ids(dates, "D"))
+        assert list(bucket_ids(dates, "weekly")) == list(bucket_ids(dates, "W"))
+
+    def test_empty_series(self):
+        assert resample(series_from_rows([]), "W").to_records() == []
+
+    @pytest.mark.parametrize("interval", ["", "0D", "3H", "weekly-ish"])
+    def test_invalid_interval(self, interval):
+        with pytest.raises(ValueError):
+            bucket_ids(np.array(["2024-11-25"], dtype="datetime64[D]"), interval)
@@ -1,13 +1,19 @@
 import pytest
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import patch, MagicMock
 import pandas as pd
 from decimal import Decimal
 
+from apps.common.cache import LRUCache
+from apps.common.utils import bulk_upsert
 from apps.stocks.services import (
+    find_missing_candles,
     format_krx_date,
+    get_resampled_prices,
+    resampled_price_cache,
     sync_stock_master_from_krx,
-    sync_daily_prices_from_krx
+    sync_daily_prices_from_krx,
+    sync_daily_price_changes,
 )
 from apps.stocks.models import Stock, DailyPrice
 
@@ -20,25 +26,72 @@ class TestFormatKrxDate:
         assert result == "20241125"
 
 
+def _ticker_table(market_tickers):
+    """시장별 get_market_ticker_and_name 응답 생성"""
+    def _get(date_str, market):
+        return pd.Series(market_tickers.get(market, {}), dtype=object)
+    return _get
+
+
 @pytest.mark.django_db
 class TestSyncStockMasterFromKrx:
-    @patch("pykrx.stock.get_market_ticker_list")
-    @patch("pykrx.stock.get_market_ticker_name")
-    def test_sync_stock_master(self, mock_get_name, mock_get_list):
-        """get_stock_market_from_ticker는 try/except로 처리되므로 mock 불필요"""
-        mock_get_list.return_value = ["005930", "000660"]
-        mock_get_name.side_effect = ["삼성전자", "SK하이닉스"]
+    @patch("pykrx.website.krx.get_market_ticker_and_name")
+    def test_sync_stock_master(self, mock_ticker_and_name):
+        mock_ticker_and_name.side_effect = _ticker_table({
+            "KOSPI": {"005930": "삼성전자", "000660": "SK하이닉스"},
+            "KOSDAQ": {"035720": "카카오게임즈"},
+            "KONEX": {"217910": "에스와이"},
+        })
 
-        count = sync_stock_master_from_krx(date(2024, 11, 25))
+        result = sync_stock_master_from_krx(date(2024, 11, 25))
 
-        assert count == 2
-        assert Stock.objects.count() == 2
-        assert Stock.objects.filter(code="005930").exists()
-        assert Stock.objects.filter(code="000660").exists()
+        assert result == {"inserted": 4, "updated": 0, "delisted": 0, "total": 4}
+        assert Stock.objects.count() == 4
+        assert Stock.objects.get(code="005930").market == "KOSPI"
+        assert Stock.objects.get(code="035720").market == "KOSDAQ"
+        assert mock_ticker_and_name.call_count == 3
+
+    @patch("pykrx.website.krx.get_market_ticker_and_name")
+    def test_sync_stock_master_writes_only_changes(self, mock_ticker_and_name, stock):
+        """변경된 종목만 갱신하고 사라진 종목은 비활성화"""
+        Stock.objects.create(code="000660", name="000660", market=None)
+        Stock.objects.create(code="999999", name="상장폐지", market="KOSPI")
+        mock_ticker_and_name.side_effect = _ticker_table({
+            "KOSPI": {"005930": "삼성전자", "000660": "SK하이닉스"},
+            "KOSDAQ": {"035720": "카카오게임즈"},
+            "KONEX": {"217910": "에스와이"},
+        })
+
+        result = sync_stock_master_from_krx(date(2024, 11, 25))
+
+        assert result == {"inserted": 2, "updated": 1, "delisted": 1, "total": 4}
+        hynix = Stock.objects.get(code="000660")
+        assert hynix.name == "SK하이닉스"
+        assert hynix.market == "KOSPI"
+        assert Stock.objects.get(code="999999").is_active is False
+        assert Stock.objects.get(code="005930").is_active is True
+
+    @patch("pykrx.website.krx.get_market_ticker_and_name")
+    def test_sync_stock_master_empty_market_skips_delisting(self, mock_ticker_and_name, stock):
+        """시장 목록이 비어 있으면 전 종목 비활성화를 막기 위해 동기화 생략"""
+        mock_ticker_and_name.side_effect = _ticker_table({"KOSPI": {"000660": "SK하이닉스"}})
+
+        result = sync_stock_master_from_krx(date(2024, 11, 25))
+
+        assert result["total"] == 0
+        stock.refresh_from_db()
+        assert stock.is_active is True
+        assert not Stock.objects.filter(code="000660").exists()
 
 
 @pytest.mark.django_db
 class TestSyncDailyPricesFromKrx:
+    @pytest.fixture(autouse=True)
+    def mock_get_market_cap(self):
+        with patch("pykrx.stock.get_market_cap_by_ticker") as mock:
+            mock.return_value = pd.DataFrame()
+            yield mock
+
     @patch("pykrx.stock.get_market_ohlcv_by_ticker")
     def test_sync_daily_prices(self, mock_get_ohlcv, stock):
         mock_df = pd.DataFrame({
@@ -54,8 +107,7 @@ class TestSyncDailyPricesFromKrx:
 
         mock_get_ohlcv.return_value = mock_df
 
-        today = date.today()
-        count = sync_daily_prices_from_krx(today)
+        count = sync_daily_prices_from_krx(date(2024, 11, 25))
 
         assert count == 1
         assert DailyPrice.objects.count() == 1
@@ -64,3 +116,207 @@ class TestSyncDailyPricesFromKrx:
         assert price.stock == stock
         assert price.close_price == 70500
         assert price.volume == 1000000
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_creates_missing_stocks(self, mock_get_ohlcv, stock):
+        """마스터에 없는 종목은 일괄 생성 후 저장"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000, 120000],
+            "고가": [71000, 125000],
+            "저가": [69000, 119000],
+            "종가": [70500, 124000],
+            "거래량": [1000000, 500000],
+            "거래대금": [70500000000, 62000000000],
+            "등락률": [0.71, 3.33],
+        }, index=["005930", "000660"])
+
+        count = sync_daily_prices_from_krx(date(2024, 11, 25))
+
+        assert count == 2
+        new_stock = Stock.objects.get(code="000660")
+        assert new_stock.name == "000660"
+        price = DailyPrice.objects.get(stock=new_stock)
+        assert price.change_rate == Decimal("3.33")
+        assert price.change is None
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_skips_invalid_rows(self, mock_get_ohlcv, stock):
+        """값이 비어 있는 행만 건너뛰고 나머지는 저장"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000, None],
+            "고가": [71000, 125000],
+            "저가": [69000, 119000],
+            "종가": [70500, 124000],
+            "거래량": [1000000, 500000],
+        }, index=["005930", "000660"])
+
+        count = sync_daily_prices_from_krx(date(2024, 11, 25))
+
+        assert count == 1
+        assert DailyPrice.objects.count() == 1
+        assert DailyPrice.objects.get().amount == 0
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_upserts_existing_rows(self, mock_get_ohlcv, stock, daily_price):
+        """같은 날짜 재동기화 시 기존 행을 갱신"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000],
+            "고가": [72000],
+            "저가": [69000],
+            "종가": [71800],
+            "거래량": [2000000],
+            "거래대금": [143600000000],
+            "등락": [1800],
+            "등락률": [2.57],
+        }, index=["005930"])
+
+        count = sync_daily_prices_from_krx(daily_price.trade_date)
+
+        assert count == 1
+        assert DailyPrice.objects.count() == 1
+        daily_price.refresh_from_db()
+        assert daily_price.close_price == Decimal("71800")
+        assert daily_price.change == Decimal("1800")
+        assert daily_price.volume == 2000000
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_skips_unchanged_rows(self, mock_get_ohlcv, stock, daily_price):
+        """저장된 값과 같은 행은 건너뛰고 바뀐/새 행만 저장"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000, 120000],
+            "고가": [71000, 125000],
+            "저가": [69000, 119000],
+            "종가": [70500, 124000],
+            "거래량": [1000000, 500000],
+            "거래대금": [70500000000, 62000000000],
+            "등락": [500, 4000],
+            "등락률": [0.71, 3.33],
+        }, index=["005930", "000660"])
+
+        with patch("apps.stocks.services.bulk_upsert", wraps=bulk_upsert) as mock_upsert:
+            first = sync_daily_price_changes(daily_price.trade_date)
+            second = sync_daily_price_changes(daily_price.trade_date)
+
+        assert first == {
+            "count": 2, "written": 1, "skipped": 1, "checksum": first["checksum"],
+            "stock_ids": [Stock.objects.get(code="000660").id],
+        }
+        assert second == {
+            "count": 2, "written": 0, "skipped": 2, "checksum": first["checksum"], "stock_ids": [],
+        }
+        written_codes = [
+            [price.stock.code for price in c.args[1]] for c in mock_upsert.call_args_list
+        ]
+        assert written_codes == [["000660"], []]
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_merges_market_caps(self, mock_get_ohlcv, mock_get_market_cap, stock):
+        """시가총액 테이블을 종목코드로 병합하여 같은 upsert로 저장"""
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000, 120000],
+            "고가": [71000, 125000],
+            "저가": [69000, 119000],
+            "종가": [70500, 124000],
+            "거래량": [1000000, 500000],
+        }, index=["005930", "000660"])
+        mock_get_market_cap.return_value = pd.DataFrame({
+            "종가": [70500, 999],
+            "시가총액": [420000000000000, 1000000000],
+        }, index=["005930", "999999"])
+
+        count = sync_daily_prices_from_krx(date(2024, 11, 25))
+
+        assert count == 2
+        assert DailyPrice.objects.get(stock=stock).market_cap == 420000000000000
+        assert DailyPrice.objects.get(stock__code="000660").market_cap is None
+        assert not Stock.objects.filter(code="999999").exists()
+
+    @patch("pykrx.stock.get_market_ohlcv_by_ticker")
+    def test_sync_daily_prices_keeps_market_cap_when_unavailable(
+        self, mock_get_ohlcv, mock_get_market_cap, stock, daily_price
+    ):
+        """시가총액 조회 실패 시 가격은 저장하고 기존 시가총액은 유지"""
+        DailyPrice.objects.filter(pk=daily_price.pk).update(market_cap=420000000000000)
+        mock_get_ohlcv.return_value = pd.DataFrame({
+            "시가": [70000],
+            "고가": [72000],
+            "저가": [69000],
+            "종가": [71800],
+            "거래량": [2000000],
+        }, index=["005930"])
+        mock_get_market_cap.side_effect = Exception("KRX unavailable")
+
+        count = sync_daily_prices_from_krx(daily_price.trade_date)
+
+        assert count == 1
+        daily_price.refresh_from_db()
+        assert daily_price.close_price == Decimal("71800")
+        assert daily_price.market_cap == 420000000000000
+
+
+@pytest.mark.django_db
+class TestResampledPriceCache:
+    def test_in_place_correction_changes_cache_key(self, stock):
+        """같은 날짜 일봉이 재수집으로 바뀌면 다시 계산"""
+        resampled_price_cache.clear()
+        for day in (2, 3):
+            DailyPrice.objects.create(
+                stock=stock, trade_date=date(2024, 1, day), open_price=100, high_price=110,
+                low_price=90, close_price=105, volume=1000,
+            )
+        assert get_resampled_prices(stock, "2D")[0]["close_price"] == Decimal("105")
+
+        DailyPrice.objects.filter(stock=stock, trade_date=date(2024, 1, 3)).update(close_price=107)
+
+        assert get_resampled_prices(stock, "2D")[0]["close_price"] == Decimal("107")
+
+    def test_daily_interval_name(self, stock):
+        """캔들 타입 이름 daily는 1일 간격(D)과 같은 결과"""
+        resampled_price_cache.clear()
+        for day in (2, 3):
+            DailyPrice.objects.create(
+                stock=stock, trade_date=date(2024, 1, day), open_price=100, high_price=110,
+                low_price=90, close_price=100 + day, volume=1000,
+            )
+
+        candles = get_resampled_prices(stock, "daily")
+
+        assert [c["trade_date"] for c in candles] == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert candles == get_resampled_prices(stock, "D")
+
+    def test_lru_cache_ttl(self):
+        now = [0.0]
+        cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.set("key", "value")
+
+        now[0] = 9.9
+        assert cache.get("key") == "value"
+        now[0] = 10.0
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.django_db
+class TestFindMissingCandles:
+    def test_reads_only_requested_span(self, stock):
+        """최신 limit개 주(+직전 주)의 일봉만 리샘플링하고 등락은 전체 이력과 동일"""
+        resampled_price_cache.clear()
+        DailyPrice.objects.bulk_create([
+            DailyPrice(
+                stock=stock, trade_date=date(2024, 1, 1) + timedelta(days=offset),
+                open_price=100 + offset, high_price=110 + offset, low_price=90 + offset,
+                close_price=105 + offset, volume=1000,
+            )
+            for offset in range(70)
+        ])
+        expected = get_resampled_prices(stock, "weekly")[-2:]
+
+        with patch(
+            "apps.stocks.services.get_resampled_prices", wraps=get_resampled_prices
+        ) as mock_resample:
+            candles, span_start, span_end = find_missing_candles(stock, "weekly", [], limit=2)
+
+        # 마지막 일봉 2024-03-10(일) -> 2/26, 3/4 주 + 직전 2/19 주부터 조회
+        assert mock_resample.call_args.args[2] == date(2024, 2, 19)
+        assert candles == expected
+        assert (span_start, span_end) == (date(2024, 2, 26), date(2024, 3, 10))
@@ -6,7 +6,11 @@ from unittest.mock import patch
 from datetime import date
 from celery.exceptions import Retry
 
-from apps.stocks.tasks import sync_stock_master_task, sync_daily_prices_task
+from apps.stocks.tasks import (
+    sync_stock_master_task,
+    sync_daily_prices_task,
+    aggregate_weekly_prices_task,
+)
 from apps.common.exceptions import StockDataFetchError
 
 
@@ -14,11 +18,14 @@ from apps.common.exceptions import StockDataFetchError
 def test_sync_stock_master_task_success():
     """주식 마스터 동기화 태스크 성공 테스트"""
     with patch('apps.stocks.tasks.sync_stock_master_from_krx') as mock_sync:
-        mock_sync.return_value = 100
+        mock_sync.return_value = {"inserted": 3, "updated": 2, "delisted": 1, "total": 100}
         result = sync_stock_master_task()
 
         assert result["success"] is True
         assert result["count"] == 100
+        assert result["inserted"] == 3
+        assert result["updated"] == 2
+        assert result["delisted"] == 1
         assert "date" in result
         mock_sync.assert_called_once()
 
@@ -28,7 +35,7 @@ def test_sync_stock_master_task_with_date():
     """특정 날짜로 주식 마스터 동기화 태스크 테스트"""
     target_date = "2025-01-15"
     with patch('apps.stocks.tasks.sync_stock_master_from_krx') as mock_sync:
-        mock_sync.return_value = 150
+        mock_sync.return_value = {"inserted": 0, "updated": 0, "delisted": 0, "total": 150}
         result = sync_stock_master_task(target_date_str=target_date)
 
         assert result["success"] is True
@@ -73,8 +80,8 @@ def test_sync_stock_master_task_retry_on_general_exception():
 @pytest.mark.django_db
 def test_sync_daily_prices_task_success():
     """일별 가격 동기화 태스크 성공 테스트"""
-    with patch('apps.stocks.tasks.sync_daily_prices_from_krx') as mock_sync:
-        mock_sync.return_value = 500
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync:
+        mock_sync.return_value = {"count": 500, "written": 500, "skipped": 0, "stock_ids": [1]}
         result = sync_daily_prices_task()
 
         assert result["success"] is True
@@ -87,8 +94,8 @@ def test_sync_daily_prices_task_success():
 def test_sync_daily_prices_task_with_date():
     """특정 날짜로 일별 가격 동기화 태스크 테스트"""
     target_date = "2025-01-15"
-    with patch('apps.stocks.tasks.sync_daily_prices_from_krx') as mock_sync:
-        mock_sync.return_value = 600
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync:
+        mock_sync.return_value = {"count": 600, "written": 600, "skipped": 0, "stock_ids": [1]}
         result = sync_daily_prices_task(target_date_str=target_date)
 
         assert result["success"] is True
@@ -97,10 +104,47 @@ def test_sync_daily_prices_task_with_date():
         mock_sync.assert_called_once_with(date(2025, 1, 15))
 
 
+@pytest.mark.django_db
+def test_sync_daily_prices_task_triggers_candle_update():
+    """일별 가격 동기화 후 저장된 종목의 해당 거래일 버킷만 증분 집계"""
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync, \
+            patch('apps.stocks.tasks.update_candles_for_dates') as mock_update:
+        mock_sync.return_value = {"count": 600, "written": 2, "skipped": 598, "stock_ids": [3, 7]}
+        mock_update.return_value = {"weekly": 2, "monthly": 2, "yearly": 2}
+        sync_daily_prices_task(target_date_str="2025-01-15")
+
+        mock_update.assert_called_once_with([date(2025, 1, 15)], [3, 7])
+
+
+@pytest.mark.django_db
+def test_sync_daily_prices_task_skips_candle_update_without_data():
+    """동기화된 데이터가 없으면 증분 집계 생략"""
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync, \
+            patch('apps.stocks.tasks.update_candles_for_dates') as mock_update:
+        mock_sync.return_value = {"count": 0, "written": 0, "skipped": 0, "stock_ids": []}
+        sync_daily_prices_task(target_date_str="2025-01-15")
+
+        mock_update.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_daily_prices_task_reports_unchanged_rows():
+    """재실행 시 변경 없는 행 수를 결과에 포함하고 증분 집계 생략"""
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync, \
+            patch('apps.stocks.tasks.update_candles_for_dates') as mock_update:
+        mock_sync.return_value = {"count": 600, "written": 0, "skipped": 600, "stock_ids": []}
+        result = sync_daily_prices_task(target_date_str="2025-01-15")
+
+        assert result["count"] == 600
+        assert result["written"] == 0
+        assert result["skipped"] == 600
+        mock_update.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_sync_daily_prices_task_retry_on_fetch_error():
     """StockDataFetchError 발생 시 재시도 테스트"""
-    with patch('apps.stocks.tasks.sync_daily_prices_from_krx') as mock_sync:
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync:
         mock_sync.side_effect = StockDataFetchError("API error")
 
         with patch.object(sync_daily_prices_task, 'retry', side_effect=Retry("Retry called")) as mock_retry:
@@ -115,7 +159,7 @@ def test_sync_daily_prices_task_retry_on_fetch_error():
 @pytest.mark.django_db
 def test_sync_daily_prices_task_retry_on_general_exception():
     """일반 예외 발생 시 재시도 테스트"""
-    with patch('apps.stocks.tasks.sync_daily_prices_from_krx') as mock_sync:
+    with patch('apps.stocks.tasks.sync_daily_price_changes') as mock_sync:
         mock_sync.side_effect = Exception("Unexpected error")
 
         with patch.object(sync_daily_prices_task, 'retry', side_effect=Retry("Retry called")) as mock_retry:
@@ -125,3 +169,39 @@ def test_sync_daily_prices_task_retry_on_general_exception():
             mock_retry.assert_called_once()
             call_args = mock_retry.call_args
             assert isinstance(call_args.kwargs['exc'], Exception)
+
+
+@pytest.mark.django_db
+def test_aggregate_weekly_prices_task_all_stocks():
+    """전 종목 주봉 집계는 한 번의 일괄 집계로 처리"""
+    with patch('apps.stocks.tasks.aggregate_candles') as mock_aggregate:
+        mock_aggregate.return_value = {1: 52, 2: 50}
+        result = aggregate_weekly_prices_task(end_date_str="2025-01-15")
+
+        assert result["success"] is True
+        assert result["stocks_count"] == 2
+        assert result["total_candles"] == 102
+        assert result["start_date"] == "2024-01-16"
+        mock_aggregate.assert_called_once_with("weekly", date(2024, 1, 16), date(2025, 1, 15), None)
+
+
+@pytest.mark.django_db
+def test_aggregate_weekly_prices_task_fans_out_chunks():
+    """종목 수가 청크 크기를 넘으면 chord로 분산하고 같은 형식으로 합산"""
+    from apps.stocks.models import Stock
+
+    for code in ("000001", "000002", "000003"):
+        Stock.objects.create(code=code, name=code, market="KOSPI", is_active=True)
+
+    with patch('apps.stocks.tasks.AGGREGATION_CHUNK_SIZE', 2), \
+            patch('apps.stocks.tasks.aggregate_candles') as mock_aggregate:
+        mock_aggregate.side_effect = lambda tf, start, end, ids: {i: 52 for i in ids}
+        result = aggregate_weekly_prices_task.apply(kwargs={"end_date_str": "2025-01-15"}).get()
+
+    assert result["success"] is True
+    assert result["stocks_count"] == 3
+    assert result["total_candles"] == 156
+    assert result["start_date"] == "2024-01-16"
+    assert result["end_date"] == "2025-01-15"
+    # 2 + 1 종목 두 청크로 나뉘어 집계
+    assert sorted(len(c.args[3]) for c in mock_aggregate.call_args_list) == [1, 2]
@@ -0,0 +1,81 @@
+"""
+거래일 캘린더 테스트
+"""
+import pytest
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from apps.stocks.models import MarketHoliday
+from apps.stocks.services import sync_daily_prices_from_krx
+from apps.stocks.trading_calendar import TradingCalendar, get_trading_calendar
+
+
+class TestTradingCalendar:
+    """TradingCalendar 테스트"""
+
+    def setup_method(self):
+        # 2024-02-09(금)~12(월) 설 연휴
+        self.calendar = TradingCalendar(
+            trading_days=[date(2024, 2, 8)],
+            holidays=[date(2024, 2, 9), date(2024, 2, 12)],
+        )
+
+    def test_is_trading_day(self):
+        assert self.calendar.is_trading_day(date(2024, 2, 8)) is True
+        assert self.calendar.is_trading_day(date(2024, 2, 9)) is False
+        assert self.calendar.is_trading_day(date(2024, 2, 10)) is False  # 토요일
+        # 적재 전 평일은 거래일로 간주
+        assert self.calendar.is_trading_day(date(2024, 2, 13)) is True
+
+    def test_previous_and_next_trading_day(self):
+        assert self.calendar.previous_trading_day(date(2024, 2, 13)) == date(2024, 2, 8)
+        assert self.calendar.next_trading_day(date(2024, 2, 8)) == date(2024, 2, 13)
+        assert self.calendar.latest_trading_day(date(2024, 2, 11)) == date(2024, 2, 8)
+        assert self.calendar.latest_trading_day(date(2024, 2, 8)) == date(2024, 2, 8)
+
+    def test_trading_days_between(self):
+        days = self.calendar.trading_days_between(date(2024, 2, 7), date(2024, 2, 13))
+
+        assert days == [date(2024, 2, 7), date(2024, 2, 8), date(2024, 2, 13)]
+
+    def test_observed_prices_override_holidays(self):
+        """일봉이 있는 날짜는 휴장일로 등록되어 있어도 거래일"""
+        calendar = TradingCalendar(trading_days=[date(2024, 2, 9)], holidays=[date(2024, 2, 9)])
+
+        assert calendar.is_trading_day(date(2024, 2, 9)) is True
+
+
+@pytest.mark.django_db
+class TestTradingCalendarIntegration:
+    """캘린더 로드 및 수집 연동 테스트"""
+
+    def test_loads_prices_and_holidays(self, daily_price):
+        MarketHoliday.objects.create(date=date(2024, 5, 6), name="대체공휴일")
+
+        calendar = get_trading_calendar()
+
+        assert calendar.is_trading_day(daily_price.trade_date) is True
+        assert calendar.is_trading_day(date(2024, 5, 6)) is False
+
+    def test_sync_skips_non_trading_day_without_fetch(self):
+        """비거래일에는 KRX를 호출하지 않음"""
+        MarketHoliday.objects.create(date=date(2024, 5, 6), name="대체공휴일")
+
+        with patch("pykrx.stock.get_market_ohlcv_by_ticker") as mock_get_ohlcv:
+            assert sync_daily_prices_from_krx(date(2024, 5, 6)) == 0
+            assert sync_daily_prices_from_krx(date(2024, 5, 4)) == 0  # 토요일
+
+        mock_get_ohlcv.assert_not_called()
+
+    def test_seed_command_invalidates_cache(self):
+        assert get_trading_calendar().is_trading_day(date(2024, 5, 6)) is True
+
+        out = StringIO()
+        call_command("seed_market_holidays", "2024-05-06:대체공휴일", "2024-05-15", stdout=out)
+
+        assert "2 items" in out.getvalue()
+        assert MarketHoliday.objects.get(date=date(2024, 5, 6)).name == "대체공휴일"
+        assert get_trading_calendar().is_trading_day(date(2024, 5, 6)) is False
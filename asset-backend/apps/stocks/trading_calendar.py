@@ -0,0 +1,111 @@
+"""
+KRX 거래일 캘린더
+
+적재된 일봉 거래일과 휴장일 테이블(MarketHoliday)로 거래일 여부를 판단합니다.
+- 일봉이 있는 날짜는 거래일
+- 주말과 휴장일은 비거래일
+- 그 외 평일은 아직 적재 전인 거래일로 간주
+
+수집/백필/집계/리포트 작업은 네트워크 호출이나 트랜잭션 전에 이 캘린더로
+거래일 여부를 확인합니다. 캘린더는 프로세스 내에 캐시되며 CALENDAR_TTL_SECONDS 마다 다시 읽습니다.
+"""
+import logging
+import threading
+import time
+from datetime import date, timedelta
+
+from .models import DailyPrice, MarketHoliday
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_TTL_SECONDS = 3600
+# 연속 비거래일 최대 길이 (설/추석 연휴 + 주말 여유)
+MAX_NON_TRADING_RUN = 31
+
+
+class TradingCalendar:
+    """거래일/휴장일 집합 기반 거래일 조회"""
+
+    def __init__(self, trading_days=(), holidays=()):
+        self.trading_days = set(trading_days)
+        self.holidays = set(holidays) - self.trading_days
+
+    def is_trading_day(self, d: date) -> bool:
+        if d in self.trading_days:
+            return True
+        return d.weekday() < 5 and d not in self.holidays
+
+    def previous_trading_day(self, d: date) -> date:
+        """d 이전의 가장 가까운 거래일 (d 제외)"""
+        return self._step(d, -1)
+
+    def next_trading_day(self, d: date) -> date:
+        """d 이후의 가장 가까운 거래일 (d 제외)"""
+        return self._step(d, 1)
+
+    def latest_trading_day(self, d: date) -> date:
+        """d 당일 또는 그 이전의 가장 가까운 거래일"""
+        return d if self.is_trading_day(d) else self.previous_trading_day(d)
+
+    def trading_days_between(self, start_date: date, end_date: date) -> list[date]:
+        """기간 내 거래일 목록 (양 끝 포함)"""
+        days = (end_date - start_date).days + 1
+        candidates = (start_date + timedelta(days=offset) for offset in range(max(days, 0)))
+        return [d for d in candidates if self.is_trading_day(d)]
+
+    def mark_trading_day(self, d: date):
+        """일봉이 적재된 날짜를 거래일로 추가"""
+        self.trading_days.add(d)
+        self.holidays.discard(d)
+
+    def _step(self, d: date, direction: int) -> date:
+        # 비거래일 연속 구간은 짧으므로 사실상 상수 시간
+        for offset in range(1, MAX_NON_TRADING_RUN + 1):
+            candidate = d + timedelta(days=offset * direction)
+            if self.is_trading_day(candidate):
+                return candidate
+        raise ValueError(f"No trading day within {MAX_NON_TRADING_RUN} days of {d}")
+
+
+_calendar: TradingCalendar | None = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def load_trading_calendar() -> TradingCalendar:
+    """DB에서 거래일/휴장일을 읽어 캘린더 생성"""
+    trading_days = DailyPrice.objects.order_by().values_list("trade_date", flat=True).distinct()
+    holidays = MarketHoliday.objects.values_list("date", flat=True)
+    calendar = TradingCalendar(trading_days, holidays)
+    logger.debug(
+        f"Loaded trading calendar: {len(calendar.trading_days)} trading days, "
+        f"{len(calendar.holidays)} holidays"
+    )
+    return calendar
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """캐시된 거래일 캘린더 (TTL 경과 시 다시 로드)"""
+    global _calendar, _loaded_at
+
+    with _lock:
+        if _calendar is None or time.monotonic() - _loaded_at > CALENDAR_TTL_SECONDS:
+            _calendar = load_trading_calendar()
+            _loaded_at = time.monotonic()
+        return _calendar
+
+
+def invalidate_trading_calendar():
+    """휴장일 변경 등으로 캐시된 캘린더 폐기"""
+    global _calendar
+
+    with _lock:
+        _calendar = None
+
+
+def is_trading_day(d: date) -> bool:
+    return get_trading_calendar().is_trading_day(d)
+
+
+def previous_trading_day(d: date) -> date:
+    return get_trading_calendar().previous_trading_day(d)
@@ -123,6 +123,17 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour=7, minute=20),
         "options": {"expires": 3600},
     },
+    # Targeted re-fetch of items recorded in the failure ledger
+    "retry-failed-daily-prices": {
+        "task": "apps.stocks.tasks.retry_failed_daily_prices_task",
+        "schedule": crontab(minute="*/10"),
+        "options": {"expires": 600},
+    },
+    "retry-failed-coin-candles": {
+        "task": "apps.crypto.tasks.retry_failed_candles_task",
+        "schedule": crontab(minute="5-59/10"),
+        "options": {"expires": 600},
+    },
     # Report generation and notification tasks
     "create_daily_reports_at_0730": {
         "task": "apps.reports.tasks.create_daily_reports_for_all_users",
@@ -158,6 +169,25 @@ CACHES = {
     }
 }
 
+# Raw Payload Archive (pykrx/pyupbit 원본 응답 Parquet 보관)
+# off: 사용 안 함, record: 조회 후 저장 (최근 RAW_ARCHIVE_MAX_AGE초 이내 파일은 재사용),
+# replay: 보관본 우선 사용, offline: 보관본만 사용 (네트워크 호출 없음)
+RAW_ARCHIVE_DIR = Path(os.getenv("RAW_ARCHIVE_DIR", BASE_DIR / "data" / "raw_archive"))
+RAW_ARCHIVE_MODE = os.getenv("RAW_ARCHIVE_MODE", "record")
+RAW_ARCHIVE_MAX_AGE = int(os.getenv("RAW_ARCHIVE_MAX_AGE", "600"))
+
+# External API Rate Limits (apps.common.rate_limit 토큰 버킷, 워커 간 Redis로 공유)
+# Upbit 시세 API: 요청 그룹(market, candles)별 초당 10회
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://redis:6379/4")
+RATE_LIMITS = {
+    "upbit:market": {"rate": 10, "burst": 1},
+    "upbit:candles": {"rate": 10, "burst": 1},
+}
+
+# Upbit REST API (apps.crypto.upbit_client 비동기 캔들 수집)
+UPBIT_API_URL = os.getenv("UPBIT_API_URL", "https://api.upbit.com/v1")
+UPBIT_CONCURRENCY = int(os.getenv("UPBIT_CONCURRENCY", "8"))
+
 # Sentry Configuration
 SENTRY_DSN = os.getenv("SENTRY_DSN", "")
 if SENTRY_DSN:
@@ -28,6 +28,14 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 # Celery 비활성화 (테스트에서는 동기 실행)
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+# chord 결과 추적용 인메모리 결과 백엔드 (Redis 불필요)
+CELERY_RESULT_BACKEND = "cache+memory://"
+
+# 원본 응답 보관 비활성화 (필요한 테스트에서만 켬)
+RAW_ARCHIVE_MODE = "off"
+
+# 속도 제한은 프로세스 내 버킷만 사용 (Redis 불필요)
+RATE_LIMIT_REDIS_URL = ""
 
 # 로깅 최소화
 LOGGING = {
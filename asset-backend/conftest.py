@@ -7,6 +7,15 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def reset_trading_calendar():
+    """테스트마다 거래일 캘린더 캐시 초기화"""
+    from apps.stocks.trading_calendar import invalidate_trading_calendar
+    invalidate_trading_calendar()
+    yield
+    invalidate_trading_calendar()
+
+
 @pytest.fixture
 def user(db):
     """기본 테스트 사용자"""
@@ -112,3 +121,13 @@ def coin(db):
         english_name="Bitcoin",
         is_active=True
     )
+
+
+@pytest.fixture
+def upbit_stub(settings):
+    """로컬 Upbit REST 스텁 서버 (UPBIT_API_URL을 스텁 주소로 변경)"""
+    from apps.crypto.tests.upbit_stub import UpbitStub
+    stub = UpbitStub().start()
+    settings.UPBIT_API_URL = stub.url
+    yield stub
+    stub.stop()